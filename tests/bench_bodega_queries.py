@@ -0,0 +1,75 @@
+# tests/bench_bodega_queries.py
+"""
+Mémoire et débit d'un parcours de 100 000 bodegas : liste de dict (get_all_bodegas)
+contre lecture par paquets de sqlite3.Row (stream_bodegas), et pagination par clé.
+Non collecté par pytest ; à lancer avec : python -m tests.bench_bodega_queries
+"""
+import tracemalloc
+
+from time import perf_counter
+from typing import Callable
+
+from vinos_ibericos.data.bodega_manager import BodegaManager
+
+ROWS = 100_000
+PAGE_SIZE = 100
+
+
+def row(i: int) -> dict:
+    return {
+        "name": f"Bodega {i}",
+        "cp": 26000 + i % 1000,
+        "town": f"Pueblo {i % 500}",
+        "lat": 36.0 + (i % 700) / 100,
+        "lon": -9.0 + (i % 1200) / 100,
+        "do_name": f"DO {i % 70}",
+    }
+
+
+def measure(name: str, run: Callable[[], int]) -> None:
+    tracemalloc.start()
+    start = perf_counter()
+    count = run()
+    elapsed = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<34} {count:>7} lignes {elapsed * 1000:>8.0f} ms "
+        f"pic {peak / 1024 / 1024:>7.1f} Mo"
+    )
+
+
+def paginate(manager: BodegaManager, **filters) -> int:
+    count, after = 0, None
+    while True:
+        page = manager.page_bodegas(page_size=PAGE_SIZE, after=after, **filters)
+        count += len(page.rows)
+        if (after := page.next_cursor) is None:
+            return count
+
+
+def main() -> None:
+    with BodegaManager(":memory:") as manager:
+        manager.add_bodegas(row(i) for i in range(ROWS))
+        measure("get_all_bodegas (dict)", lambda: len(manager.get_all_bodegas()))
+        measure("stream_bodegas (Row)", lambda: sum(1 for _ in manager.stream_bodegas()))
+        measure(
+            "stream_bodegas (DO, tri par ville)",
+            lambda: sum(
+                1 for _ in manager.stream_bodegas(do_name="DO 7", order_by="town")
+            ),
+        )
+        measure(
+            "stream_bodegas (emprise)",
+            lambda: sum(1 for _ in manager.stream_bodegas(bbox=(40, -4, 41, -3))),
+        )
+        measure(f"page_bodegas ({PAGE_SIZE}/page)", lambda: paginate(manager))
+        measure(
+            "page_bodegas (tri par nom, sans index)",
+            lambda: paginate(manager, order_by="name"),
+        )
+    manager.provider.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# tests/bench_bodega_storage.py
+"""
+Débit d'écriture et de lecture de la base des bodegas : réglages par défaut de SQLite
+(LEGACY_PROFILE) contre le profil de stockage de l'application (TUNED_PROFILE).
+Non collecté par pytest ; à lancer avec : python -m tests.bench_bodega_storage
+"""
+import random
+import tempfile
+
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+
+from vinos_ibericos.data.bodega_manager import (
+    LEGACY_PROFILE,
+    TUNED_PROFILE,
+    BodegaManager,
+    StorageProfile,
+    configure_connection,
+    create_schema,
+)
+from vinos_ibericos.data.connection import ConnectionProvider
+
+SINGLE_INSERTS = 500  # Une transaction (un commit) par bodega, comme le formulaire
+BULK_INSERTS = 20_000
+READS = 20_000
+
+
+def row(i: int) -> dict:
+    return {
+        "name": f"Bodega {i}",
+        "cp": 28000 + i % 1000,
+        "town": "Madrid",
+        "lat": 40.0 + i / 100_000,
+        "lon": -3.7,
+        "do_name": "Vinos de Madrid",
+    }
+
+
+def bench(profile: StorageProfile, directory: Path) -> dict[str, float]:
+    db_path = directory / f"{profile.JOURNAL_MODE.lower()}.db"
+    # Fournisseur dédié : pas de fournisseur partagé déjà configuré pour ce fichier
+    provider = ConnectionProvider(
+        db_path,
+        setup=partial(configure_connection, profile=profile),
+        initialize=create_schema,
+    )
+    results = {}
+    with BodegaManager(provider=provider) as manager:
+        start = perf_counter()
+        for i in range(SINGLE_INSERTS):
+            manager.add_bodega(row(i))
+        results["insert (1 commit/ligne)"] = SINGLE_INSERTS / (perf_counter() - start)
+
+        start = perf_counter()
+        manager.add_bodegas(row(i) for i in range(BULK_INSERTS))
+        results["insert (en masse)"] = BULK_INSERTS / (perf_counter() - start)
+
+        ids = [random.randint(1, SINGLE_INSERTS + BULK_INSERTS) for _ in range(READS)]
+        start = perf_counter()
+        for bodega_id in ids:
+            manager.get_bodega(bodega_id)
+        results["lecture par id"] = READS / (perf_counter() - start)
+
+        start = perf_counter()
+        count = sum(1 for _ in manager.iter_bodegas())
+        results["parcours complet"] = count / (perf_counter() - start)
+    provider.close()
+    return results
+
+
+def main() -> None:
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = bench(LEGACY_PROFILE, Path(tmp))
+        tuned = bench(TUNED_PROFILE, Path(tmp))
+    print(f"{'opération':<24} {'défaut (l/s)':>14} {'profil (l/s)':>14} {'gain':>7}")
+    for name in legacy:
+        print(
+            f"{name:<24} {legacy[name]:>14.0f} {tuned[name]:>14.0f} "
+            f"{tuned[name] / legacy[name]:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
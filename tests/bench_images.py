@@ -0,0 +1,62 @@
+# tests/bench_images.py
+"""
+Affichage des images de assets/img aux tailles de la fenêtre de détail et du panneau
+droit : décodage + SmoothTransformation à chaque ouverture (ancien chargement) contre
+ImageService (miniature sur disque au démarrage suivant, puis pixmap en mémoire).
+Non collecté par pytest ; à lancer avec : python -m tests.bench_images
+"""
+import os
+import tempfile
+import time
+
+from pathlib import Path
+from typing import Callable
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QGuiApplication, QPixmap
+
+from vinos_ibericos.ui.config_ui import ConfigUI
+from vinos_ibericos.ui.image_service import ImageService
+
+IMG_DIR = Path(__file__).resolve().parent.parent / "assets" / "img"
+SIZES = (ConfigUI.DETAIL_IMG_SIZE, (400, 300))  # Config.IMG_LABEL_SIZE (main.py)
+
+
+def legacy_pixmap(path: Path, size: tuple[int, int]) -> QPixmap:
+    return QPixmap(str(path)).scaled(
+        *size, Qt.KeepAspectRatio, Qt.SmoothTransformation  # type: ignore
+    )
+
+
+def measure(show: Callable[[Path, tuple[int, int]], QPixmap], paths: list[Path]) -> float:
+    """Durée moyenne (ms) d'un affichage."""
+    start = time.perf_counter()
+    for path in paths:
+        for size in SIZES:
+            show(path, size)
+    return (time.perf_counter() - start) * 1000 / (len(paths) * len(SIZES))
+
+
+def main() -> None:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QGuiApplication([])  # noqa: F841 (QPixmap)
+    paths = sorted(IMG_DIR.iterdir())
+    with tempfile.TemporaryDirectory() as tmp:
+        # Cache mémoire assez grand pour toutes les (image, taille) :
+        maxsize = len(paths) * len(SIZES)
+        first = ImageService(IMG_DIR, cache_dir=Path(tmp), maxsize=maxsize)
+        rows = {
+            "décodage + mise à l'échelle": measure(legacy_pixmap, paths),
+            "ImageService, 1er démarrage": measure(first.pixmap_for_file, paths),
+            "ImageService, mémoire": measure(first.pixmap_for_file, paths),
+        }
+        restarted = ImageService(IMG_DIR, cache_dir=Path(tmp))
+        rows["ImageService, miniatures"] = measure(restarted.pixmap_for_file, paths)
+    print(f"{len(paths)} images, tailles {SIZES}")
+    print(f"{'affichage':<30} {'durée moyenne (ms)':>19}")
+    for name, elapsed in rows.items():
+        print(f"{name:<30} {elapsed:>19.2f}")
+
+
+if __name__ == "__main__":
+    main()
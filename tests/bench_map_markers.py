@@ -0,0 +1,41 @@
+# tests/bench_map_markers.py
+"""
+Mesure de la taille du HTML et du temps de rendu de la vue globale selon le mode
+d'affichage des points ("markers", "cluster", "viewport").
+Non collecté par pytest ; à lancer avec : python -m tests.bench_map_markers
+"""
+from time import perf_counter
+
+import numpy as np
+
+from vinos_ibericos.map_manager import MapManager
+
+SIZES = (100, 1_000, 10_000)
+MODES = ("markers", "cluster", "viewport")
+
+
+def synthetic_points(count: int, seed: int = 0) -> list[dict]:
+    """Points répartis aléatoirement sur la péninsule et les îles."""
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(27.5, 43.8, count)
+    lons = rng.uniform(-18.0, 4.3, count)
+    return [
+        {"nom": f"Point {i}", "coords": [float(lat), float(lon)]}
+        for i, (lat, lon) in enumerate(zip(lats, lons))
+    ]
+
+
+def main() -> None:
+    print(f"{'points':>8} {'mode':>9} {'HTML (Ko)':>10} {'rendu (s)':>10}")
+    for size in SIZES:
+        points = synthetic_points(size)
+        for mode in MODES:
+            manager = MapManager(points, cache_size=0, bundle_dir=None, marker_mode=mode)
+            start = perf_counter()
+            html = manager.generate_map_html()
+            elapsed = perf_counter() - start
+            print(f"{size:>8} {mode:>9} {len(html) / 1024:>10.1f} {elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
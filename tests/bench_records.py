@@ -0,0 +1,74 @@
+# tests/bench_records.py
+"""
+Mémoire par enregistrement : vignobles et bodegas en dict (format JSON / ligne SQL)
+contre les classes à __slots__ de vinos_ibericos.datatypes.
+Non collecté par pytest ; à lancer avec : python -m tests.bench_records
+"""
+import tracemalloc
+
+from typing import Callable
+
+from vinos_ibericos.datatypes import Bodega, Vinedo
+
+COUNT = 100_000
+
+
+def vinedo_dict(i: int) -> dict:
+    return {
+        "nom": f"Vinedo {i}",
+        "coords": [36.0 + i / COUNT * 7, -9.0 + i / COUNT * 12],
+        "description": "",
+        "img": "",
+    }
+
+
+def bodega_dict(i: int) -> dict:
+    return {
+        "id": i,
+        "name": f"Bodega {i}",
+        "cp": 26000 + i % 1000,
+        "town": "Haro",
+        "street": None,
+        "number": None,
+        "comp": None,
+        "lat": 42.0 + i / COUNT,
+        "lon": -2.8,
+        "website": None,
+        "do_name": "Rioja",
+    }
+
+
+def measure(build: Callable[[], list]) -> float:
+    """Octets alloués par enregistrement (chaînes comprises, identiques des deux côtés)."""
+    tracemalloc.start()
+    records = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return size / COUNT
+
+
+def main() -> None:
+    rows = [
+        (
+            "vignoble",
+            measure(lambda: [vinedo_dict(i) for i in range(COUNT)]),
+            measure(lambda: [Vinedo.from_dict(vinedo_dict(i)) for i in range(COUNT)]),
+        ),
+        (
+            "bodega",
+            measure(lambda: [bodega_dict(i) for i in range(COUNT)]),
+            measure(lambda: [Bodega.from_row(bodega_dict(i)) for i in range(COUNT)]),
+        ),
+    ]
+    print(f"{COUNT} enregistrements")
+    print(f"{'type':<10} {'dict (o)':>10} {'slots (o)':>10} {'gain':>7}")
+    for name, as_dict, as_record in rows:
+        print(
+            f"{name:<10} {as_dict:>10.0f} {as_record:>10.0f} "
+            f"{1 - as_record / as_dict:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
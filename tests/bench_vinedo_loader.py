@@ -0,0 +1,109 @@
+# tests/bench_vinedo_loader.py
+"""
+Chargement d'un vinedos.json synthétique de 10 000 entrées (descriptions HTML longues,
+1 % d'entrées invalides) : json.load + validation entrée par entrée (ancien chargement)
+contre la lecture au fil de l'eau de load_vinedos (descriptions résidentes ou lues à la
+demande), puis contre l'instantané binaire (démarrages suivants, vinedos.json inchangé).
+'résident' : mémoire encore occupée par les vignobles une fois le chargement terminé.
+Non collecté par pytest ; à lancer avec : python -m tests.bench_vinedo_loader
+"""
+import json
+import tempfile
+import time
+import tracemalloc
+
+from pathlib import Path
+from typing import Any, Callable
+
+from vinos_ibericos.data.vinedo_descriptions import DescriptionStore
+from vinos_ibericos.data.vinedo_loader import load_vinedos
+from vinos_ibericos.data.vinedo_snapshot import load_with_snapshot
+from vinos_ibericos.datatypes import Vinedo
+
+ENTRIES = 10_000
+DESCRIPTION = "<p>" + "Tempranillo, garnacha y graciano en suelos arcillo-calcáreos. " * 30
+
+
+def entry(i: int) -> dict[str, Any]:
+    item = {
+        "nom": f"DO {i}",
+        "coords": [36.0 + (i % 700) / 100, -9.0 + (i % 1200) / 100],
+        "description": f"{DESCRIPTION}{i}</p>",
+        "img": f"do_{i}",
+    }
+    if i % 100 == 0:
+        del item["img"]
+    return item
+
+
+def legacy_load(path: Path) -> list[Vinedo]:
+    """Ancien chargement : tout le fichier, puis un schéma reconstruit par entrée."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    vinedos = []
+    for item in data:
+        required_keys = {"nom": str, "coords": list, "description": str, "img": str}
+        if all(
+            key in item and isinstance(item[key], typ)
+            for key, typ in required_keys.items()
+        ) and all(isinstance(x, float) for x in item["coords"]):
+            vinedos.append(Vinedo.from_dict(item))
+    return vinedos
+
+
+def measure(load: Callable[[], list]) -> tuple[int, float, float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    vinedos = load()
+    elapsed = time.perf_counter() - start
+    resident, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(vinedos), elapsed, peak, resident
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "vinedos.json"
+        path.write_text(
+            json.dumps([entry(i) for i in range(ENTRIES)], ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        size = path.stat().st_size / 1024 / 1024
+        print(f"{ENTRIES} entrées, {size:.1f} Mo")
+        rows = {
+            "json.load + validation": measure(lambda: legacy_load(path)),
+            "load_vinedos": measure(lambda: load_vinedos(path)[0]),
+            "load_vinedos (lazy)": measure(
+                lambda: load_vinedos(path, lazy_descriptions=True)[0]
+            ),
+        }
+        cache_dir = Path(tmp) / "cache"
+        load_with_snapshot(path, cache_dir)  # Premier démarrage : écrit l'instantané
+        rows["instantané"] = measure(lambda: load_with_snapshot(path, cache_dir)[0])
+        # Durées sans la surcharge de tracemalloc :
+        _, report = load_vinedos(path)
+        _, snapshot_report = load_with_snapshot(path, cache_dir)
+        # Ouverture d'une fiche : description relue dans le fichier, puis en cache
+        lazy, _ = load_vinedos(path, lazy_descriptions=True)
+        store = DescriptionStore(path)
+        start = time.perf_counter()
+        for vinedo in lazy[:100]:
+            store.get(vinedo)
+        read_ms = (time.perf_counter() - start) * 1000 / 100
+    print(
+        f"{'chargement':<24} {'entrées':>8} {'durée (ms)':>11} {'pic (Mo)':>9} "
+        f"{'résident (Mo)':>14}"
+    )
+    for name, (count, elapsed, peak, resident) in rows.items():
+        print(
+            f"{name:<24} {count:>8} {elapsed * 1000:>11.0f} {peak / 1024 / 1024:>9.1f} "
+            f"{resident / 1024 / 1024:>14.1f}"
+        )
+    print(f"Description lue à la demande : {read_ms:.3f} ms")
+    print(f"Sans tracemalloc : {report}")
+    print(f"Sans tracemalloc : {snapshot_report}")
+    print(f"Premier rejet : {report.rejected[0]}")
+
+
+if __name__ == "__main__":
+    main()
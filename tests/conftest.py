@@ -0,0 +1,17 @@
+# tests/conftest.py
+import pytest
+
+from vinos_ibericos.data.polygon_store import POLYGON_STORE
+
+
+@pytest.fixture(autouse=True, scope="session")
+def polygon_cache_dir(tmp_path_factory):
+    """
+    Caches binaires des polygones écrits dans un répertoire temporaire : les tests ne
+    touchent jamais au cache du projet (.cache/geojson).
+    """
+    cache_dir = POLYGON_STORE.cache_dir
+    POLYGON_STORE.cache_dir = tmp_path_factory.mktemp("polycache")
+    yield POLYGON_STORE.cache_dir
+    POLYGON_STORE.cache_dir = cache_dir
+    POLYGON_STORE.invalidate()
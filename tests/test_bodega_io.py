@@ -0,0 +1,115 @@
+# tests/test_bodega_io.py
+import json
+
+import pytest
+
+from vinos_ibericos.data.bodega_io import export_bodegas, import_bodegas, main
+from vinos_ibericos.data.bodega_manager import BodegaManager
+
+
+@pytest.fixture
+def manager():
+    """BodegaManager sur une base en mémoire."""
+    manager = BodegaManager(":memory:")
+    yield manager
+    manager.provider.close()
+
+
+def make_rows(count: int) -> list[dict]:
+    return [
+        {
+            "name": f"Bodega {i}",
+            "cp": str(28000 + i),
+            "town": "Madrid",
+            "lat": str(40.0 + i / 1000),
+            "lon": "-3.7",
+            "do_name": "Vinos de Madrid",
+        }
+        for i in range(count)
+    ]
+
+
+def test_add_bodegas_single_transaction_with_row_errors(manager):
+    """Insertion par lots en une seule transaction ; les lignes invalides sont listées."""
+    rows = make_rows(25)
+    rows[3]["cp"] = "pas un nombre"
+    rows[7]["town"] = None
+    statements = []
+    manager.conn.set_trace_callback(statements.append)
+    result = manager.add_bodegas(rows, batch_size=10)
+    manager.conn.set_trace_callback(None)
+    assert result.inserted == 23
+    assert [index for index, _ in result.errors] == [3, 7]
+    assert "town" in result.errors[1][1]
+    assert sum(1 for sql in statements if sql.strip().upper() == "COMMIT") == 1
+    assert len(manager.get_all_bodegas()) == 23
+    print("✅ Tests pour 'add_bodegas'")
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".json", ".jsonl"])
+def test_export_then_import_round_trip(manager, tmp_path, suffix):
+    manager.add_bodegas(make_rows(5))
+    path = tmp_path / f"bodegas{suffix}"
+    assert export_bodegas(path, manager).written == 5
+    other = BodegaManager(":memory:")
+    report = import_bodegas(path, other)
+    assert (report.rows, report.written, report.errors) == (5, 5, [])
+    assert [b["name"] for b in other.get_all_bodegas()] == [f"Bodega {i}" for i in range(5)]
+    other.provider.close()
+    print(f"✅ Aller-retour {suffix} : {report}")
+
+
+def test_import_reports_file_line_numbers(manager, tmp_path):
+    path = tmp_path / "bodegas.csv"
+    path.write_text(
+        "name,town,lat,lon,do_name\n"
+        "Buena,Haro,42.57,-2.85,Rioja\n"
+        "Mala,Haro,no-lat,-2.85,Rioja\n",
+        encoding="utf-8",
+    )
+    report = import_bodegas(path, manager)
+    assert report.written == 1
+    assert report.errors[0][0] == 3  # 3e ligne du fichier
+
+
+def test_import_skips_malformed_rows(manager, tmp_path):
+    """Ligne illisible, valeur d'un mauvais type ou enregistrement non objet : signalés."""
+    good = make_rows(3)
+    path = tmp_path / "bodegas.jsonl"
+    lines = [
+        json.dumps(good[0]),
+        "{oops",
+        json.dumps(dict(good[1], cp=[1])),
+        "[1, 2]",
+        json.dumps(good[2]),
+    ]
+    path.write_text("\n".join(lines), encoding="utf-8")
+    report = import_bodegas(path, manager)
+    assert (report.rows, report.written) == (5, 2)
+    assert [line for line, _ in report.errors] == [2, 3, 4]
+    assert "JSON invalide" in report.errors[0][1] and "cp" in report.errors[1][1]
+    print(f"✅ Lignes mal formées ignorées : {report}")
+
+
+def test_import_csv_line_numbers_with_multiline_field(manager, tmp_path):
+    path = tmp_path / "bodegas.csv"
+    path.write_text(
+        "name,town,comp,lat,lon,do_name\n"
+        'Buena,Haro,"Bâtiment A\nEscalier 2",42.57,-2.85,Rioja\n'
+        "Mala,Haro,,no-lat,-2.85,Rioja\n",
+        encoding="utf-8",
+    )
+    report = import_bodegas(path, manager)
+    assert report.written == 1
+    assert report.errors[0][0] == 4  # Le champ entre guillemets occupe les lignes 2-3
+
+
+def test_cli_import_export(tmp_path, capsys):
+    source = tmp_path / "in.jsonl"
+    source.write_text("\n".join(json.dumps(r) for r in make_rows(3)), encoding="utf-8")
+    db_path = tmp_path / "bodegas.db"
+    main(["import", str(source), "--db", str(db_path)])
+    main(["export", str(tmp_path / "out.json"), "--db", str(db_path)])
+    exported = json.loads((tmp_path / "out.json").read_text(encoding="utf-8"))
+    assert len(exported) == 3
+    assert "lignes/s" in capsys.readouterr().out
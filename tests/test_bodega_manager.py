@@ -1,6 +1,13 @@
 import pytest
 import sqlite3
-from vinos_ibericos.data.bodega_manager import BodegaManager, CREATE_BODEGAS_TABLE_SQL
+from vinos_ibericos.data.bodega_manager import (
+    BodegaManager,
+    LEGACY_PROFILE,
+    TUNED_PROFILE,
+    create_spatial_index,
+    has_rtree,
+    init_db,
+)
 
 
 # ========================
@@ -9,14 +16,13 @@ from vinos_ibericos.data.bodega_manager import BodegaManager, CREATE_BODEGAS_TAB
 
 
 @pytest.fixture
-def db_manager():
-    """Retourne un BodegaManager avec une BDD SQLite en mémoire (propre à chaque test)."""
-    conn = sqlite3.connect(":memory:")
-    conn.execute(CREATE_BODEGAS_TABLE_SQL)
-    manager = BodegaManager()
-    manager.conn = conn  # injection de la connexion in-memory
-    yield manager
-    conn.close()
+def db_manager(tmp_path):
+    """
+    Retourne un BodegaManager sur une base temporaire (propre à chaque test) : la base
+    versionnée data/bodegas.db n'est jamais ouverte ni migrée par les tests.
+    """
+    with BodegaManager(tmp_path / "bodegas.db") as manager:
+        yield manager
 
 
 @pytest.fixture
@@ -147,3 +153,162 @@ def test_get_all_bodegas(db_manager, sample_bodega_data):
     names = [b["name"] for b in bodegas]
     assert "Bodega Test" in names
     assert "Bodega Dos" in names
+
+
+# ========================
+# Index spatial
+# ========================
+
+
+@pytest.fixture
+def spatial_manager():
+    """BodegaManager sur une base en mémoire initialisée par init_db (avec index R*Tree)."""
+    manager = BodegaManager(":memory:")
+    yield manager
+    manager.provider.close()
+
+
+def test_bbox_query_uses_rtree(spatial_manager, sample_bodega_data):
+    inside = dict(sample_bodega_data, name="Dedans", lat=41.5, lon=-3.0)
+    outside = dict(sample_bodega_data, name="Dehors", lat=37.0, lon=-6.0)
+    spatial_manager.add_bodega(inside)
+    outside_id = spatial_manager.add_bodega(outside)
+    assert has_rtree(spatial_manager.conn)
+    names = [b["name"] for b in spatial_manager.get_bodegas_in_bbox(41.0, -4.0, 42.0, -2.0)]
+    assert names == ["Dedans"]
+    # L'index suit les modifications de la table (triggers) :
+    spatial_manager.conn.execute(
+        "UPDATE bodegas SET lat = 41.2, lon = -3.5 WHERE id = ?", (outside_id,)
+    )
+    assert len(spatial_manager.get_bodegas_in_bbox(41.0, -4.0, 42.0, -2.0)) == 2
+    spatial_manager.delete_bodega(outside_id)
+    assert len(spatial_manager.get_bodegas_in_bbox(41.0, -4.0, 42.0, -2.0)) == 1
+    plan = " ".join(
+        str(row)
+        for row in spatial_manager.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM bodegas_rtree WHERE min_lat >= 41 AND max_lat <= 42"
+        )
+    )
+    assert "VIRTUAL TABLE INDEX" in plan
+    print("✅ Tests pour 'get_bodegas_in_bbox'")
+
+
+def test_bbox_query_keeps_bodegas_on_the_edge(spatial_manager, sample_bodega_data):
+    """Coordonnées non représentables en float32 : une bodega sur un bord est incluse."""
+    lat, lon = 40.12345678912, -3.98765432198
+    spatial_manager.add_bodega(dict(sample_bodega_data, name="Bord", lat=lat, lon=lon))
+    spatial_manager.add_bodega(
+        dict(sample_bodega_data, name="Sud-ouest", lat=lat - 1e-9, lon=lon - 1e-9)
+    )
+    # Bords sud et ouest, puis bords nord et est :
+    names = [b["name"] for b in spatial_manager.get_bodegas_in_bbox(lat, lon, 41.0, -3.0)]
+    assert names == ["Bord"]
+    names = [b["name"] for b in spatial_manager.get_bodegas_in_bbox(39.0, -5.0, lat, lon)]
+    assert sorted(names) == ["Bord", "Sud-ouest"]
+    print("✅ Tests pour les bords de 'get_bodegas_in_bbox'")
+
+
+def test_filtered_queries_keep_bodegas_on_the_edge(spatial_manager, sample_bodega_data):
+    """Même prédicat d'emprise pour stream_bodegas, count_bodegas et page_bodegas."""
+    lat, lon = 40.12345678912, -3.98765432198
+    spatial_manager.add_bodega(dict(sample_bodega_data, name="Bord", lat=lat, lon=lon))
+    bbox = (lat, lon, 41.0, -3.0)
+    assert [r["name"] for r in spatial_manager.stream_bodegas(bbox=bbox)] == ["Bord"]
+    assert spatial_manager.count_bodegas(bbox=bbox) == 1
+    assert [r["name"] for r in spatial_manager.page_bodegas(bbox=bbox).rows] == ["Bord"]
+    print("✅ Tests pour les bords des requêtes filtrées")
+
+
+def test_spatial_index_backfills_existing_rows(db_manager, sample_bodega_data):
+    """Une base créée avant l'index est indexée à l'ouverture."""
+    db_manager.add_bodega(dict(sample_bodega_data, lat=40.0, lon=-3.0))
+    create_spatial_index(db_manager.conn)
+    assert len(db_manager.get_bodegas_in_bbox(39.0, -4.0, 41.0, -2.0)) == 1
+
+
+def test_storage_profile_pragmas(tmp_path):
+    """Le profil par défaut active WAL, synchronous=NORMAL, mmap et le cache de pages."""
+    conn = init_db(tmp_path / "bodegas.db")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA mmap_size").fetchone()[0] == TUNED_PROFILE.MMAP_SIZE
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == TUNED_PROFILE.CACHE_SIZE
+    conn.close()
+    legacy = init_db(tmp_path / "legacy.db", profile=LEGACY_PROFILE)
+    assert legacy.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    legacy.close()
+
+
+# ========================
+# Requêtes filtrées et pagination
+# ========================
+
+
+@pytest.fixture
+def query_manager(spatial_manager, sample_bodega_data):
+    """30 bodegas réparties sur 3 DO et 2 villes (lat croissante avec l'indice)."""
+    spatial_manager.add_bodegas(
+        dict(
+            sample_bodega_data,
+            name=f"Bodega {i:02d}",
+            do_name=f"DO {i % 3}",
+            town="Logroño" if i % 2 else "Haro",
+            lat=40.0 + i / 10,
+            lon=-3.0,
+        )
+        for i in range(30)
+    )
+    return spatial_manager
+
+
+def test_stream_bodegas_filters_and_order(query_manager):
+    rows = list(query_manager.stream_bodegas(do_name="DO 1", town="Haro", batch_size=2))
+    assert [r["name"] for r in rows] == [f"Bodega {i:02d}" for i in (4, 10, 16, 22, 28)]
+    assert isinstance(rows[0], sqlite3.Row)
+    assert query_manager.count_bodegas(do_name="DO 1", town="Haro") == 5
+    in_bbox = query_manager.stream_bodegas(
+        bbox=(41.0, -4.0, 41.45, -2.0), order_by="lat", descending=True
+    )
+    assert [r["name"] for r in in_bbox] == [f"Bodega {i}" for i in range(14, 9, -1)]
+    with pytest.raises(ValueError):
+        list(query_manager.stream_bodegas(order_by="name; DROP TABLE bodegas"))
+    print("✅ Tests pour 'stream_bodegas'")
+
+
+@pytest.mark.parametrize(
+    "order_by, descending", [("id", False), ("town", False), ("do_name", True)]
+)
+def test_page_bodegas_keyset(query_manager, order_by, descending):
+    """Les pages couvrent toutes les lignes, sans doublon, dans l'ordre du parcours."""
+    expected = [
+        r["id"]
+        for r in query_manager.stream_bodegas(order_by=order_by, descending=descending)
+    ]
+    seen, after, pages = [], None, 0
+    while True:
+        page = query_manager.page_bodegas(
+            order_by=order_by, descending=descending, page_size=7, after=after
+        )
+        seen += [r["id"] for r in page.rows]
+        pages += 1
+        if page.next_cursor is None:
+            break
+        after = page.next_cursor
+    assert seen == expected
+    assert pages == 5
+
+
+def test_page_bodegas_with_null_sort_values(query_manager):
+    """Colonne de tri nullable (cp) : les NULL ne sont ni perdus ni répétés."""
+    query_manager.conn.execute("UPDATE bodegas SET cp = NULL WHERE id % 4 = 0")
+    for descending in (False, True):
+        seen, after = [], None
+        while True:
+            page = query_manager.page_bodegas(
+                order_by="cp", descending=descending, page_size=4, after=after
+            )
+            seen += [r["id"] for r in page.rows]
+            if (after := page.next_cursor) is None:
+                break
+        assert sorted(seen) == list(range(1, 31))
+        assert len(seen) == 30
@@ -0,0 +1,124 @@
+# tests/test_connection.py
+import logging
+import sqlite3
+import threading
+
+import pytest
+
+from vinos_ibericos.data.bodega_manager import (
+    LEGACY_PROFILE,
+    BodegaManager,
+    get_bodega_provider,
+)
+from vinos_ibericos.data.connection import ConnectionProvider, close_all, get_provider
+
+BODEGA = {"name": "Uno", "town": "A", "lat": 40.0, "lon": -3.0, "do_name": "X"}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    yield tmp_path / "bodegas.db"
+    close_all()
+
+
+def test_managers_share_pooled_connection(db_path, caplog):
+    """Deux gestionnaires successifs : une seule connexion ouverte, schéma créé une fois."""
+    caplog.set_level(logging.DEBUG, logger="vinos_ibericos.data.connection")
+    with BodegaManager(db_path) as first:
+        first.add_bodega(BODEGA)
+    provider = get_bodega_provider(db_path)
+    statements = provider.statements
+    with BodegaManager(db_path) as second:
+        assert second.provider is provider
+        assert len(second.get_all_bodegas()) == 1
+    stats = provider.stats()
+    assert (stats["opened"], stats["reused"], stats["in_use"]) == (1, 1, 0)
+    assert provider.statements - statements == 1  # Seulement le SELECT
+    print(f"✅ Connexions partagées : {stats}")
+
+
+def test_statements_are_only_traced_when_counting(tmp_path):
+    """Sans DEBUG ni count_statements : aucun trace callback sur les connexions."""
+    with ConnectionProvider(tmp_path / "t.db") as provider:
+        with provider.connection() as conn:
+            conn.execute("SELECT 1").fetchone()
+        assert provider.statements == 0
+    with ConnectionProvider(tmp_path / "t.db", count_statements=True) as provider:
+        with provider.connection() as conn:
+            conn.execute("SELECT 1").fetchone()
+        assert provider.statements == 1
+
+
+def test_provider_profile_mismatch_is_rejected(db_path):
+    """Un autre profil sur un fichier déjà ouvert : erreur au lieu du premier profil."""
+    provider = get_bodega_provider(db_path)
+    assert get_bodega_provider(db_path) is provider
+    with pytest.raises(ValueError, match="autres réglages"):
+        get_bodega_provider(db_path, LEGACY_PROFILE)
+    provider.close()
+    assert get_bodega_provider(db_path, LEGACY_PROFILE).settings == LEGACY_PROFILE
+
+
+def test_connection_context_commits_or_rolls_back(tmp_path):
+    with ConnectionProvider(tmp_path / "t.db") as provider:
+        with provider.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+        with pytest.raises(RuntimeError):
+            with provider.connection() as conn:
+                conn.execute("INSERT INTO t VALUES (2)")
+                raise RuntimeError("échec")
+        with provider.connection() as conn:
+            assert conn.execute("SELECT x FROM t").fetchall() == [(1,)]
+    assert provider.is_closed and provider.stats()["closed"] == provider.stats()["opened"]
+    with pytest.raises(sqlite3.ProgrammingError):
+        provider.acquire()
+
+
+def test_pool_serves_worker_threads(tmp_path):
+    """Connexions empruntées en parallèle, au plus POOL_SIZE conservées ensuite."""
+    provider = ConnectionProvider(tmp_path / "t.db", pool_size=2)
+    barrier = threading.Barrier(4)
+
+    def work():
+        with provider.connection() as conn:
+            barrier.wait()
+            conn.execute("SELECT 1").fetchone()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = provider.stats()
+    assert (stats["opened"], stats["idle"], stats["closed"]) == (4, 2, 2)
+    provider.close()
+
+
+def test_memory_databases_are_not_shared():
+    assert get_provider(":memory:") is not get_provider(":memory:")
+    first, second = BodegaManager(":memory:"), BodegaManager(":memory:")
+    first.add_bodega(BODEGA)
+    assert second.get_all_bodegas() == []
+
+
+def test_failed_initialize_is_retried(tmp_path):
+    """Migration en échec : connexion fermée, non comptée, et nouvel essai ensuite."""
+    calls = []
+
+    def initialize(conn):
+        calls.append(conn)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("migration interrompue")
+
+    provider = ConnectionProvider(tmp_path / "bodegas.db", initialize=initialize)
+    with pytest.raises(sqlite3.OperationalError):
+        provider.acquire()
+    with pytest.raises(sqlite3.ProgrammingError):
+        calls[0].execute("SELECT 1")  # Connexion fermée
+    assert provider.stats()["opened"] == 0
+    conn = provider.acquire()
+    provider.release(conn)
+    provider.release(provider.acquire())
+    assert len(calls) == 2 and provider.stats()["opened"] == 1
+    provider.close()
@@ -0,0 +1,51 @@
+# tests/test_datatypes.py
+import pickle
+
+import pytest
+
+from vinos_ibericos.data.bodega_manager import COLUMNS, BodegaManager
+from vinos_ibericos.datatypes import Bodega, Vinedo, as_vinedo, as_vinedos
+from vinos_ibericos.map_manager import MapManager
+
+
+VINEDO_DICT = {
+    "nom": "Rioja",
+    "coords": [42.4, -2.6],
+    "description": "<p>Tempranillo</p>",
+    "img": "rioja",
+}
+
+
+def test_vinedo_round_trip():
+    """Coordonnées en float, aller-retour avec la forme de vinedos.json."""
+    vinedo = Vinedo.from_dict(VINEDO_DICT)
+    assert vinedo.coords == (42.4, -2.6) and isinstance(vinedo.lat, float)
+    assert vinedo.to_dict() == VINEDO_DICT
+    assert as_vinedo(vinedo) is vinedo
+    assert as_vinedos([VINEDO_DICT, vinedo]) == [vinedo, vinedo]
+    assert pickle.loads(pickle.dumps(vinedo)) == vinedo  # Processus de préchauffage
+    assert not hasattr(vinedo, "__dict__")
+    with pytest.raises(AttributeError):
+        vinedo.nom = "Otro"  # type: ignore[misc]
+    print("✅ Tests pour 'Vinedo'")
+
+
+def test_map_manager_accepts_dicts_and_records():
+    """Même empreinte (et même rendu en cache) avec des dict ou des Vinedo."""
+    from_dicts = MapManager([VINEDO_DICT], bundle_dir=None)
+    from_records = MapManager([Vinedo.from_dict(VINEDO_DICT)], bundle_dir=None)
+    assert from_dicts.fingerprint == from_records.fingerprint
+    assert from_dicts.vinedos == from_records.vinedos
+
+
+def test_bodega_from_row():
+    """Les champs de Bodega suivent les colonnes de la table."""
+    assert Bodega.__slots__ == ("id",) + COLUMNS
+    manager = BodegaManager(":memory:")
+    manager.add_bodega(
+        {"name": "Bodega", "town": "Haro", "lat": 42.5, "lon": -2.8, "do_name": "Rioja"}
+    )
+    bodega = Bodega.from_row(next(manager.stream_bodegas()))
+    assert (bodega.id, bodega.name, bodega.cp, bodega.lat) == (1, "Bodega", None, 42.5)
+    assert Bodega.from_row(bodega.to_dict()) == bodega
+    manager.provider.close()
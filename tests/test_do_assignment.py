@@ -0,0 +1,111 @@
+# tests/test_do_assignment.py
+import json
+import subprocess
+import sys
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from vinos_ibericos.data.do_assignment import AuditStatus, DoAssigner, display_names
+from vinos_ibericos.data.polygon_store import PolygonStore
+
+# Carrés (lon, lat) au format GeoJSON
+ALTA = [[-4.0, 41.0], [-3.0, 41.0], [-3.0, 42.0], [-4.0, 42.0], [-4.0, 41.0]]
+BAJA = [[-4.0, 38.0], [-3.0, 38.0], [-3.0, 39.0], [-4.0, 39.0], [-4.0, 38.0]]
+
+
+def write_geojson(geojson_dir: Path, slug: str, ring: list, properties: dict) -> None:
+    feature = {
+        "type": "Feature",
+        "properties": properties,
+        "geometry": {"type": "Polygon", "coordinates": [ring]},
+    }
+    data = {"type": "FeatureCollection", "features": [feature]}
+    (geojson_dir / f"{slug}.geojson").write_text(json.dumps(data), encoding="utf-8")
+
+
+@pytest.fixture
+def geojson_dir(tmp_path):
+    """Deux DO fictives ; seule 'tierra_alta' porte un nom dans ses 'properties'."""
+    geojson_dir = tmp_path / "geojson"
+    geojson_dir.mkdir()
+    write_geojson(geojson_dir, "tierra_alta", ALTA, {"name": "Tierra Alta"})
+    write_geojson(geojson_dir, "tierra_baja", BAJA, {})
+    return geojson_dir
+
+
+@pytest.fixture
+def assigner(tmp_path, geojson_dir):
+    """DoAssigner sur deux DO fictives ('Tierra Alta', 'Tierra Baja')."""
+    store = PolygonStore(cache_dir=tmp_path / "cache", zoom_levels=())
+    return DoAssigner(["Tierra Alta", "Tierra Baja"], geojson_dir=geojson_dir, store=store)
+
+
+def test_assign_points_in_batch(assigner):
+    lats = np.array([41.5, 38.5, 40.0])
+    lons = np.array([-3.5, -3.5, -3.5])
+    assert assigner.assign(lats, lons) == [["Tierra Alta"], ["Tierra Baja"], []]
+    print("✅ Tests pour 'assign'")
+
+
+def test_single_point_check(assigner):
+    assert assigner.contains("Tierra Alta", 41.5, -3.5) is True
+    assert assigner.contains("tierra alta", 38.5, -3.5) is False
+    assert assigner.contains("DO Inconnue", 41.5, -3.5) is None
+
+
+def test_audit_reports_status_per_bodega(assigner):
+    bodegas = [
+        {"id": 1, "name": "Buena", "do_name": "Tierra Alta", "lat": 41.5, "lon": -3.5},
+        {"id": 2, "name": "Perdida", "do_name": "Tierra Alta", "lat": 38.5, "lon": -3.5},
+        {"id": 3, "name": "Libre", "do_name": "Otra DO", "lat": 41.5, "lon": -3.5},
+        {"id": 4, "name": "Sin coords", "do_name": "Tierra Alta", "lat": None, "lon": None},
+    ]
+    rows = {row.id: row for row in assigner.audit(bodegas)}
+    assert rows[1].status == AuditStatus.OK
+    assert rows[2].status == AuditStatus.OUTSIDE
+    assert rows[2].containing == ("Tierra Baja",)
+    assert rows[3].status == AuditStatus.NO_POLYGON
+    assert rows[4].status == AuditStatus.NO_COORDS
+    print("✅ Tests pour 'audit'")
+
+
+def test_default_names_are_display_names(tmp_path, geojson_dir):
+    """Sans liste de DO : noms de vinedos.json, puis du GeoJSON, puis le slug."""
+    json_path = tmp_path / "vinedos.json"
+    vinedo = {"nom": "Tierra Baja", "coords": [38.5, -3.5], "description": "", "img": ""}
+    json_path.write_text(json.dumps([vinedo]), encoding="utf-8")
+    assert display_names(geojson_dir, json_path) == {
+        "tierra_alta": "Tierra Alta",
+        "tierra_baja": "Tierra Baja",
+    }
+    missing = tmp_path / "absent.json"
+    assert display_names(geojson_dir, missing)["tierra_baja"] == "tierra_baja"
+
+    store = PolygonStore(cache_dir=tmp_path / "cache", zoom_levels=())
+    default = DoAssigner(geojson_dir=geojson_dir, store=store)
+    assert default.assign(np.array([41.5]), np.array([-3.5])) == [["Tierra Alta"]]
+    print("✅ Tests pour 'display_names'")
+
+
+def test_module_does_not_import_map_manager():
+    """Importer le module (CLI, formulaire) ne doit pas charger map_manager."""
+    code = (
+        "import sys, vinos_ibericos.data.do_assignment; "
+        "assert 'vinos_ibericos.map_manager' not in sys.modules"
+    )
+    root = Path(__file__).resolve().parent.parent
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+def test_shared_assigner_is_built_on_first_use():
+    """L'instance partagée n'est créée qu'au premier appel, puis réutilisée."""
+    from vinos_ibericos.config.general import ConfigPath
+    from vinos_ibericos.data import do_assignment
+
+    shared = do_assignment.get_do_assigner()
+    assert shared is do_assignment.get_do_assigner()
+    assert shared.geojson_dir == ConfigPath.GEOJSON_DIR
+    print("✅ Tests pour 'get_do_assigner'")
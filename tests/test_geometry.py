@@ -0,0 +1,59 @@
+# tests/test_geometry.py
+import numpy as np
+
+from vinos_ibericos.data.geometry import (
+    douglas_peucker,
+    points_in_ring,
+    points_in_rings,
+    simplify_ring,
+    tolerance_for_zoom,
+)
+
+
+def test_tolerance_decreases_with_zoom():
+    assert tolerance_for_zoom(10) < tolerance_for_zoom(7)
+    assert tolerance_for_zoom(0) == 360.0 / 256
+
+
+def test_douglas_peucker_removes_collinear_points():
+    """Les points alignés disparaissent, les extrémités sont conservées."""
+    line = np.array([[0.0, 0.0], [1.0, 0.0], [2.0, 0.0], [3.0, 0.0]])
+    assert douglas_peucker(line, 0.01).tolist() == [[0.0, 0.0], [3.0, 0.0]]
+
+
+def test_douglas_peucker_keeps_points_above_tolerance():
+    line = np.array([[0.0, 0.0], [1.0, 0.5], [2.0, 0.0]])
+    assert len(douglas_peucker(line, 0.1)) == 3
+    assert len(douglas_peucker(line, 1.0)) == 2
+
+
+def test_simplify_ring_stays_a_closed_polygon():
+    """Un anneau fermé garde au moins 4 points et reste fermé."""
+    angles = np.linspace(0, 2 * np.pi, 200)
+    ring = np.column_stack([np.cos(angles), np.sin(angles)])
+    ring[-1] = ring[0]
+    simplified = simplify_ring(ring, 0.05)
+    assert 4 <= len(simplified) < len(ring)
+    assert simplified[0].tolist() == simplified[-1].tolist()
+    # Tolérance énorme : on ne descend pas sous le triangle
+    assert len(simplify_ring(ring, 10.0)) >= 4
+    print("✅ Tests pour 'geometry'")
+
+
+def test_points_in_ring_ray_casting():
+    """Carré (lat, lon) de 0 à 2 : dedans, dehors et anneau non fermé."""
+    square = np.array([[0.0, 0.0], [0.0, 2.0], [2.0, 2.0], [2.0, 0.0], [0.0, 0.0]])
+    points = np.array([[1.0, 1.0], [3.0, 1.0], [1.0, -0.5], [0.5, 1.9]])
+    assert points_in_ring(points, square).tolist() == [True, False, False, True]
+    assert points_in_ring(points, square[:-1]).tolist() == [True, False, False, True]
+
+
+def test_points_in_rings_even_odd_with_hole():
+    """Un point dans le trou n'appartient pas au polygone ; l'île disjointe oui."""
+    outer = [[0.0, 0.0], [0.0, 4.0], [4.0, 4.0], [4.0, 0.0], [0.0, 0.0]]
+    hole = [[1.0, 1.0], [1.0, 2.0], [2.0, 2.0], [2.0, 1.0], [1.0, 1.0]]
+    island = [[10.0, 10.0], [10.0, 11.0], [11.0, 11.0], [10.0, 10.0]]
+    vertices = np.array(outer + hole + island)
+    offsets = [0, len(outer), len(outer) + len(hole), len(vertices)]
+    points = np.array([[3.0, 3.0], [1.5, 1.5], [10.2, 10.8], [20.0, 20.0]])
+    assert points_in_rings(points, vertices, offsets).tolist() == [True, False, True, False]
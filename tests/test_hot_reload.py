@@ -0,0 +1,108 @@
+# tests/test_hot_reload.py
+import json
+import os
+import time
+
+import pytest
+import shiboken6
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtGui import QGuiApplication
+
+from vinos_ibericos.map_manager import MapManager
+from vinos_ibericos.ui.hot_reload import DataWatcher, changed_files, scan_files
+from vinos_ibericos.utils import CheckVinedoJson
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return QCoreApplication.instance() or QGuiApplication([])  # QPixmap (autres tests)
+
+
+def write_vinedos(path, names, lat=40.0):
+    items = [
+        {"nom": name, "coords": [lat, -3.0], "description": f"<p>{name}</p>", "img": ""}
+        for name in names
+    ]
+    path.write_text(json.dumps(items), encoding="utf-8")
+
+
+def wait_for(watcher, received, count=1, timeout=5.0):
+    """Laisse passer la minuterie, le thread de travail et la livraison des signaux."""
+    deadline = time.monotonic() + timeout
+    while len(received) < count and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        watcher.wait(50)
+    return received
+
+
+@pytest.fixture
+def setup(tmp_path, qapp):
+    json_path = tmp_path / "vinedos.json"
+    geojson_dir = tmp_path / "geojson"
+    geojson_dir.mkdir()
+    write_vinedos(json_path, ["Rioja", "Toro"])
+    loader = CheckVinedoJson(json_path, snapshot_dir=None)
+    loader.load()
+    manager = MapManager(loader.data, geojson_dir=geojson_dir, bundle_dir=None)
+    watcher = DataWatcher(loader, manager, debounce_ms=20)
+    yield json_path, geojson_dir, loader, manager, watcher
+    watcher.stop()
+    QCoreApplication.processEvents()  # Résultats en attente livrés avant destruction
+    # Détruit ici, dans le thread principal : laissé au ramasse-miettes (cycles via les
+    # callbacks), il pourrait l'être depuis un thread de travail d'un autre test.
+    shiboken6.delete(watcher)
+
+
+def test_vinedos_reloaded_once_per_burst(setup):
+    """Rafale d'écritures => une seule relecture, différence avec les données affichées."""
+    json_path, _, loader, manager, watcher = setup
+    reloads = []
+    watcher.vinedos_reloaded.connect(reloads.append)
+    write_vinedos(json_path, ["Rioja"])
+    write_vinedos(json_path, ["Rioja", "Toro", "Bierzo"], lat=41.0)
+    wait_for(watcher, reloads)
+    wait_for(watcher, reloads, count=2, timeout=0.3)  # Pas de seconde relecture
+    assert len(reloads) == 1
+    diff = reloads[0].diff
+    assert [v.nom for v in diff.added] == ["Bierzo"]
+    assert {v.nom for v in diff.changed} == {"Rioja", "Toro"}
+    assert [v.nom for v in loader.data] == ["Rioja", "Toro", "Bierzo"]
+    assert [v.nom for v in manager.vinedos] == ["Rioja", "Toro", "Bierzo"]
+    print("✅ Tests pour 'DataWatcher' (vinedos.json)")
+
+
+def test_invalid_json_keeps_current_data(setup):
+    json_path, _, loader, _, watcher = setup
+    failures = []
+    watcher.reload_failed.connect(failures.append)
+    json_path.write_text('[{"nom": "Rioja"', encoding="utf-8")  # Écriture en cours
+    wait_for(watcher, failures)
+    assert len(failures) == 1
+    assert [v.nom for v in loader.data] == ["Rioja", "Toro"]
+
+
+def test_geojson_change_invalidates_matching_view(setup):
+    _, geojson_dir, _, manager, watcher = setup
+    manager.generate_map_html("Toro")
+    manager.generate_map_html("Rioja")
+    changes = []
+    watcher.geojson_changed.connect(changes.append)
+    (geojson_dir / "toro.geojson").write_text("{}", encoding="utf-8")
+    wait_for(watcher, changes)
+    assert changes[0].files == [geojson_dir / "toro.geojson"]
+    assert changes[0].names == ["Toro"]
+    assert manager.is_cached("Rioja") and not manager.is_cached("Toro")
+    print("✅ Tests pour 'DataWatcher' (.geojson)")
+
+
+def test_changed_files(tmp_path):
+    (tmp_path / "a.geojson").write_text("{}")
+    (tmp_path / "b.geojson").write_text("{}")
+    before = scan_files(tmp_path)
+    (tmp_path / "a.geojson").unlink()
+    (tmp_path / "c.geojson").write_text("{}")
+    os.utime(tmp_path / "b.geojson", ns=(0, 0))
+    assert changed_files(before, scan_files(tmp_path)) == [
+        tmp_path / name for name in ("a.geojson", "b.geojson", "c.geojson")
+    ]
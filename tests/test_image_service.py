@@ -0,0 +1,95 @@
+# tests/test_image_service.py
+import os
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtGui import QColor, QGuiApplication, QImage
+
+from vinos_ibericos.ui.image_service import ImageService
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # QPixmap sans affichage
+    app = QCoreApplication.instance() or QGuiApplication([])
+    if not isinstance(app, QGuiApplication):
+        pytest.skip("QGuiApplication nécessaire pour créer des QPixmap")
+    return app
+
+
+@pytest.fixture
+def img_dir(tmp_path):
+    img_dir = tmp_path / "img"
+    img_dir.mkdir()
+    for name, color in (("rioja.jpg", "darkred"), ("default_img.png", "white")):
+        image = QImage(800, 400, QImage.Format_RGB32)
+        image.fill(QColor(color))
+        image.save(str(img_dir / name))
+    return img_dir
+
+
+def test_resolve_uses_index(img_dir):
+    """Nom sans extension résolu par l'index ; image inconnue => image de repli."""
+    service = ImageService(img_dir, cache_dir=None)
+    assert service.resolve("rioja") == img_dir / "rioja.jpg"
+    assert service.resolve("inexistant") == img_dir / "default_img.png"
+    assert service.resolve(str(img_dir / "rioja")) == img_dir / "rioja.jpg"
+    (img_dir / "toro.jpg").write_bytes((img_dir / "rioja.jpg").read_bytes())
+    assert service.resolve("toro") == img_dir / "default_img.png"  # Index déjà fait
+    service.invalidate()
+    assert service.resolve("toro") == img_dir / "toro.jpg"
+    print("✅ Tests pour 'ImageService.resolve'")
+
+
+def test_thumbnails_on_disk(img_dir, tmp_path):
+    """Image décodée une seule fois par taille, puis relue depuis sa miniature."""
+    cache_dir = tmp_path / "thumbnails"
+    service = ImageService(img_dir, cache_dir=cache_dir)
+    path = img_dir / "rioja.jpg"
+    image = service.thumbnail(path, (600, 320))
+    assert (image.width(), image.height()) == (600, 300)  # KeepAspectRatio
+    service.thumbnail(path, (400, 300))
+    assert service.decodes == 2 and len(list(cache_dir.iterdir())) == 2
+    other = ImageService(img_dir, cache_dir=cache_dir)  # Démarrage suivant
+    assert other.thumbnail(path, (600, 320)).size() == image.size()
+    assert (other.decodes, other.disk_hits) == (0, 1)
+    # Source modifiée : miniature périmée
+    os.utime(path, ns=(0, 0))
+    other.thumbnail(path, (600, 320))
+    assert other.decodes == 1
+    print("✅ Tests pour les miniatures de 'ImageService'")
+
+
+def test_invalidate_prunes_stale_thumbnails(img_dir, tmp_path):
+    """Rechargement : miniatures d'images supprimées ou modifiées effacées du disque."""
+    cache_dir = tmp_path / "thumbnails"
+    service = ImageService(img_dir, cache_dir=cache_dir)
+    rioja, default = img_dir / "rioja.jpg", img_dir / "default_img.png"
+    service.thumbnail(rioja, (600, 320))
+    service.thumbnail(default, (600, 320))
+    outside = tmp_path / "copa.png"  # Image hors index (panneau droit)
+    default.rename(outside)
+    service.thumbnail(outside, (600, 320))
+    kept = service._thumbnail_path(outside, (600, 320))
+    os.utime(rioja, ns=(0, 0))  # Modifiée : ancienne miniature périmée
+    (cache_dir / "orphan-1x1-0123456789abcdef.tmp").write_bytes(b"")
+    service.invalidate()
+    assert list(cache_dir.iterdir()) == [kept]
+    assert service.resolve("rioja") == rioja
+    service.thumbnail(rioja, (600, 320))
+    assert len(list(cache_dir.iterdir())) == 2
+    print("✅ Tests pour l'élagage des miniatures")
+
+
+def test_pixmap_memory_cache(qapp, img_dir):
+    service = ImageService(img_dir, cache_dir=None, maxsize=1)
+    first = service.pixmap("rioja", (600, 320))
+    assert (first.width(), first.height()) == (600, 300)
+    assert service.pixmap("rioja", (600, 320)).cacheKey() == first.cacheKey()
+    assert service.memory_hits == 1 and service.decodes == 1
+    service.pixmap("rioja", (400, 300))  # Autre taille : évince la première (LRU)
+    service.pixmap("rioja", (600, 320))
+    assert service.decodes == 3 and len(service) == 1
+    missing = ImageService(img_dir / "absent", cache_dir=None)
+    assert missing.pixmap("rioja", (10, 10)).isNull()
+    print("✅ Tests pour le cache mémoire de 'ImageService'")
@@ -0,0 +1,66 @@
+# tests/test_map_bundle.py
+import json
+
+import pytest
+
+from vinos_ibericos.build_maps import build_bundle
+from vinos_ibericos.map_manager import MapManager
+
+VINEDOS = [
+    {"nom": "Vinedo Uno", "coords": [40.0, -3.3], "description": "Uno", "img": "uno"},
+    {"nom": "Vinedo Dos", "coords": [41.0, -3.7], "description": "Dos", "img": "dos"},
+]
+RING = [[-3.0, 40.0], [-3.1, 40.0], [-3.1, 40.1], [-3.0, 40.1], [-3.0, 40.0]]
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    """vinedos.json + un .geojson dans un répertoire temporaire."""
+    json_path = tmp_path / "vinedos.json"
+    json_path.write_text(json.dumps(VINEDOS), encoding="utf-8")
+    geojson_dir = tmp_path / "geojson"
+    geojson_dir.mkdir()
+    geometry = {"type": "Polygon", "coordinates": [RING]}
+    (geojson_dir / "vinedo_uno.geojson").write_text(
+        json.dumps({"features": [{"geometry": geometry}]}), encoding="utf-8"
+    )
+    return json_path, geojson_dir, tmp_path / "bundle"
+
+
+def test_build_bundle_writes_manifest_pages_and_polygons(inputs):
+    json_path, geojson_dir, out_dir = inputs
+    manifest = build_bundle(json_path, geojson_dir, out_dir, max_workers=1)
+    assert set(manifest["pages"]) == {"_global", "vinedo_uno", "vinedo_dos"}
+    assert set(manifest["polygons"]) == {"vinedo_uno"}
+    assert set(manifest["files"]) == {*manifest["pages"].values(), *manifest["polygons"].values()}
+    assert json.loads((out_dir / "manifest.json").read_text())["input_hash"]
+
+
+def test_manager_serves_bundle_when_hash_matches(inputs, monkeypatch):
+    """Lot valide : aucun rendu folium à l'exécution."""
+    json_path, geojson_dir, out_dir = inputs
+    build_bundle(json_path, geojson_dir, out_dir, max_workers=1)
+    manager = MapManager(VINEDOS, geojson_dir=geojson_dir, bundle_dir=out_dir)
+
+    def no_render(*args):
+        raise AssertionError("rendu folium inattendu")
+
+    monkeypatch.setattr(manager, "_render_map_html", no_render)
+    html = manager.generate_map_html("Vinedo Uno")
+    assert "Vinedo Uno" in html and "Vinedo Dos" not in html
+    assert '"bounds": [[40.0, -3.1], [40.1, -3.0]]' in manager.focus_script("Vinedo Uno")
+
+
+def test_manager_falls_back_when_inputs_change(inputs):
+    json_path, geojson_dir, out_dir = inputs
+    build_bundle(json_path, geojson_dir, out_dir, max_workers=1)
+    changed = [dict(VINEDOS[0], description="Autre"), VINEDOS[1]]
+    manager = MapManager(changed, geojson_dir=geojson_dir, bundle_dir=out_dir)
+    assert manager.bundle is None
+    assert "Vinedo Dos" in manager.generate_map_html()
+    # Modification d'un .geojson : le lot ne correspond plus non plus
+    manager = MapManager(VINEDOS, geojson_dir=geojson_dir, bundle_dir=out_dir)
+    assert manager.bundle is not None
+    (geojson_dir / "vinedo_dos.geojson").write_text("{}", encoding="utf-8")
+    assert MapManager(VINEDOS, geojson_dir=geojson_dir, bundle_dir=out_dir).bundle is None
+    print("✅ Tests pour le lot de cartes précompilées")
@@ -1,10 +1,11 @@
 # tests/test_map_manager.py
 import json
 import folium
+import numpy as np
 import pytest
 from folium import Map
 
-from vinos_ibericos.map_manager import MapManager
+from vinos_ibericos.map_manager import MapConfig, MapManager
 
 
 @pytest.fixture
@@ -148,3 +149,299 @@ def test_f_polygone_valid_file(sample_manager, tmp_path):
         [40.0, -3.0],
     ]
     print("✅ tests pour '_f_polygone'")
+
+
+def test_generate_map_html_uses_render_cache(sample_manager):
+    """Une vue déjà rendue est servie depuis le cache (hit), sans nouveau rendu folium."""
+    manager, _ = sample_manager
+    first = manager.generate_map_html(vinedo_filter="Vinedo Uno")
+    second = manager.generate_map_html(vinedo_filter="Vinedo Uno")
+    assert first is second
+    info = manager.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+    # Un filtre inconnu partage la clé de la vue globale :
+    manager.generate_map_html()
+    manager.generate_map_html(vinedo_filter="Inexistant")
+    assert manager.cache_info().currsize == 2
+    print("✅ Tests pour le cache de rendu")
+
+
+def test_render_cache_lru_eviction_and_invalidation(sample_manager):
+    """Éviction LRU au-delà de la taille max et invalidation explicite."""
+    _, vineyards = sample_manager
+    manager = MapManager(vineyards, cache_size=2)
+    manager.generate_map_html()
+    manager.generate_map_html(vinedo_filter="Vinedo Uno")
+    manager.generate_map_html(vinedo_filter="Vinedo Dos")  # évince la vue globale
+    assert manager.cache_info().currsize == 2
+    manager.generate_map_html()
+    assert manager.cache_info().hits == 0
+    manager.invalidate_cache("Vinedo Dos")
+    assert manager.cache_info().currsize == 1
+    manager.invalidate_cache()
+    assert manager.cache_info().currsize == 0
+
+
+def test_render_cache_fingerprint_changes_with_data(sample_manager):
+    """Changer le jeu de données invalide les rendus précédents."""
+    manager, vineyards = sample_manager
+    manager.generate_map_html()
+    manager.vinedos = vineyards[:1]
+    html = manager.generate_map_html()
+    assert "Vinedo Dos" not in html
+    assert manager.cache_info().hits == 0
+
+
+def test_update_vinedos_keeps_unaffected_views(sample_manager):
+    """Rechargement à chaud : seules la vue globale et celle du vignoble modifié sont invalidées."""
+    manager, vineyards = sample_manager
+    for view in manager.views():
+        manager.generate_map_html(vinedo_filter=view)
+    kept = manager.generate_map_html(vinedo_filter="Vinedo Uno")
+    fingerprint = manager.fingerprint
+    moved = dict(vineyards[1], coords=[41.5, -3.7])
+    diff = manager.update_vinedos([vineyards[0], moved])
+    assert [v.nom for v in diff.changed] == ["Vinedo Dos"]
+    assert manager.fingerprint != fingerprint
+    assert manager.is_cached("Vinedo Uno") and not manager.is_cached("Vinedo Dos")
+    assert not manager.is_cached(None)
+    assert manager.generate_map_html(vinedo_filter="Vinedo Uno") is kept
+    # Aucune différence : tout reste en cache
+    manager.generate_map_html()
+    assert manager.update_vinedos([vineyards[0], moved]).empty
+    assert manager.is_cached(None)
+    print("✅ Tests pour 'update_vinedos'")
+
+
+def test_invalidate_polygons_only_matching_views(sample_manager, tmp_path):
+    manager, vineyards = sample_manager
+    manager = MapManager(vineyards, geojson_dir=tmp_path, bundle_dir=None)
+    for view in manager.views():
+        manager.generate_map_html(vinedo_filter=view)
+    names = manager.invalidate_polygons([tmp_path / "vinedo_dos.geojson"])
+    assert names == ["Vinedo Dos"]
+    assert manager.is_cached(None) and manager.is_cached("Vinedo Uno")
+    assert not manager.is_cached("Vinedo Dos")
+
+
+def test_icon_registry_encodes_icon_once(sample_manager):
+    """L'icône n'est lue/encodée qu'une fois, et n'apparaît qu'une fois dans la page partagée."""
+    from vinos_ibericos.map_manager import ICON_REGISTRY
+
+    manager, vineyards = sample_manager
+    ICON_REGISTRY.clear()
+    loads_before = ICON_REGISTRY.loads
+    html_shared = manager.generate_map_html()
+    manager.invalidate_cache()
+    manager.generate_map_html(vinedo_filter="Vinedo Uno")
+    assert ICON_REGISTRY.loads == loads_before + 1
+    assert html_shared.count("data:image/png;base64") == 1
+    # Mode historique : une icône par marqueur
+    html_per_marker = MapManager(vineyards, shared_icon=False).generate_map_html()
+    assert html_per_marker.count("data:image/png;base64") == len(vineyards)
+    assert len(html_shared) < len(html_per_marker)
+    print("✅ Tests pour 'IconRegistry'")
+
+
+def test_f_polygone_multipolygon_single_layer(sample_manager, tmp_path):
+    """Une DO en plusieurs zones donne un seul folium.Polygon avec tous les anneaux."""
+    manager, _ = sample_manager
+    square = [[-3.0, 40.0], [-3.1, 40.0], [-3.1, 40.1], [-3.0, 40.0]]
+    island = [[-2.0, 41.0], [-2.1, 41.0], [-2.1, 41.1], [-2.0, 41.0]]
+    geometry = {"type": "MultiPolygon", "coordinates": [[square], [island]]}
+    (tmp_path / "multi_do.geojson").write_text(
+        json.dumps({"type": "FeatureCollection", "features": [{"geometry": geometry}]}),
+        encoding="utf-8",
+    )
+    polygon, coords = manager._f_polygone("multi_do", geojson_dir=tmp_path)
+    assert isinstance(polygon, folium.Polygon)
+    assert len(coords) == 2
+    assert polygon.get_bounds() == [[40.0, -3.1], [41.1, -2.0]]
+
+
+def test_global_view_embeds_bridge_and_focus_script(sample_manager):
+    """La vue globale expose l'API 'vinosMap' ; focus_script pilote la page sans rechargement."""
+    manager, _ = sample_manager
+    html = manager.generate_map_html()
+    assert "window.vinosMap" in html
+    assert "window.vinosMap" not in manager.generate_map_html("Vinedo Uno")
+    script = manager.focus_script("Vinedo Uno")
+    assert script.startswith("vinosMap.focus(")
+    payload = json.loads(script[len("vinosMap.focus(") : -len(");")])
+    assert payload["name"] == "Vinedo Uno"
+    assert payload["center"] == [40.0, -3.3]
+    assert payload["polygon"] is None  # pas de .geojson pour ce vignoble
+    assert manager.focus_script("Inexistant") == manager.reset_script()
+    print("✅ Tests pour 'focus_script'")
+
+
+def test_focus_on_point_polygon_uses_focus_zoom(sample_manager, tmp_path):
+    """Polygone réduit à un point : vue centrée à FOCUS_ZOOM au lieu de fitBounds."""
+    _, vineyards = sample_manager
+    ring = [[-3.25, 40.05]] * 4
+    geometry = {"type": "Polygon", "coordinates": [ring]}
+    (tmp_path / "vinedo_uno.geojson").write_text(
+        json.dumps({"type": "FeatureCollection", "features": [{"geometry": geometry}]}),
+        encoding="utf-8",
+    )
+    manager = MapManager(vineyards, bundle_dir=None, geojson_dir=tmp_path)
+    script = manager.focus_script("Vinedo Uno")
+    payload = json.loads(script[len("vinosMap.focus(") : -len(");")])
+    assert payload["center"] == [40.05, -3.25]
+    assert (payload["zoom"], payload["bounds"]) == (MapConfig.FOCUS_ZOOM, None)
+    html = manager.generate_map_html("Vinedo Uno")
+    assert "fitBounds" not in html
+    assert "center: [40.05, -3.25]," in html
+    print("✅ Tests pour le focus sur un polygone ponctuel")
+
+
+def test_store_rendered_respects_fingerprint(sample_manager):
+    """Un rendu préchauffé n'est rangé que si les données n'ont pas changé entre-temps."""
+    manager, vineyards = sample_manager
+    fingerprint = manager.fingerprint
+    assert manager.views() == [None, "Vinedo Uno", "Vinedo Dos"]
+    assert manager.store_rendered("Vinedo Uno", "<html>uno</html>", fingerprint)
+    assert manager.is_cached("Vinedo Uno")
+    assert manager.generate_map_html("Vinedo Uno") == "<html>uno</html>"
+    manager.vinedos = vineyards[:1]
+    assert not manager.store_rendered("Vinedo Uno", "<html>uno</html>", fingerprint)
+
+
+def test_map_warmup_fills_render_cache(sample_manager):
+    """Le préchauffage (pool de processus) rend toutes les vues dans le cache."""
+    from vinos_ibericos.map_warmup import MapWarmup
+
+    manager, _ = sample_manager
+    report = MapWarmup(manager, max_workers=2).run()
+    assert (report.views, report.rendered) == (3, 3)
+    assert all(manager.is_cached(view) for view in manager.views())
+    html = manager.generate_map_html("Vinedo Uno")
+    assert manager.cache_info().hits == 1 and manager.cache_info().misses == 0
+    assert "Vinedo Uno" in html and "Vinedo Dos" not in html
+    print(f"✅ {report}")
+
+
+def test_map_warmup_delta_fills_focus_scripts(sample_manager):
+    """Mode "delta" : page de base et scripts de focus préchauffés, sans processus."""
+    from vinos_ibericos.map_warmup import MapWarmup
+
+    manager, _ = sample_manager
+    report = MapWarmup(manager, update_mode="delta").run()
+    assert (report.views, report.rendered) == (3, 3)
+    assert manager.is_cached(None) and not manager.is_cached("Vinedo Uno")
+    assert all(manager.is_focus_cached(view) for view in manager.views()[1:])
+    script = manager.focus_script("Vinedo Uno")
+    assert script is manager.focus_script("Vinedo Uno")  # Servi depuis le cache
+    manager.invalidate_cache("Vinedo Uno")
+    assert not manager.is_focus_cached("Vinedo Uno")
+    assert MapWarmup(manager, update_mode="delta").run().views == 1
+    with pytest.raises(ValueError):
+        MapWarmup(manager, update_mode="partial")
+    print(f"✅ {report} (delta)")
+
+
+def _synthetic_points(count: int) -> list[dict]:
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(36.5, 43.5, count)
+    lons = rng.uniform(-9.0, 3.0, count)
+    return [
+        {"nom": f"Point {i}", "coords": [lat, lon]}
+        for i, (lat, lon) in enumerate(zip(lats, lons))
+    ]
+
+
+def test_cluster_index_groups_by_zoom():
+    """Chaque niveau conserve tous les points ; le nombre de regroupements croît avec le zoom."""
+    from vinos_ibericos.data.clustering import ClusterIndex
+
+    points = np.array([p["coords"] for p in _synthetic_points(1000)])
+    index = ClusterIndex(points[:, 0], points[:, 1], min_zoom=5, max_zoom=12)
+    sizes = [len(index.levels[z]) for z in sorted(index.levels)]
+    assert sizes == sorted(sizes) and sizes[0] < 1000
+    assert all(level[:, 2].sum() == 1000 for level in index.levels.values())
+    assert index.level(0) is index.levels[5] and index.level(30) is index.levels[index.max_zoom]
+    payload = index.to_payload()
+    assert payload["minZoom"] == 5 and str(index.max_zoom) in payload["levels"]
+    print("✅ Tests pour 'ClusterIndex'")
+
+
+def test_cluster_mode_shrinks_global_view():
+    """En mode 'cluster', la page ne contient qu'une couche de regroupements."""
+    points = _synthetic_points(300)
+    markers_html = MapManager(points, bundle_dir=None).generate_map_html()
+    cluster_html = MapManager(points, bundle_dir=None, marker_mode="cluster").generate_map_html()
+    assert "vinos-cluster" in cluster_html and "Point 299" in cluster_html
+    assert cluster_html.count("L.marker(") < markers_html.count("L.marker(")
+    assert len(cluster_html) < len(markers_html)
+    print(f"✅ Mode 'cluster' : {len(markers_html)} -> {len(cluster_html)} octets")
+
+
+def test_viewport_mode_culls_points_on_the_client():
+    """En mode 'viewport', la page ne crée que les marqueurs de l'emprise visible."""
+    inside = {"nom": "Dans la vue", "coords": list(MapConfig.CENTRE_OF_SPAIN)}
+    outside = {"nom": "Tenerife", "coords": [28.3, -16.5]}
+    manager = MapManager([inside, outside], bundle_dir=None, marker_mode="viewport")
+    html = manager.generate_map_html()
+    # Points envoyés une seule fois, redessinés à chaque déplacement de la carte :
+    assert 'map.on("moveend", draw)' in html
+    assert html.count("L.marker(") == 1  # Seul l'appel de la couche, aucun marqueur statique
+    assert "Dans la vue" in html and "Tenerife" in html
+    # La vue focus n'est pas filtrée :
+    assert "Tenerife" in manager.generate_map_html("Tenerife")
+    print("✅ Tests pour le mode 'viewport'")
+
+
+def test_point_layers_follow_focus_and_reject_unknown_mode():
+    """Les couches 'cluster' et 'viewport' exposent l'API de focus utilisée par MapBridge."""
+    points = _synthetic_points(50)
+    for mode in ("cluster", "viewport"):
+        html = MapManager(points, bundle_dir=None, marker_mode=mode).generate_map_html()
+        assert "window.vinosPoints = {" in html
+        assert "points.focus(view.name)" in html and "points.reset()" in html
+    with pytest.raises(ValueError):
+        MapManager(points, bundle_dir=None, marker_mode="heatmap")
+    print("✅ Tests pour les couches de points et 'marker_mode'")
+
+
+def test_focus_view_shows_bodegas_from_spatial_index(sample_manager, tmp_path):
+    """En vue focus, les bodegas de l'emprise sont lues dans l'index R*Tree et affichées."""
+    from vinos_ibericos.data.bodega_manager import BodegaManager
+
+    db_path = tmp_path / "bodegas.db"
+    bodegas = BodegaManager(db_path)
+    common = {"town": "Ciudad", "do_name": "DO Test"}
+    bodegas.add_bodega({**common, "name": "Bodega Cerca", "lat": 40.01, "lon": -3.31})
+    bodegas.add_bodega({**common, "name": "Bodega Lejos", "lat": 36.5, "lon": -6.0})
+    bodegas.close()
+
+    _, vineyards = sample_manager
+    manager = MapManager(vineyards, bundle_dir=None, bodegas_db=db_path)
+    html = manager.generate_map_html("Vinedo Uno")
+    assert "Bodega Cerca" in html and "Bodega Lejos" not in html
+    assert "Bodega Cerca" not in manager.generate_map_html()  # Vue globale : pas de bodegas
+    payload = json.loads(manager.focus_script("Vinedo Uno")[len("vinosMap.focus(") : -2])
+    assert [b["tooltip"] for b in payload["bodegas"]] == ["<b>Bodega Cerca</b><br>Ciudad"]
+    print("✅ Tests pour les bodegas en vue focus")
+
+
+def test_new_bodega_changes_fingerprint_and_focus_views(sample_manager, tmp_path):
+    """Bodega ajoutée : vues focus rendues de nouveau, vue globale gardée, lot revérifié."""
+    from vinos_ibericos.data.bodega_manager import BodegaManager
+
+    db_path = tmp_path / "bodegas.db"
+    common = {"town": "Ciudad", "do_name": "DO Test", "lat": 40.01, "lon": -3.31}
+    _, vineyards = sample_manager
+    manager = MapManager(vineyards, bundle_dir=None, bodegas_db=db_path)
+    assert "Bodega Nueva" not in manager.generate_map_html("Vinedo Uno")
+    manager.generate_map_html()
+    fingerprint, input_hash = manager.fingerprint, manager.input_hash()
+    assert manager.invalidate_bodegas() is False  # Base inchangée
+    with BodegaManager(db_path) as bodegas:
+        bodegas.add_bodega({**common, "name": "Bodega Nueva"})
+    assert manager.invalidate_bodegas() is True
+    assert manager.fingerprint != fingerprint and manager.input_hash() != input_hash
+    assert manager.is_cached(None) and not manager.is_cached("Vinedo Uno")
+    assert "Bodega Nueva" in manager.generate_map_html("Vinedo Uno")
+    # Autre processus (préchauffage, build_maps) : même empreinte pour la même base
+    other = MapManager(vineyards, bundle_dir=None, bodegas_db=db_path)
+    assert other.fingerprint == manager.fingerprint
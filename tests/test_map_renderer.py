@@ -0,0 +1,70 @@
+# tests/test_map_renderer.py
+import threading
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from vinos_ibericos.ui.map_renderer import MapRenderer
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def _wait(renderer):
+    renderer.wait()
+    QCoreApplication.processEvents()  # livraison des signaux au thread principal
+
+
+def test_only_latest_request_is_applied(qapp):
+    """Clics rapides : les demandes en file sont annulées, seul le dernier résultat est appliqué."""
+    renderer = MapRenderer()
+    gate = threading.Event()
+    results, calls = [], []
+
+    def slow():
+        gate.wait(5)
+        calls.append("slow")
+        return "slow"
+
+    def render(name):
+        calls.append(name)
+        return name
+
+    renderer.submit(slow, results.append)  # occupe l'unique thread de travail
+    renderer.submit(lambda: render("Uno"), results.append)
+    renderer.submit(lambda: render("Dos"), results.append)
+    gate.set()
+    _wait(renderer)
+    assert results == ["Dos"]
+    assert "Uno" not in calls  # retirée de la file avant d'être rendue
+    assert renderer.cancelled == 2
+
+
+def test_single_request_delivered(qapp):
+    renderer = MapRenderer()
+    results = []
+    renderer.submit(lambda: "<html/>", results.append)
+    _wait(renderer)
+    assert results == ["<html/>"]
+    print("✅ Tests pour 'MapRenderer'")
+
+
+def test_failed_render_is_reported(qapp):
+    """Une exception dans le rendu est transmise à 'on_error' (jamais de carte bloquée)."""
+    renderer = MapRenderer()
+    results, errors = [], []
+
+    def broken():
+        raise RuntimeError("sidecar corrompu")
+
+    renderer.submit(broken, results.append, errors.append)
+    _wait(renderer)
+    assert results == [] and errors == ["RuntimeError : sidecar corrompu"]
+    # Sans 'on_error' : erreur ignorée, la demande suivante est servie normalement
+    renderer.submit(broken, results.append)
+    renderer.submit(lambda: "<html/>", results.append)
+    _wait(renderer)
+    assert results == ["<html/>"]
+    print("✅ Tests pour les erreurs de 'MapRenderer'")
@@ -0,0 +1,187 @@
+# tests/test_migrations.py
+import sqlite3
+
+import pytest
+
+from vinos_ibericos.data.migrations import (
+    LATEST_VERSION,
+    MIGRATIONS,
+    InvalidValue,
+    Migration,
+    change_counter,
+    migrate,
+    schema_version,
+)
+from vinos_ibericos.exceptions import MigrationError
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "bodegas.db")
+    yield conn
+    conn.close()
+
+
+def index_names(conn) -> set[str]:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    return {row[0] for row in rows}
+
+
+def test_migrate_fresh_database_then_noop(conn):
+    report = migrate(conn)
+    assert (report.from_version, report.to_version) == (0, LATEST_VERSION)
+    assert len(report.applied) == len(MIGRATIONS)
+    assert schema_version(conn) == LATEST_VERSION
+    expected = {"bodegas_do_name_idx", "bodegas_town_idx", "bodegas_lat_lon_idx"}
+    assert expected <= index_names(conn)
+    # Deuxième passage : rien à faire, aucune transaction ouverte
+    statements = []
+    conn.set_trace_callback(statements.append)
+    assert migrate(conn).applied == []
+    assert not any("BEGIN" in sql for sql in statements)
+    print("✅ Tests pour 'migrate'")
+
+
+def test_change_counter_follows_every_write(conn):
+    """Compteur persistant : +1 par ligne ajoutée, modifiée ou supprimée."""
+    assert change_counter(conn) is None  # Base non migrée
+    migrate(conn)
+    assert change_counter(conn) == 0
+    conn.execute(
+        "INSERT INTO bodegas (name, town, lat, lon, do_name) VALUES ('A', 'T', 40, -3, 'X')"
+    )
+    conn.execute("UPDATE bodegas SET name = 'B'")
+    conn.execute("DELETE FROM bodegas")
+    conn.commit()
+    assert change_counter(conn) == 3
+
+
+def test_filters_use_indexes(conn):
+    migrate(conn)
+    for sql in (
+        "SELECT * FROM bodegas WHERE do_name = 'Rioja'",
+        "SELECT * FROM bodegas WHERE town = 'Haro'",
+    ):
+        plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+        assert "USING INDEX" in plan, plan
+
+
+def test_missing_columns_are_added_to_old_tables(conn):
+    """Une base créée avec une ancienne version de FIELDS reçoit les nouvelles colonnes."""
+    conn.execute(
+        "CREATE TABLE bodegas (id INTEGER PRIMARY KEY, name TEXT NOT NULL,"
+        " town TEXT NOT NULL, lat REAL NOT NULL, lon REAL NOT NULL, do_name TEXT NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO bodegas (name, town, lat, lon, do_name) VALUES ('A', 'B', 40, -3, 'C')"
+    )
+    conn.commit()
+    report = migrate(conn)
+    assert report.added_columns == ["cp", "street", "number", "comp", "website"]
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(bodegas)")]
+    assert "website" in columns
+    assert conn.execute("SELECT name FROM bodegas").fetchall() == [("A",)]
+
+
+def test_failed_migration_rolls_back_everything(conn):
+    def broken(connection):
+        connection.execute("CREATE TABLE partielle (x)")
+        raise sqlite3.OperationalError("échec simulé")
+
+    with pytest.raises(sqlite3.OperationalError):
+        migrate(conn, MIGRATIONS + (Migration(LATEST_VERSION + 1, "cassée", broken),))
+    assert schema_version(conn) == 0
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    assert "bodegas" not in tables and "partielle" not in tables
+
+
+def test_numeric_columns_have_numeric_affinity(conn):
+    migrate(conn)
+    types = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(bodegas)")}
+    assert (types["cp"], types["number"], types["lat"], types["lon"]) == (
+        "INTEGER",
+        "INTEGER",
+        "REAL",
+        "REAL",
+    )
+    assert types["name"] == "TEXT"
+
+
+def create_text_table(conn) -> None:
+    """Table créée par l'ancien générateur : toutes les colonnes en TEXT."""
+    conn.execute(
+        "CREATE TABLE bodegas (id INTEGER PRIMARY KEY, name TEXT NOT NULL, cp TEXT,"
+        " town TEXT NOT NULL, street TEXT, number TEXT, comp TEXT, lat TEXT NOT NULL,"
+        " lon TEXT NOT NULL, website TEXT, do_name TEXT NOT NULL)"
+    )
+
+
+def test_text_columns_are_rewritten_in_place(conn):
+    """Base créée par l'ancien générateur (tout en TEXT) : types corrigés, données gardées."""
+    create_text_table(conn)
+    conn.execute(
+        "INSERT INTO bodegas (id, name, cp, town, number, lat, lon, do_name)"
+        " VALUES (7, 'Muga', '26200', 'Haro', '', '42.57', '-2.85', 'Rioja')"
+    )
+    conn.commit()
+    report = migrate(conn)
+    assert report.to_version == LATEST_VERSION
+    row = conn.execute(
+        "SELECT id, typeof(cp), cp, number, typeof(lat), lat, lon FROM bodegas"
+    ).fetchone()
+    assert row == (7, "integer", 26200, None, "real", 42.57, -2.85)
+    # Index et index spatial reconstruits sur la nouvelle table
+    assert "bodegas_lat_lon_idx" in index_names(conn)
+    found = conn.execute(
+        "SELECT id FROM bodegas_rtree WHERE min_lat >= 42 AND max_lat <= 43"
+    ).fetchall()
+    assert found == [(7,)]
+    conn.execute("DELETE FROM bodegas WHERE id = 7")  # Triggers recréés
+    assert conn.execute("SELECT COUNT(*) FROM bodegas_rtree").fetchone()[0] == 0
+
+
+def test_unconvertible_optional_values_are_reported(conn):
+    """'28O80' ne devient pas 28 en silence : NULL, et signalé dans le rapport."""
+    create_text_table(conn)
+    conn.execute(
+        "INSERT INTO bodegas (id, name, cp, town, number, lat, lon, do_name)"
+        " VALUES (7, 'Muga', '28O80', 'Haro', '12b', '42.57', '-2.85', 'Rioja')"
+    )
+    conn.commit()
+    report = migrate(conn)
+    assert report.invalid_values == [
+        InvalidValue(7, "cp", "28O80"),
+        InvalidValue(7, "number", "12b"),
+    ]
+    row = conn.execute("SELECT cp, number, lat FROM bodegas").fetchone()
+    assert row == (None, None, 42.57)
+    print("✅ Tests pour les valeurs non convertibles")
+
+
+@pytest.mark.parametrize("lat", ["42,57", ""])
+def test_unconvertible_required_values_abort_migration(conn, lat):
+    """Latitude illisible ou vide : migration refusée avec le détail, base inchangée."""
+    create_text_table(conn)
+    conn.execute(
+        "INSERT INTO bodegas (id, name, town, lat, lon, do_name)"
+        " VALUES (7, 'Muga', 'Haro', ?, '-2.85', 'Rioja')",
+        (lat,),
+    )
+    conn.commit()
+    with pytest.raises(MigrationError, match="bodega 7 : 'lat'"):
+        migrate(conn)
+    assert schema_version(conn) == 0
+    assert conn.execute("SELECT lat FROM bodegas").fetchone() == (lat,)
+
+
+def test_lat_lon_range_query_uses_index(conn):
+    migrate(conn)
+    plan = " ".join(
+        row[-1]
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM bodegas "
+            "WHERE lat BETWEEN 40 AND 41 AND lon BETWEEN -4 AND -3"
+        )
+    )
+    assert "USING INDEX bodegas_lat_lon_idx" in plan, plan
+    print(f"✅ Plan de requête : {plan}")
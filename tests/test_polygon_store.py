@@ -0,0 +1,142 @@
+# tests/test_polygon_store.py
+import json
+import os
+
+import numpy as np
+import pytest
+
+from vinos_ibericos.data.polygon_store import PolygonStore
+
+RING = [[-3.0, 40.0], [-3.1, 40.0], [-3.1, 40.1], [-3.0, 40.1], [-3.0, 40.0]]
+
+
+@pytest.fixture
+def geojson_file(tmp_path):
+    """Fichier GeoJSON minimal (un polygone) dans un répertoire temporaire."""
+    path = tmp_path / "test_vinedo.geojson"
+    data = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [RING]}}
+        ],
+    }
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+def test_get_parses_once_then_serves_from_memory(geojson_file, tmp_path):
+    store = PolygonStore(cache_dir=tmp_path / "cache")
+    polygon = store.get(geojson_file)
+    assert polygon is not None
+    assert polygon.locations() == [[lat, lon] for lon, lat in RING]
+    assert polygon.bounds == (40.0, -3.1, 40.1, -3.0)
+    assert store.get(geojson_file) is polygon
+    assert (store.parses, store.memory_hits) == (1, 1)
+
+
+def test_sidecar_cache_avoids_json_parsing(geojson_file, tmp_path):
+    """Un second store (nouveau processus) relit le cache binaire sans parser le JSON."""
+    cache_dir = tmp_path / "cache"
+    first = PolygonStore(cache_dir=cache_dir).get(geojson_file)
+    store = PolygonStore(cache_dir=cache_dir)
+    polygon = store.get(geojson_file)
+    assert (store.parses, store.disk_hits) == (0, 1)
+    assert polygon == first
+
+
+def test_sidecar_invalidated_when_source_changes(geojson_file, tmp_path):
+    cache_dir = tmp_path / "cache"
+    PolygonStore(cache_dir=cache_dir).get(geojson_file)
+    data = json.loads(geojson_file.read_text(encoding="utf-8"))
+    data["features"][0]["geometry"]["coordinates"][0][1] = [-3.2, 40.0]
+    geojson_file.write_text(json.dumps(data), encoding="utf-8")
+    stat = geojson_file.stat()
+    os.utime(geojson_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    store = PolygonStore(cache_dir=cache_dir)
+    polygon = store.get(geojson_file)
+    assert store.parses == 1
+    assert polygon is not None and polygon.bounds[1] == -3.2
+
+
+def test_missing_or_malformed_file_returns_none(tmp_path):
+    store = PolygonStore(cache_dir=None)
+    assert store.get(tmp_path / "absent.geojson") is None
+    bad = tmp_path / "bad.geojson"
+    bad.write_text("{ invalid json }", encoding="utf-8")
+    assert store.get(bad) is None
+    print("✅ Tests pour 'PolygonStore'")
+
+
+def test_simplified_levels_are_precomputed_per_zoom(tmp_path):
+    """Les niveaux simplifiés sont calculés au chargement et réutilisés."""
+    import numpy as np
+
+    angles = np.linspace(0, 2 * np.pi, 300)
+    ring = [[-3.0 + 0.5 * np.cos(a), 40.0 + 0.5 * np.sin(a)] for a in angles]
+    ring[-1] = ring[0]
+    path = tmp_path / "round.geojson"
+    geometry = {"type": "Polygon", "coordinates": [ring]}
+    path.write_text(
+        json.dumps({"features": [{"geometry": geometry}]}), encoding="utf-8"
+    )
+    store = PolygonStore(cache_dir=None, zoom_levels=(7, 10))
+    polygon = store.get(path)
+    assert polygon is not None
+    low, high = polygon.simplified(7), polygon.simplified(10)
+    assert len(low) <= len(high) <= len(polygon)
+    assert len(low) < len(polygon)
+    assert polygon.simplified(7) is low
+    assert low.bounds == polygon.bounds
+
+
+def test_multipolygon_holes_and_features_are_merged(tmp_path):
+    """MultiPolygon + trou + second feature : une seule géométrie, bornes fusionnées."""
+    outer = [[0.0, 0.0], [4.0, 0.0], [4.0, 4.0], [0.0, 4.0], [0.0, 0.0]]
+    hole = [[1.0, 1.0], [2.0, 1.0], [2.0, 2.0], [1.0, 1.0]]
+    island = [[10.0, 10.0], [11.0, 10.0], [11.0, 11.0], [10.0, 10.0]]
+    other = [[-5.0, -5.0], [-4.0, -5.0], [-4.0, -4.0], [-5.0, -5.0]]
+    data = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"type": "Polygon"},  # pas une géométrie
+                "geometry": {
+                    "type": "MultiPolygon",
+                    "coordinates": [[outer, hole], [island]],
+                },
+            },
+            {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [other]}},
+        ],
+    }
+    path = tmp_path / "multi.geojson"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    polygon = PolygonStore(cache_dir=cache_dir, zoom_levels=()).get(path)
+    assert polygon is not None
+    assert (polygon.polygon_count, polygon.ring_count) == (3, 4)
+    assert polygon.bounds == (-5.0, -5.0, 11.0, 11.0)
+    rings = polygon.locations()
+    assert len(rings) == 4 and rings[1][0] == [1.0, 1.0]
+    # Le cache binaire restitue la même structure :
+    assert PolygonStore(cache_dir=cache_dir, zoom_levels=()).get(path) == polygon
+    # Appartenance (lat, lon) : le trou est exclu, les zones disjointes incluses
+    lats = np.array([3.0, 1.2, 10.2, -4.8, 20.0])
+    lons = np.array([3.0, 1.5, 10.5, -4.5, 20.0])
+    assert polygon.contains(lats, lons).tolist() == [True, False, True, True, False]
+
+
+def test_stale_sidecars_are_pruned(geojson_file, tmp_path):
+    """Un seul cache par nom de DO : l'ancien (autre emplacement) est supprimé."""
+    cache_dir = tmp_path / "cache"
+    PolygonStore(cache_dir=cache_dir).get(geojson_file)
+    moved = tmp_path / "moved" / geojson_file.name
+    moved.parent.mkdir()
+    moved.write_bytes(geojson_file.read_bytes())
+    other = tmp_path / "test_vinedo-bis.geojson"  # Même préfixe, autre DO : gardé
+    other.write_bytes(geojson_file.read_bytes())
+    PolygonStore(cache_dir=cache_dir).get(other)
+    PolygonStore(cache_dir=cache_dir).get(moved)
+    names = sorted(path.name.rsplit("-", 1)[0] for path in cache_dir.iterdir())
+    assert names == ["test_vinedo", "test_vinedo-bis"]
+    print("✅ Tests pour la purge des caches de 'PolygonStore'")
@@ -0,0 +1,52 @@
+# tests/test_tile_store.py
+import pytest
+
+from vinos_ibericos.data.tile_store import TileStore, tile_xy, tiles_for_bounds
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TileStore(tmp_path / "tiles.mbtiles")
+    yield store
+    store.close()
+
+
+def test_tile_xy_known_values():
+    assert tile_xy(0.0, 0.0, 1) == (1, 1)
+    assert tile_xy(40.0, -3.3, 7) == (62, 48)
+
+
+def test_tiles_for_bounds_covers_box():
+    tiles = list(tiles_for_bounds((40.0, -3.5, 40.5, -3.0), 10))
+    assert all(z == 10 for z, _, _ in tiles)
+    xs = {x for _, x, _ in tiles}
+    assert tile_xy(40.25, -3.25, 10)[0] in xs
+
+
+def test_put_get_and_statistics(store):
+    assert store.get(7, 62, 48) is None
+    store.put(7, 62, 48, b"PNG")
+    assert store.get(7, 62, 48) == b"PNG"
+    assert store.has(7, 62, 48)
+    assert store.stats() == {"tiles": 1, "hits": 1, "misses": 1, "downloads": 0}
+
+
+def test_mbtiles_rows_use_tms_convention(store):
+    """Les rangées MBTiles sont stockées en TMS (y inversé)."""
+    store.put(2, 1, 0, b"PNG")
+    row = store.conn.execute("SELECT tile_row FROM tiles").fetchone()
+    assert row[0] == 3
+
+
+def test_prefetch_skips_cached_tiles(store, monkeypatch):
+    fetched = []
+    monkeypatch.setattr(
+        store, "fetch", lambda z, x, y: fetched.append((z, x, y)) or b"PNG"
+    )
+    bounds = (40.0, -3.5, 40.5, -3.0)
+    first = next(iter(tiles_for_bounds(bounds, 9)))
+    store.put(*first, b"PNG")
+    total = len(list(tiles_for_bounds(bounds, 9)))
+    assert store.prefetch([(bounds, 9)]) == (total - 1, 0)
+    assert first not in fetched
+    print("✅ Tests pour 'TileStore'")
@@ -0,0 +1,62 @@
+# tests/test_vinedo_descriptions.py
+import json
+
+from vinos_ibericos.data.vinedo_descriptions import DescriptionStore
+from vinos_ibericos.data.vinedo_loader import load_vinedos
+from vinos_ibericos.datatypes import Vinedo
+from vinos_ibericos.map_manager import MapManager
+
+
+def write_vinedos(path, count):
+    items = [
+        {
+            "nom": f"Vinedo {i}",
+            "coords": [40.0 + i / 100, -3.5],
+            "description": f"<p>Descripción nº {i} : " + "viñedo " * 500 + "</p>",
+            "img": f"img_{i}",
+        }
+        for i in range(count)
+    ]
+    path.write_text(json.dumps(items, ensure_ascii=False, indent=2), encoding="utf-8")
+    return items
+
+
+def test_descriptions_read_on_demand(tmp_path):
+    """Descriptions non résidentes, relues à leur position dans le fichier (LRU)."""
+    path = tmp_path / "vinedos.json"
+    items = write_vinedos(path, 6)
+    vinedos, _ = load_vinedos(path, lazy_descriptions=True)
+    assert all(v.lazy and v.description == "" for v in vinedos)
+    store = DescriptionStore(path, maxsize=2)
+    assert [store.get(v) for v in vinedos] == [item["description"] for item in items]
+    assert store.reads == 6 and len(store) == 2
+    store.get(vinedos[-1])
+    assert store.hits == 1 and store.reads == 6
+    # Description résidente : retournée telle quelle
+    assert store.get(Vinedo.from_dict(items[0])) == items[0]["description"]
+    print("✅ Tests pour 'DescriptionStore'")
+
+
+def test_descriptions_after_source_change(tmp_path):
+    """Fichier modifié depuis le chargement : pas d'autre description à la place."""
+    path = tmp_path / "vinedos.json"
+    write_vinedos(path, 3)
+    vinedos, _ = load_vinedos(path, lazy_descriptions=True)
+    path.write_text(json.dumps([{"nom": "Otro"}] * 3), encoding="utf-8")
+    store = DescriptionStore(path)
+    assert [store.get(v) for v in vinedos] == ["", "", ""]
+    path.unlink()
+    store.invalidate()
+    assert store.get(vinedos[0]) == ""
+
+
+def test_fingerprint_same_for_lazy_and_resident_descriptions(tmp_path):
+    path = tmp_path / "vinedos.json"
+    items = write_vinedos(path, 3)
+    lazy, _ = load_vinedos(path, lazy_descriptions=True)
+    resident, _ = load_vinedos(path)
+    fingerprint = MapManager(lazy, bundle_dir=None).fingerprint
+    assert fingerprint == MapManager(resident, bundle_dir=None).fingerprint
+    assert fingerprint == MapManager(items, bundle_dir=None).fingerprint
+    items[0]["description"] = "Otra"
+    assert fingerprint != MapManager(items, bundle_dir=None).fingerprint
@@ -0,0 +1,34 @@
+# tests/test_vinedo_diff.py
+from vinos_ibericos.data.vinedo_diff import diff_vinedos
+from vinos_ibericos.datatypes import Vinedo
+
+
+def vinedo(name, lat=40.0, description="<p>DO</p>", offset=-1):
+    data = {"nom": name, "coords": [lat, -3.0], "description": description, "img": ""}
+    return Vinedo.from_dict(data, offset)
+
+
+def test_diff_added_removed_changed():
+    old = [vinedo("Rioja"), vinedo("Toro"), vinedo("Rueda")]
+    new = [vinedo("Rioja"), vinedo("Toro", lat=41.5), vinedo("Bierzo")]
+    diff = diff_vinedos(old, new)
+    assert [v.nom for v in diff.added] == ["Bierzo"]
+    assert diff.removed == ["Rueda"]
+    assert [v.nom for v in diff.changed] == ["Toro"]
+    assert diff.relocated == [] and not diff.empty
+    assert diff.affected == {"Bierzo", "Rueda", "Toro"}
+    assert diff_vinedos(old, list(old)).empty
+    print("✅ Tests pour 'diff_vinedos'")
+
+
+def test_diff_lazy_descriptions():
+    """Descriptions comparées par CRC32 ; une entrée seulement déplacée n'est pas modifiée."""
+    old = [vinedo("Rioja", offset=10), vinedo("Toro", offset=200)]
+    new = [vinedo("Rioja", offset=10), vinedo("Toro", offset=250)]
+    diff = diff_vinedos(old, new)
+    assert diff.changed == [] and [v.offset for v in diff.relocated] == [250]
+    assert diff.affected == set()
+    edited = [vinedo("Rioja", description="<p>Otra</p>", offset=10), new[1]]
+    assert [v.nom for v in diff_vinedos(new, edited).changed] == ["Rioja"]
+    # Même contenu, résident ou non : pas de différence affichée
+    assert diff_vinedos([vinedo("Rioja")], [vinedo("Rioja", offset=10)]).changed == []
@@ -0,0 +1,84 @@
+# tests/test_vinedo_loader.py
+import io
+import json
+
+import pytest
+
+from vinos_ibericos.data.vinedo_loader import (
+    VALIDATE_VINEDO,
+    compile_schema,
+    iter_json_array,
+    load_vinedos,
+)
+from vinos_ibericos.exceptions import VinedoJsonError
+from vinos_ibericos.utils import CheckVinedoJson
+
+
+def vinedo(i: int) -> dict:
+    return {
+        "nom": f"Vinedo {i}",
+        "coords": [40.0 + i / 100, -3.5],
+        "description": "<p>" + "Tempranillo, añada " * i + "</p>",
+        "img": f"img_{i}",
+    }
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_iter_json_array_across_chunks(chunk_size):
+    """Mêmes éléments, lignes et positions (octets) quelle que soit la taille des blocs."""
+    items = [vinedo(i) for i in range(5)] + [12345, "texte", None, []]
+    text = json.dumps(items, indent=2, ensure_ascii=False)
+    data = text.encode("utf-8")
+    parsed = list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+    assert [value for value, _, _ in parsed] == items
+    for value, line, offset in parsed:
+        assert data.count(b"\n", 0, offset) + 1 == line
+        assert json.JSONDecoder().raw_decode(data[offset:].decode("utf-8"))[0] == value
+    assert list(iter_json_array(io.StringIO(" [ ] "), chunk_size=chunk_size)) == []
+    print("✅ Tests pour 'iter_json_array'")
+
+
+@pytest.mark.parametrize(
+    "text", ["", "INVALID_JSON", '{"nom": "x"}', '[{"nom": "x"}', "[1, 2,]", "[1] [2]"]
+)
+def test_iter_json_array_rejects_malformed_files(text):
+    with pytest.raises(VinedoJsonError):
+        list(iter_json_array(io.StringIO(text), chunk_size=4))
+
+
+def test_validator_reasons():
+    """Schéma compilé une fois : motif précis pour chaque entrée invalide."""
+    assert VALIDATE_VINEDO(vinedo(1)) is None
+    assert VALIDATE_VINEDO(["pas", "un", "objet"]).startswith("objet attendu")
+    assert VALIDATE_VINEDO({"nom": "x"}) == "clé manquante : 'coords'"
+    assert VALIDATE_VINEDO(dict(vinedo(1), img=3)) == "'img' : str attendu"
+    assert "coords" in VALIDATE_VINEDO(dict(vinedo(1), coords=[40, -3]))
+    assert "coords" in VALIDATE_VINEDO(dict(vinedo(1), coords=[40.0]))
+    assert compile_schema((("nom", str),))({"nom": "x", "coords": [1.0, 2.0]}) is None
+
+
+def test_load_vinedos_reports_rejected_items(tmp_path):
+    """Les entrées invalides sont écartées et listées avec leur ligne."""
+    items = [vinedo(0), {"nom": "Sin coords"}, vinedo(2), dict(vinedo(3), img=None)]
+    path = tmp_path / "vinedos.json"
+    path.write_text(json.dumps(items, indent=2), encoding="utf-8")
+    vinedos, report = load_vinedos(path, chunk_size=16, measure_memory=True)
+    assert [v.nom for v in vinedos] == ["Vinedo 0", "Vinedo 2"]
+    assert [(r.index, r.reason) for r in report.rejected] == [
+        (1, "clé manquante : 'coords'"),
+        (3, "'img' : str attendu"),
+    ]
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert all(lines[r.line - 1].strip() == "{" for r in report.rejected)
+    assert report.loaded == 2 and report.elapsed > 0 and report.peak_bytes > 0
+    # Même résultat via CheckVinedoJson :
+    loader = CheckVinedoJson(path, snapshot_dir=None, lazy_descriptions=False)
+    loader.load()
+    assert loader.data == vinedos and loader.rejected == report.rejected
+    assert loader.report.peak_bytes == 0  # Mémoire non mesurée par défaut
+    print("✅ Tests pour 'load_vinedos'")
+
+
+def test_load_vinedos_missing_file(tmp_path):
+    with pytest.raises(VinedoJsonError):
+        load_vinedos(tmp_path / "absent.json")
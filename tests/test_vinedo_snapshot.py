@@ -0,0 +1,73 @@
+# tests/test_vinedo_snapshot.py
+import json
+import os
+
+import pytest
+
+from vinos_ibericos.data import vinedo_snapshot
+from vinos_ibericos.data.vinedo_snapshot import (
+    load_with_snapshot,
+    read_snapshot,
+    snapshot_path,
+)
+from vinos_ibericos.utils import CheckVinedoJson
+
+
+ITEMS = [
+    {
+        "nom": "Rioja",
+        "coords": [42.4, -2.6],
+        "description": "<p>Rioja</p>",
+        "img": "rioja",
+    },
+    {"nom": "Sin img", "coords": [40.0, -3.0], "description": ""},
+]
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "vinedos.json"
+    path.write_text(json.dumps(ITEMS, indent=2), encoding="utf-8")
+    return path
+
+
+def test_snapshot_skips_parsing(source, tmp_path, monkeypatch):
+    """Deuxième chargement depuis l'instantané, sans analyse ni validation."""
+    cache_dir = tmp_path / "cache"
+    vinedos, report = load_with_snapshot(source, cache_dir, lazy_descriptions=True)
+    assert not report.from_snapshot and snapshot_path(source, cache_dir).exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("JSON relu")
+
+    monkeypatch.setattr(vinedo_snapshot, "load_vinedos", fail)
+    loader = CheckVinedoJson(source, snapshot_dir=cache_dir)
+    loader.load()
+    assert loader.report.from_snapshot
+    assert loader.data == vinedos
+    assert loader.rejected == report.rejected and len(loader.rejected) == 1
+    print("✅ Tests pour 'load_with_snapshot'")
+
+
+def test_snapshot_invalidated_when_source_changes(source, tmp_path):
+    cache_dir = tmp_path / "cache"
+    load_with_snapshot(source, cache_dir)
+    # Simple 'touch' : même contenu => instantané conservé (empreinte identique)
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert read_snapshot(source, cache_dir) is not None
+    # Contenu modifié => relecture du JSON, puis nouvel instantané
+    source.write_text(json.dumps(ITEMS[:1]), encoding="utf-8")
+    assert read_snapshot(source, cache_dir) is None
+    vinedos, report = load_with_snapshot(source, cache_dir)
+    assert not report.from_snapshot and [v.nom for v in vinedos] == ["Rioja"]
+    assert load_with_snapshot(source, cache_dir)[1].from_snapshot
+
+
+def test_corrupted_snapshot_falls_back_to_json(source, tmp_path):
+    cache_dir = tmp_path / "cache"
+    load_with_snapshot(source, cache_dir)
+    snapshot = snapshot_path(source, cache_dir)
+    snapshot.write_bytes(snapshot.read_bytes()[:40])
+    vinedos, report = load_with_snapshot(source, cache_dir)
+    assert not report.from_snapshot and len(vinedos) == 1
@@ -0,0 +1,137 @@
+##################################
+# vinos_ibericos/build_maps.py   #
+#                                #
+# Commande de construction du    #
+# lot de cartes précompilées :   #
+# python -m                      #
+#   vinos_ibericos.build_maps    #
+##################################
+
+import argparse
+import json
+import shutil
+import time
+
+from datetime import datetime, timezone
+from hashlib import sha256
+from pathlib import Path
+from typing import Any
+
+import folium
+
+from vinos_ibericos.config.general import ConfigPath
+from vinos_ibericos.data.bodega_manager import DEFAULT_DB_PATH
+from vinos_ibericos.data.polygon_store import PolygonConfig, do_slug
+from vinos_ibericos.map_bundle import BundleConfig, view_filename
+from vinos_ibericos.map_manager import MapManager, PathConfig
+from vinos_ibericos.map_warmup import MapWarmup
+from vinos_ibericos.utils import CheckVinedoJson
+
+
+def build_bundle(
+    json_path: Path = ConfigPath.JSON_FILE_PATH,
+    geojson_dir: Path = PathConfig.GEOJSON_DIR,
+    out_dir: Path = BundleConfig.DIR,
+    max_workers: int | None = None,
+    bodegas_db: Path | None = None,
+) -> dict[str, Any]:
+    """
+    Rend toutes les vues et les polygones simplifiés dans 'out_dir'.
+    Le lot est écrit dans un répertoire temporaire puis substitué à l'ancien.
+    Retourne le manifeste.
+    """
+    loader = CheckVinedoJson(json_path, snapshot_dir=None)  # Toujours la source
+    loader.load()
+    manager = MapManager(
+        loader.data,
+        cache_size=len(loader.data) + 1,
+        geojson_dir=geojson_dir,
+        bundle_dir=None,  # Toujours un rendu folium ici
+        bodegas_db=bodegas_db,
+    )
+    MapWarmup(manager, max_workers=max_workers).run()  # Rendu parallèle
+
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    (tmp_dir / "pages").mkdir(parents=True)
+    (tmp_dir / "polygons").mkdir()
+    files: dict[str, str] = {}
+
+    def write(relative: str, content: str) -> str:
+        data = content.encode("utf-8")
+        (tmp_dir / relative).write_bytes(data)
+        files[relative] = sha256(data).hexdigest()
+        return relative
+
+    pages = {
+        view_filename(view): write(
+            f"pages/{view_filename(view)}.html", manager.generate_map_html(view)
+        )
+        for view in manager.views()
+    }
+    polygons = {}
+    for vinedo in manager.vinedos:
+        polygon_data = manager._polygon_data(vinedo.nom)
+        if polygon_data is None:
+            continue
+        slug = do_slug(vinedo.nom)
+        polygon = {
+            "bounds": polygon_data.bounds_list(),
+            "levels": {
+                str(zoom): polygon_data.simplified(zoom).locations()
+                for zoom in PolygonConfig.SIMPLIFY_ZOOMS
+            },
+        }
+        polygons[slug] = write(f"polygons/{slug}.json", json.dumps(polygon))
+
+    manifest = {
+        "format_version": BundleConfig.FORMAT_VERSION,
+        "input_hash": manager.input_hash(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "folium_version": folium.__version__,
+        "pages": pages,
+        "polygons": polygons,
+        "files": files,  # sha256 de chaque fichier du lot
+    }
+    (tmp_dir / BundleConfig.MANIFEST).write_text(
+        json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+    shutil.rmtree(out_dir, ignore_errors=True)
+    tmp_dir.replace(out_dir)
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Construit le lot de cartes précompilées (pages HTML + polygones)."
+    )
+    parser.add_argument("--json", type=Path, default=ConfigPath.JSON_FILE_PATH)
+    parser.add_argument("--geojson-dir", type=Path, default=PathConfig.GEOJSON_DIR)
+    parser.add_argument("--out", type=Path, default=BundleConfig.DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--bodegas-db",
+        type=Path,
+        default=DEFAULT_DB_PATH,
+        help="Base des bodegas affichées en vue focus (comme l'application)",
+    )
+    parser.add_argument("--no-bodegas", action="store_true")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    manifest = build_bundle(
+        args.json,
+        args.geojson_dir,
+        args.out,
+        args.workers,
+        bodegas_db=None if args.no_bodegas else args.bodegas_db,
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"Lot écrit dans {args.out} : {len(manifest['pages'])} pages, "
+        f"{len(manifest['polygons'])} polygones en {elapsed:.2f} s "
+        f"(empreinte {manifest['input_hash']})"
+    )
+
+
+if __name__ == "__main__":
+    main()
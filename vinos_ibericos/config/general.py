@@ -17,5 +17,7 @@ class ConfigPath:
 
     # Répertoires
     BASE_DIR_PROJECT: Path = Path(__file__).resolve().parent.parent.parent
+    CACHE_DIR: Path = BASE_DIR_PROJECT / ".cache"  # Caches régénérables (non versionnés)
+    GEOJSON_DIR: Path = BASE_DIR_PROJECT / "assets" / "geojson"  # Polygones des DO
     # fichiers
     JSON_FILE_PATH: Path = BASE_DIR_PROJECT / "vinedos.json"
@@ -15,28 +15,63 @@ FIELDS = (
     ("website", "Site web", False, str),
     ("do_name", "Nom de la DO", True, str),
 )
+REQUIRED_KEYS = frozenset(key for key, _, required, _ in FIELDS if required)
 
 
-def generate_create_table_sql() -> str:
+def sql_type(typ: type) -> str:
+    """Type SQLite d'un champ de FIELDS ('typ' est la classe elle-même : int, float, str)."""
+    if typ is int:
+        return "INTEGER"
+    elif typ is float:
+        return "REAL"
+    return "TEXT"
+
+
+def column_definition(key: str, typ: type, required: bool = False) -> str:
+    """Définition SQL d'une colonne : 'clé TYPE [NOT NULL]'."""
+    not_null = "NOT NULL" if required else ""
+    return f"{key} {sql_type(typ)} {not_null}".strip()
+
+
+def generate_create_table_sql(table_name: str = TABLE_NAME) -> str:
     """
     Génère la requête SQL CREATE TABLE à partir de FIELDS.
     """
-    sql_fields = []
-    for key, _, required, typ in FIELDS:
-        if isinstance(typ, int):
-            sql_type = "INTEGER"
-        elif isinstance(typ, float):
-            sql_type = "REAL"
-        else:
-            sql_type = "TEXT"
-        not_null = "NOT NULL" if required else ""
-        sql_fields.append(f"{key} {sql_type} {not_null}".strip())
+    sql_fields = [
+        column_definition(key, typ, required) for key, _, required, typ in FIELDS
+    ]
 
     # Ajouter la colonne id en PK
     sql = f"""
-    CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+    CREATE TABLE IF NOT EXISTS {table_name} (
         id INTEGER PRIMARY KEY,
         {",\n        ".join(sql_fields)}
     );
     """
     return sql
+
+
+def convert_values(data: dict, check_required: bool = False) -> list:
+    """
+    Valeurs d'une bodega dans l'ordre de FIELDS, converties au type attendu.
+    - check_required=True => ValueError si un champ obligatoire est vide
+    - ValueError si 'data' n'est pas un objet ou si une valeur n'est pas convertible
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"Objet attendu, reçu : {type(data).__name__}")
+    values = []
+    for key, label, required, typ in FIELDS:
+        val = data.get(key)
+        if val is None:
+            if required and check_required:
+                raise ValueError(f"Champ obligatoire manquant : '{key}' ({label})")
+        else:
+            # Conversion de type automatique si nécessaire
+            try:
+                val = typ(val)
+            except (ValueError, TypeError):  # int([1]), float({}) : TypeError
+                raise ValueError(
+                    f"Erreur de conversion pour le champ '{key}' avec la valeur '{val}'"
+                )
+        values.append(val)
+    return values
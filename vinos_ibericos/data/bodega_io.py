@@ -0,0 +1,197 @@
+#####################################
+# vinos_ibericos/data/bodega_io.py  #
+#                                   #
+# Import / export en masse des      #
+# bodegas (CSV, JSON, JSON Lines) : #
+# python -m                         #
+#   vinos_ibericos.data.bodega_io   #
+#####################################
+
+import argparse
+import csv
+import json
+import time
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+from vinos_ibericos.data.bodega_fields import FIELDS
+from vinos_ibericos.data.bodega_manager import (
+    BULK_BATCH_SIZE,
+    DEFAULT_DB_PATH,
+    BodegaManager,
+)
+from vinos_ibericos.data.vinedo_loader import iter_json_array
+
+
+@dataclass(frozen=True)
+class BodegaIOConfig:
+    FORMATS: tuple[str, ...] = ("csv", "json", "jsonl")
+    CSV_DELIMITER: str = ","
+    ENCODING: str = "utf-8"
+
+
+@dataclass
+class TransferReport:
+    rows: int = 0
+    written: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)  # (ligne, message)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.written}/{self.rows} bodegas en {self.elapsed:.2f} s "
+            f"({self.rows_per_s:.0f} lignes/s, {len(self.errors)} erreur(s))"
+        )
+
+
+def detect_format(path: Path) -> str:
+    """Format d'après l'extension (.csv, .json, .jsonl)."""
+    fmt = path.suffix.lower().lstrip(".")
+    if fmt not in BodegaIOConfig.FORMATS:
+        raise ValueError(
+            f"Format non pris en charge : '{path.suffix}' "
+            f"(attendu : {', '.join(BodegaIOConfig.FORMATS)})"
+        )
+    return fmt
+
+
+def _clean(record: Any) -> Any:
+    """Cellules vides => None (les champs obligatoires vides seront signalés)."""
+    if not isinstance(record, dict):  # Signalé ligne par ligne à l'insertion
+        return record
+    return {
+        key: None if isinstance(value, str) and not value.strip() else value
+        for key, value in record.items()
+    }
+
+
+def read_bodegas(
+    path: Path, errors: Optional[list[tuple[int, str]]] = None
+) -> Iterator[tuple[int, Any]]:
+    """
+    Lit les enregistrements au fil de l'eau : (numéro de ligne, enregistrement).
+    - CSV : ligne par ligne (dernière ligne d'un champ entre guillemets sur plusieurs)
+    - JSON Lines : ligne par ligne ; une ligne illisible est ajoutée à 'errors'
+      (ligne, message) puis ignorée (sans 'errors' : json.JSONDecodeError)
+    - JSON : tableau parcouru élément par élément (VinedoJsonError s'il est mal formé)
+    """
+    fmt = detect_format(path)
+    with path.open(encoding=BodegaIOConfig.ENCODING, newline="") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f, delimiter=BodegaIOConfig.CSV_DELIMITER)
+            for record in reader:
+                yield reader.line_num, _clean(record)
+        elif fmt == "jsonl":
+            for line, text in enumerate(f, start=1):
+                if not text.strip():
+                    continue
+                try:
+                    record = json.loads(text)
+                except json.JSONDecodeError as e:
+                    if errors is None:
+                        raise
+                    errors.append((line, f"JSON invalide : {e.msg}"))
+                    continue
+                yield line, _clean(record)
+        else:
+            for record, line, _ in iter_json_array(f):
+                yield line, _clean(record)
+
+
+def write_bodegas(path: Path, bodegas: Iterable[Mapping]) -> int:
+    """
+    Écrit les bodegas (flux de dict ou de sqlite3.Row) dans le format déduit de
+    l'extension ; retourne le nombre.
+    """
+    fmt = detect_format(path)
+    columns = ["id"] + [key for key, *_ in FIELDS]
+    bodegas = map(dict, bodegas)  # Une ligne à la fois (csv et json attendent un dict)
+    count = 0
+    with path.open("w", encoding=BodegaIOConfig.ENCODING, newline="") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(
+                f,
+                fieldnames=columns,
+                delimiter=BodegaIOConfig.CSV_DELIMITER,
+                extrasaction="ignore",
+            )
+            writer.writeheader()
+            for bodega in bodegas:
+                writer.writerow(bodega)
+                count += 1
+        elif fmt == "jsonl":
+            for bodega in bodegas:
+                f.write(json.dumps(bodega, ensure_ascii=False) + "\n")
+                count += 1
+        else:  # Tableau JSON écrit élément par élément
+            f.write("[")
+            for bodega in bodegas:
+                f.write(",\n  " if count else "\n  ")
+                f.write(json.dumps(bodega, ensure_ascii=False))
+                count += 1
+            f.write("\n]\n" if count else "]\n")
+    return count
+
+
+def import_bodegas(
+    path: Path, manager: BodegaManager, batch_size: int = BULK_BATCH_SIZE
+) -> TransferReport:
+    """
+    Importe un fichier dans la base (une transaction) : lignes illisibles ou
+    invalides signalées avec leur numéro de ligne dans le fichier, sans arrêter l'import.
+    """
+    report = TransferReport()
+    start = time.perf_counter()
+    line = 0  # Ligne de l'enregistrement en cours de conversion
+
+    def records() -> Iterator[Any]:
+        nonlocal line
+        for line, record in read_bodegas(path, report.errors):
+            yield record
+
+    result = manager.add_bodegas(
+        records(),
+        batch_size=batch_size,
+        on_error=lambda _index, message: report.errors.append((line, message)),
+    )
+    report.written = result.inserted
+    report.rows = result.inserted + len(report.errors)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def export_bodegas(path: Path, manager: BodegaManager) -> TransferReport:
+    """Exporte toute la table (lecture par paquets)."""
+    start = time.perf_counter()
+    count = write_bodegas(path, manager.iter_bodegas())
+    return TransferReport(rows=count, written=count, elapsed=time.perf_counter() - start)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Import / export des bodegas (CSV, JSON, JSON Lines)."
+    )
+    parser.add_argument("command", choices=("import", "export"))
+    parser.add_argument("file", type=Path, help="Fichier .csv, .json ou .jsonl")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_PATH)
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    with BodegaManager(args.db) as manager:
+        if args.command == "import":
+            report = import_bodegas(args.file, manager, args.batch_size)
+            for line, message in report.errors:
+                print(f"Ligne {line} : {message}")
+        else:
+            report = export_bodegas(args.file, manager)
+    print(f"{args.command.capitalize()} : {report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,52 +4,172 @@
 # Gestionnaire Python de la db :        #
 # - Se charge de la connexion à SQLite  #
 # - Fournit les méthodes CRUD           #
+# - Requêtes SQL construites une fois   #
 #########################################
 
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Union
 
+import json
 import sqlite3
 
 from vinos_ibericos.data import bodega_fields
+from vinos_ibericos.data.connection import ConnectionProvider, get_provider
+from vinos_ibericos.data.migrations import (  # noqa: F401 (API historique du module)
+    CREATE_BODEGAS_TABLE_SQL,
+    RTREE_TABLE,
+    change_counter,
+    create_bodegas_table,
+    create_spatial_index,
+    has_rtree,
+    migrate,
+)
 
 
 # Chemin par défaut du fichier de base de données (même répertoire que ce fichier) :
 DEFAULT_DB_PATH = Path(__file__).parent / "bodegas.db"
 
-# Schéma de la table bodegas (requête SQLite):
-CREATE_BODEGAS_TABLE_SQL = bodega_fields.generate_create_table_sql()
+# Taille des lots pour les insertions/lectures en masse :
+BULK_BATCH_SIZE = 500
+# Taille des pages par défaut (pagination par clé) :
+PAGE_SIZE = 50
+# Erreurs propres à une ligne lors des insertions en masse (le lot continue) :
+ROW_ERRORS = (ValueError, TypeError, AttributeError, json.JSONDecodeError)
+
+
+class BulkInsertResult(NamedTuple):
+    inserted: int
+    errors: list[tuple[int, str]]  # (indice de la ligne, message)
+
+
+# Curseur de pagination : (valeur de la colonne de tri, id) de la dernière ligne lue
+PageCursor = tuple[Any, int]
+
+
+class BodegaPage(NamedTuple):
+    rows: list[sqlite3.Row]
+    next_cursor: Optional[PageCursor]  # None => dernière page
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    """PRAGMA appliqués à chaque connexion (voir tests/bench_bodega_storage.py)."""
+
+    JOURNAL_MODE: str = "WAL"  # Lectures non bloquées par une écriture
+    SYNCHRONOUS: str = "NORMAL"  # Pas de fsync à chaque commit en WAL (reste cohérent)
+    MMAP_SIZE: int = 64 * 1024 * 1024  # Lectures par mémoire projetée (octets)
+    CACHE_SIZE: int = -16_000  # Cache de pages : négatif => en Kio (~16 Mo)
+
+
+TUNED_PROFILE = StorageProfile()
+# Réglages par défaut de SQLite (journal de rollback, fsync à chaque commit) :
+LEGACY_PROFILE = StorageProfile(
+    JOURNAL_MODE="DELETE", SYNCHRONOUS="FULL", MMAP_SIZE=0, CACHE_SIZE=-2000
+)
+
+# Requêtes construites une seule fois à partir de FIELDS : le texte étant identique
+# à chaque appel, sqlite3 réutilise la requête préparée de son cache (par connexion).
+COLUMNS: tuple[str, ...] = tuple(field[0] for field in bodega_fields.FIELDS)
+INSERT_BODEGA_SQL = (
+    f"INSERT INTO {bodega_fields.TABLE_NAME} ({', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join(['?'] * len(COLUMNS))})"
+)
+SELECT_BODEGA_SQL = f"SELECT * FROM {bodega_fields.TABLE_NAME} WHERE id = ?"
+SELECT_ALL_BODEGAS_SQL = f"SELECT * FROM {bodega_fields.TABLE_NAME}"
+SELECT_ALL_BY_ID_SQL = f"{SELECT_ALL_BODEGAS_SQL} ORDER BY id"
+DELETE_BODEGA_SQL = f"DELETE FROM {bodega_fields.TABLE_NAME} WHERE id = ?"
+# Emprise : boîtes de l'index R*Tree stockées en float32, arrondies vers l'extérieur.
+# Candidats par chevauchement (jamais par inclusion : un point sur un bord serait
+# perdu), puis filtre exact sur les colonnes lat/lon de la table.
+# Paramètres : (sud, nord, ouest, est) pour chacune des deux conditions.
+BBOX_RTREE_OVERLAP = "max_lat >= ? AND min_lat <= ? AND max_lon >= ? AND min_lon <= ?"
+BBOX_INDEX_FILTER = "lat BETWEEN ? AND ? AND lon BETWEEN ? AND ?"
+BBOX_RTREE_FILTER = (
+    f"id IN (SELECT id FROM {RTREE_TABLE} WHERE {BBOX_RTREE_OVERLAP}) "
+    f"AND {BBOX_INDEX_FILTER}"
+)
+SELECT_BBOX_RTREE_SQL = f"{SELECT_ALL_BODEGAS_SQL} WHERE {BBOX_RTREE_FILTER}"
+SELECT_BBOX_INDEX_SQL = f"{SELECT_ALL_BODEGAS_SQL} WHERE {BBOX_INDEX_FILTER}"
+
+# Requêtes filtrées : colonnes de tri autorisées (jamais de nom de colonne fourni
+# par l'appelant dans le SQL) et filtres sur les colonnes indexées.
+ORDER_COLUMNS: tuple[str, ...] = ("id",) + COLUMNS
 
 
 class BodegaManager:
-    def __init__(self, db_path: Optional[Union[str, Path]] = None):
-        """Initialise le gestionnaire et ouvre la connexion à la base SQLite."""
-        self.conn = init_db(db_path)
+    def __init__(
+        self,
+        db_path: Optional[Union[str, Path]] = None,
+        provider: Optional[ConnectionProvider] = None,
+        profile: StorageProfile = TUNED_PROFILE,
+    ):
+        """
+        Initialise le gestionnaire avec une connexion empruntée au fournisseur partagé
+        (pas de nouvelle connexion ni de CREATE TABLE si la base est déjà ouverte).
+        La connexion est rendue au pool par close() (ou en sortie de bloc 'with').
+        """
+        self.provider = provider or get_bodega_provider(db_path, profile)
+        self._borrowed = self.provider.acquire()
+        self.conn = self._borrowed
+
+    def close(self) -> None:
+        """Rend la connexion au fournisseur."""
+        self.provider.release(self._borrowed)
+
+    def __enter__(self) -> "BodegaManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def add_bodega(self, data: dict) -> Optional[int]:
         """Insère une bodega dans la base."""
-        # Colonnes à insérer : toutes les clés du tuple FIELDS
-        columns = [field[0] for field in bodega_fields.FIELDS]
-        # Préparer les valeurs dans le bon ordre
-        values = []
-        for key, _, _, typ in bodega_fields.FIELDS:
-            val = data.get(key)
-            # Conversion de type automatique si nécessaire
-            if val is not None:
-                try:
-                    val = typ(val)
-                except ValueError:
-                    raise ValueError(
-                        f"Erreur de conversion pour le champ '{key}' avec la valeur '{val}'"
-                    )
-            values.append(val)
-        placeholders = ", ".join(["?"] * len(columns))
-        sql = f"INSERT INTO bodegas ({', '.join(columns)}) VALUES ({placeholders})"
+        values = bodega_fields.convert_values(data)
         cur = self.conn.cursor()
-        cur.execute(sql, values)
+        cur.execute(INSERT_BODEGA_SQL, values)
         self.conn.commit()
         return cur.lastrowid
 
+    def add_bodegas(
+        self,
+        rows: Iterable[dict],
+        batch_size: int = BULK_BATCH_SIZE,
+        on_error: Optional[Callable[[int, str], None]] = None,
+    ) -> BulkInsertResult:
+        """
+        Insère des bodegas en masse : conversion par lots, 'executemany' et un seul
+        commit (une seule transaction). Une ligne invalide (valeur non convertible,
+        champ manquant, enregistrement qui n'est pas un objet) est signalée dans
+        'errors' (indice, message) et à 'on_error', sans interrompre le lot.
+        """
+        sql = INSERT_BODEGA_SQL
+        inserted = 0
+        errors: list[tuple[int, str]] = []
+        batch: list[list] = []
+        try:
+            for index, data in enumerate(rows):
+                try:
+                    batch.append(bodega_fields.convert_values(data, check_required=True))
+                except ROW_ERRORS as e:
+                    errors.append((index, str(e)))
+                    if on_error is not None:
+                        on_error(index, str(e))
+                    continue
+                if len(batch) >= batch_size:
+                    self.conn.executemany(sql, batch)
+                    inserted += len(batch)
+                    batch.clear()
+            if batch:
+                self.conn.executemany(sql, batch)
+                inserted += len(batch)
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()  # Rien n'est inséré en cas d'erreur SQL
+            raise
+        return BulkInsertResult(inserted, errors)
+
     def update_bodega(self, id: int, data: dict):
         """Modifie une bodega."""
         pass
@@ -59,16 +179,14 @@ class BodegaManager:
         Supprime une bodega à partir de son ID.
         Retourne True si une ligne a été supprimée, False sinon.
         """
-        sql = "DELETE FROM bodegas WHERE id = ?"
         cur = self.conn.cursor()
-        cur.execute(sql, (id,))
+        cur.execute(DELETE_BODEGA_SQL, (id,))
         self.conn.commit()
         return cur.rowcount > 0
 
     def get_bodega(self, id: int) -> Optional[dict]:
         """Retourne une bodega par son ID, ou None si introuvable."""
-        sql = "SELECT * FROM bodegas WHERE id = ?"
-        cur = self.conn.execute(sql, (id,))
+        cur = self.conn.execute(SELECT_BODEGA_SQL, (id,))
         row = cur.fetchone()
         if row is None:
             return None
@@ -76,10 +194,121 @@ class BodegaManager:
         columns = [col[0] for col in cur.description]  # noms des colonnes
         return dict(zip(columns, row))
 
+    def change_counter(self) -> Optional[int]:
+        """Repère du contenu : change à chaque ajout, modification ou suppression."""
+        return change_counter(self.conn)
+
+    def get_bodegas_in_bbox(
+        self, south: float, west: float, north: float, east: float
+    ) -> list[dict]:
+        """
+        Retourne les bodegas situées dans l'emprise (sud, ouest, nord, est), bords
+        compris. Candidats lus dans l'index R*Tree (boîtes float32, arrondies vers
+        l'extérieur), puis comparaison exacte avec les coordonnées de la table.
+        """
+        rtree = has_rtree(self.conn)
+        sql = SELECT_BBOX_RTREE_SQL if rtree else SELECT_BBOX_INDEX_SQL
+        cur = self.conn.execute(sql, _bbox_params((south, west, north, east), rtree))
+        columns = [col[0] for col in cur.description]  # noms des colonnes
+        return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+    def iter_bodegas(self, batch_size: int = BULK_BATCH_SIZE) -> Iterator[sqlite3.Row]:
+        """Parcourt toute la table par paquets (fetchmany), sans tout charger en mémoire."""
+        return self.stream_bodegas(batch_size=batch_size)
+
+    def _filters(
+        self,
+        do_name: Optional[str],
+        town: Optional[str],
+        bbox: Optional[tuple[float, float, float, float]],
+    ) -> tuple[list[str], list]:
+        """Conditions SQL et paramètres des filtres (DO, ville, emprise)."""
+        clauses: list[str] = []
+        params: list = []
+        if do_name is not None:
+            clauses.append("do_name = ?")
+            params.append(do_name)
+        if town is not None:
+            clauses.append("town = ?")
+            params.append(town)
+        if bbox is not None:
+            rtree = has_rtree(self.conn)
+            clauses.append(BBOX_RTREE_FILTER if rtree else BBOX_INDEX_FILTER)
+            params.extend(_bbox_params(bbox, rtree))
+        return clauses, params
+
+    def _cursor(self, sql: str, params: list) -> sqlite3.Cursor:
+        """Curseur renvoyant des sqlite3.Row (accès par nom, sans dict par ligne)."""
+        cur = self.conn.cursor()
+        cur.row_factory = sqlite3.Row
+        return cur.execute(sql, params)
+
+    def count_bodegas(
+        self,
+        do_name: Optional[str] = None,
+        town: Optional[str] = None,
+        bbox: Optional[tuple[float, float, float, float]] = None,
+    ) -> int:
+        """Nombre de bodegas correspondant aux filtres."""
+        clauses, params = self._filters(do_name, town, bbox)
+        sql = _select_sql("COUNT(*)", clauses)
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def stream_bodegas(
+        self,
+        do_name: Optional[str] = None,
+        town: Optional[str] = None,
+        bbox: Optional[tuple[float, float, float, float]] = None,
+        order_by: str = "id",
+        descending: bool = False,
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> Iterator[sqlite3.Row]:
+        """
+        Bodegas filtrées et triées, lues par paquets de 'batch_size' (fetchmany) :
+        mémoire constante quelle que soit la taille de la table.
+        """
+        clauses, params = self._filters(do_name, town, bbox)
+        sql = _select_sql("*", clauses) + _order_clause(order_by, descending)
+        cur = self._cursor(sql, params)
+        try:
+            while rows := cur.fetchmany(batch_size):
+                yield from rows
+        finally:
+            cur.close()
+
+    def page_bodegas(
+        self,
+        do_name: Optional[str] = None,
+        town: Optional[str] = None,
+        bbox: Optional[tuple[float, float, float, float]] = None,
+        order_by: str = "id",
+        descending: bool = False,
+        page_size: int = PAGE_SIZE,
+        after: Optional[PageCursor] = None,
+    ) -> BodegaPage:
+        """
+        Page de bodegas par pagination par clé : 'after' est le 'next_cursor' de la
+        page précédente. Pas d'OFFSET : chaque page part de l'index, au lieu de relire
+        et d'écarter toutes les lignes des pages précédentes.
+        """
+        clauses, params = self._filters(do_name, town, bbox)
+        if after is not None:
+            condition, cursor_params = _keyset_condition(order_by, descending, after)
+            clauses.append(condition)
+            params.extend(cursor_params)
+        sql = _select_sql("*", clauses)
+        sql += _order_clause(order_by, descending) + " LIMIT ?"
+        params.append(page_size + 1)  # Une ligne de plus : y a-t-il une page suivante ?
+        rows = self._cursor(sql, params).fetchall()
+        if len(rows) <= page_size:
+            return BodegaPage(rows, None)
+        rows = rows[:page_size]
+        last = rows[-1]
+        return BodegaPage(rows, (last[order_by], last["id"]))
+
     def get_all_bodegas(self) -> list[dict]:
         """Retourne la liste de toutes les bodegas sous forme de dictionnaires."""
-        sql = "SELECT * FROM bodegas"
-        cur = self.conn.execute(sql)
+        cur = self.conn.execute(SELECT_ALL_BODEGAS_SQL)
         rows = cur.fetchall()
 
         if not rows:
@@ -89,34 +318,127 @@ class BodegaManager:
         return [dict(zip(columns, row)) for row in rows]
 
 
-def create_bodegas_table(conn: sqlite3.Connection) -> None:
-    """Crée la table `bodegas` si n'existe pas."""
-    cursor = conn.cursor()
-    cursor.execute(CREATE_BODEGAS_TABLE_SQL)
-    conn.commit()
+def _bbox_params(
+    bbox: tuple[float, float, float, float], rtree: bool
+) -> tuple[float, ...]:
+    """Paramètres des filtres d'emprise (deux conditions avec l'index R*Tree)."""
+    south, west, north, east = bbox
+    params = (south, north, west, east)
+    return params * 2 if rtree else params
+
 
+def _select_sql(select: str, clauses: list[str]) -> str:
+    sql = f"SELECT {select} FROM {bodega_fields.TABLE_NAME}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    return sql
 
-def init_db(db_path: Optional[Union[str, Path]] = None) -> sqlite3.Connection:
+
+def _check_order(order_by: str) -> None:
+    if order_by not in ORDER_COLUMNS:
+        raise ValueError(
+            f"Tri impossible sur '{order_by}' (attendu : {', '.join(ORDER_COLUMNS)})"
+        )
+
+
+def _order_clause(order_by: str, descending: bool) -> str:
+    """ORDER BY colonne puis id (ordre total, nécessaire à la pagination par clé)."""
+    _check_order(order_by)
+    direction = "DESC" if descending else "ASC"
+    if order_by == "id":
+        return f" ORDER BY id {direction}"
+    return f" ORDER BY {order_by} {direction}, id {direction}"
+
+
+def _keyset_condition(
+    order_by: str, descending: bool, after: PageCursor
+) -> tuple[str, list]:
+    """
+    Condition 'après le curseur' pour l'ordre de _order_clause.
+    SQLite place les NULL en tête en ASC (en fin en DESC) : une colonne ajoutée par
+    migration peut en contenir, ils sont donc traités à part.
+    """
+    _check_order(order_by)
+    value, last_id = after
+    op = "<" if descending else ">"
+    if order_by == "id":
+        return f"id {op} ?", [last_id]
+    if value is None:
+        if descending:  # Fin de l'ordre : il ne reste que des NULL
+            return f"({order_by} IS NULL AND id < ?)", [last_id]
+        return f"(({order_by} IS NULL AND id > ?) OR {order_by} IS NOT NULL)", [last_id]
+    condition = f"{order_by} {op} ? OR ({order_by} = ? AND id {op} ?)"
+    if descending:
+        condition += f" OR {order_by} IS NULL"
+    return f"({condition})", [value, value, last_id]
+
+
+def init_db(
+    db_path: Optional[Union[str, Path]] = None, profile: StorageProfile = TUNED_PROFILE
+) -> sqlite3.Connection:
     """
     Initialise la base SQLite et s'assure que la table `bodegas` existe.
     - db_path: chemin vers le fichier sqlite (str ou Path). Par défaut vinos_ibericos/data/bodegas.db
-    Retourne la connexion sqlite3.Connection ouverte.
+    - profile: PRAGMA de stockage (WAL, synchronous, mmap, cache)
+    Retourne une nouvelle connexion sqlite3.Connection ouverte (hors pool).
     """
     db_path = (
         Path(db_path) if db_path else DEFAULT_DB_PATH
     )  # répertoire à créer si nécessaire
     db_path.parent.mkdir(parents=True, exist_ok=True)  # s'assurer que le dossier existe
     conn = sqlite3.connect(str(db_path))
+    configure_connection(conn, profile)
+    create_schema(conn)
+    return conn
+
+
+def configure_connection(
+    conn: sqlite3.Connection, profile: StorageProfile = TUNED_PROFILE
+) -> None:
+    """PRAGMA appliqués à chaque connexion."""
     conn.execute(
         "PRAGMA foreign_keys = ON;"
     )  # activer les clés étrangères (si ajout plus tard)
-    create_bodegas_table(conn)  # Exécution de la requête + commit
-    return conn
+    conn.execute(f"PRAGMA journal_mode = {profile.JOURNAL_MODE};")
+    conn.execute(f"PRAGMA synchronous = {profile.SYNCHRONOUS};")
+    conn.execute(f"PRAGMA mmap_size = {int(profile.MMAP_SIZE)};")
+    conn.execute(f"PRAGMA cache_size = {int(profile.CACHE_SIZE)};")
+
+
+def create_schema(conn: sqlite3.Connection) -> None:
+    """Table, index et migrations : une seule fois par base (appelé par le fournisseur)."""
+    migrate(conn)
+
+
+def get_bodega_provider(
+    db_path: Optional[Union[str, Path]] = None, profile: StorageProfile = TUNED_PROFILE
+) -> ConnectionProvider:
+    """
+    Fournisseur de connexions partagé pour la base des bodegas.
+    ValueError si ce fichier est déjà ouvert avec un autre profil de stockage.
+    """
+    return get_provider(
+        db_path or DEFAULT_DB_PATH,
+        setup=partial(configure_connection, profile=profile),
+        initialize=create_schema,
+        settings=profile,
+    )
+
+
+# Gestionnaire partagé du thread GUI (formulaires, lectures ponctuelles) :
+_shared_manager: Optional[BodegaManager] = None
+
+
+def get_bodega_manager() -> BodegaManager:
+    """BodegaManager unique de l'application, sur la base par défaut."""
+    global _shared_manager
+    if _shared_manager is None or _shared_manager.provider.is_closed:
+        _shared_manager = BodegaManager()
+    return _shared_manager
 
 
 if __name__ == "__main__":
     manager = BodegaManager()
-    # Récupérer toutes les bodegas
-    bodegas = manager.get_all_bodegas()
-    for b in bodegas:
+    # Parcourir toutes les bodegas (par paquets)
+    for b in manager.stream_bodegas():
         print(b["id"], b["name"], b["do_name"])
@@ -0,0 +1,119 @@
+######################################
+# vinos_ibericos/data/clustering.py  #
+#                                    #
+# Regroupement (grille par zoom) et  #
+# filtrage par emprise des points    #
+# de la carte, vectorisés avec NumPy #
+######################################
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from vinos_ibericos.data.geometry import TILE_SIZE_PX
+
+
+@dataclass(frozen=True)
+class ClusterConfig:
+    CELL_PX: int = 80  # Taille d'une cellule de regroupement à l'écran
+    MIN_ZOOM: int = 5
+    MAX_ZOOM: int = 16  # Au-delà : points individuels
+    DECIMALS: int = 5  # Précision des coordonnées envoyées à la page (~1 m)
+
+
+def project(lats: np.ndarray, lons: np.ndarray, zoom: int) -> tuple[np.ndarray, np.ndarray]:
+    """Coordonnées pixel Web Mercator (x, y) au zoom donné."""
+    scale = TILE_SIZE_PX * 2.0**zoom
+    lat_rad = np.radians(np.clip(lats, -85.0511, 85.0511))
+    x = (lons + 180.0) / 360.0 * scale
+    y = (1.0 - np.arcsinh(np.tan(lat_rad)) / np.pi) / 2.0 * scale
+    return x, y
+
+
+def unproject(x: np.ndarray, y: np.ndarray, zoom: int) -> tuple[np.ndarray, np.ndarray]:
+    """Inverse de 'project' : pixels -> (lat, lon)."""
+    scale = TILE_SIZE_PX * 2.0**zoom
+    lons = x / scale * 360.0 - 180.0
+    lats = np.degrees(np.arctan(np.sinh(np.pi * (1.0 - 2.0 * y / scale))))
+    return lats, lons
+
+
+def viewport_bounds(
+    center: tuple[float, float], zoom: int, size_px: tuple[int, int]
+) -> tuple[float, float, float, float]:
+    """Emprise (sud, ouest, nord, est) d'une vue de 'size_px' pixels centrée sur 'center'."""
+    cx, cy = project(np.array([center[0]]), np.array([center[1]]), zoom)
+    half_w, half_h = size_px[0] / 2.0, size_px[1] / 2.0
+    lats, lons = unproject(
+        np.array([cx[0] - half_w, cx[0] + half_w]),
+        np.array([cy[0] + half_h, cy[0] - half_h]),
+        zoom,
+    )
+    return float(lats[0]), float(lons[0]), float(lats[1]), float(lons[1])
+
+
+def in_bounds(
+    lats: np.ndarray, lons: np.ndarray, bounds: tuple[float, float, float, float]
+) -> np.ndarray:
+    """Masque booléen des points situés dans l'emprise (sud, ouest, nord, est)."""
+    south, west, north, east = bounds
+    return (lats >= south) & (lats <= north) & (lons >= west) & (lons <= east)
+
+
+def grid_clusters(
+    lats: np.ndarray, lons: np.ndarray, zoom: int, cell_px: int = ClusterConfig.CELL_PX
+) -> np.ndarray:
+    """
+    Regroupe les points par cellule de 'cell_px' pixels au zoom donné.
+    Retourne un tableau (K, 4) : lat moyenne, lon moyenne, effectif, indice du premier point.
+    """
+    x, y = project(lats, lons, zoom)
+    cells = np.stack(
+        [np.floor(x / cell_px).astype(np.int64), np.floor(y / cell_px).astype(np.int64)],
+        axis=1,
+    )
+    _, first, inverse, counts = np.unique(
+        cells, axis=0, return_index=True, return_inverse=True, return_counts=True
+    )
+    inverse = inverse.ravel()
+    mean_lat = np.bincount(inverse, weights=lats) / counts
+    mean_lon = np.bincount(inverse, weights=lons) / counts
+    return np.column_stack([mean_lat, mean_lon, counts, first])
+
+
+class ClusterIndex:
+    """
+    Regroupements précalculés pour chaque zoom de MIN_ZOOM à MAX_ZOOM.
+    Le calcul s'arrête au premier zoom où chaque point est seul dans sa cellule :
+    les zooms supérieurs réutilisent ce niveau.
+    """
+
+    def __init__(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        min_zoom: int = ClusterConfig.MIN_ZOOM,
+        max_zoom: int = ClusterConfig.MAX_ZOOM,
+        cell_px: int = ClusterConfig.CELL_PX,
+    ) -> None:
+        self.min_zoom = min_zoom
+        self.levels: dict[int, np.ndarray] = {}
+        for zoom in range(min_zoom, max_zoom + 1):
+            level = grid_clusters(lats, lons, zoom, cell_px)
+            self.levels[zoom] = level
+            if len(level) == len(lats):
+                break
+        self.max_zoom = max(self.levels) if self.levels else min_zoom
+
+    def level(self, zoom: int) -> np.ndarray:
+        return self.levels[min(max(zoom, self.min_zoom), self.max_zoom)]
+
+    def to_payload(self, decimals: int = ClusterConfig.DECIMALS) -> dict[str, Any]:
+        """Forme compacte (JSON) : {zoom: [[lat, lon, effectif, indice], ...]}."""
+        levels = {}
+        for zoom, level in self.levels.items():
+            coords = np.round(level[:, :2], decimals).tolist()
+            meta = level[:, 2:].astype(np.int64).tolist()
+            levels[str(zoom)] = [c + m for c, m in zip(coords, meta)]
+        return {"minZoom": self.min_zoom, "maxZoom": self.max_zoom, "levels": levels}
@@ -0,0 +1,230 @@
+######################################
+# vinos_ibericos/data/connection.py  #
+#                                    #
+# Fournisseur de connexions SQLite   #
+# partagé par tout le processus :    #
+# - Petit pool (threads de travail)  #
+# - Schéma initialisé une fois       #
+# - Fermeture à la sortie            #
+# - Compteurs (connexions, requêtes) #
+######################################
+
+import atexit
+import logging
+import sqlite3
+import threading
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Hashable, Iterator, Optional, Union
+
+
+@dataclass(frozen=True)
+class ConnectionConfig:
+    POOL_SIZE: int = 4  # Connexions inactives conservées (GUI + threads de rendu)
+    MEMORY: str = ":memory:"
+
+
+ConnectionHook = Callable[[sqlite3.Connection], None]
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionProvider:
+    """
+    Connexions réutilisables vers une base SQLite.
+    - acquire()/release() ou 'with provider.connection() as conn'
+    - 'setup' est appliqué à chaque connexion ouverte (PRAGMA), 'initialize' une seule
+      fois par base (schéma) ; une base ':memory:' est propre à chaque connexion
+    - Jamais bloquant : si le pool est vide, une connexion est ouverte ; au-delà de
+      POOL_SIZE connexions inactives, les connexions rendues sont fermées
+    - Une connexion n'est utilisée que par un thread à la fois (check_same_thread=False
+      pour pouvoir passer d'un thread à l'autre via le pool)
+    - Requêtes comptées ('statements') seulement si count_statements=True ou si ce
+      module journalise en DEBUG : sinon aucun trace callback sur les connexions
+    - 'settings' : réglages appliqués par 'setup' (comparés par get_provider)
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        pool_size: int = ConnectionConfig.POOL_SIZE,
+        setup: Optional[ConnectionHook] = None,
+        initialize: Optional[ConnectionHook] = None,
+        count_statements: bool = False,
+        settings: Hashable = None,
+    ) -> None:
+        self.db_path = str(db_path)
+        self.pool_size = pool_size
+        self.count_statements = count_statements
+        self.settings = settings
+        self._setup = setup
+        self._initialize = initialize
+        self._initialized = False
+        self._lock = threading.Lock()
+        # Initialisation (migrations) sérialisée : aucune connexion n'est rendue avant
+        # la fin de celle-ci ; un échec sera retenté à la prochaine ouverture.
+        self._init_lock = threading.Lock()
+        self._idle: list[sqlite3.Connection] = []
+        self._in_use: set[sqlite3.Connection] = set()
+        self._closed = False
+        # Compteurs
+        self.opened = 0
+        self.closed = 0
+        self.reused = 0
+        self.statements = 0
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed
+
+    @property
+    def in_memory(self) -> bool:
+        return self.db_path == ConnectionConfig.MEMORY
+
+    def acquire(self) -> sqlite3.Connection:
+        """Connexion inactive du pool, ou nouvelle connexion."""
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError(f"Fournisseur fermé : {self.db_path}")
+            if self._idle:
+                conn = self._idle.pop()
+                self._in_use.add(conn)
+                self.reused += 1
+                return conn
+        conn = self._open()
+        with self._lock:
+            self._in_use.add(conn)
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Rend une connexion au pool (transaction en cours annulée)."""
+        with self._lock:
+            if conn not in self._in_use:
+                return
+            self._in_use.discard(conn)
+            keep = not self._closed and len(self._idle) < self.pool_size
+            if keep:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.append(conn)
+                return
+        self._close(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Connexion empruntée le temps du bloc : commit en sortie, rollback sur erreur."""
+        conn = self.acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Ferme toutes les connexions (celles encore empruntées aussi)."""
+        with self._lock:
+            self._closed = True
+            conns = self._idle + list(self._in_use)
+            self._idle.clear()
+            self._in_use.clear()
+        for conn in conns:
+            self._close(conn)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "opened": self.opened,
+                "closed": self.closed,
+                "reused": self.reused,
+                "statements": self.statements,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+            }
+
+    def __enter__(self) -> "ConnectionProvider":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _open(self) -> sqlite3.Connection:
+        if not self.in_memory:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        try:
+            if self.count_statements or logger.isEnabledFor(logging.DEBUG):
+                conn.set_trace_callback(self._count_statement)
+            if self._setup:
+                self._setup(conn)
+            if self._initialize:
+                with self._init_lock:
+                    if self.in_memory or not self._initialized:
+                        self._initialize(conn)
+                        self._initialized = True
+        except BaseException:
+            conn.close()  # Jamais rendue : pas de connexion sur un schéma incomplet
+            raise
+        with self._lock:
+            self.opened += 1
+        return conn
+
+    def _close(self, conn: sqlite3.Connection) -> None:
+        conn.close()
+        with self._lock:
+            self.closed += 1
+
+    def _count_statement(self, _sql: str) -> None:
+        self.statements += 1  # Approximation sans verrou (compteur indicatif)
+
+
+# Fournisseurs partagés, un par fichier de base :
+_providers: dict[str, ConnectionProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_provider(
+    db_path: Union[str, Path],
+    setup: Optional[ConnectionHook] = None,
+    initialize: Optional[ConnectionHook] = None,
+    settings: Hashable = None,
+) -> ConnectionProvider:
+    """
+    Fournisseur partagé par tout le processus pour 'db_path' (créé au premier appel).
+    ':memory:' n'est pas partagé : un nouveau fournisseur à chaque appel.
+    - ValueError si le fournisseur ouvert sur ce fichier a d'autres 'settings' (ses
+      connexions ne seraient pas configurées comme demandé)
+    """
+    if str(db_path) == ConnectionConfig.MEMORY:
+        return ConnectionProvider(
+            db_path, setup=setup, initialize=initialize, settings=settings
+        )
+    key = str(Path(db_path).resolve())
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None or provider.is_closed:
+            provider = _providers[key] = ConnectionProvider(
+                key, setup=setup, initialize=initialize, settings=settings
+            )
+        elif provider.settings != settings:
+            raise ValueError(
+                f"Fournisseur déjà ouvert sur {key} avec d'autres réglages : "
+                f"{provider.settings!r} (demandé : {settings!r})"
+            )
+        return provider
+
+
+def close_all() -> None:
+    """Ferme toutes les connexions partagées (sortie de l'application)."""
+    with _providers_lock:
+        providers = list(_providers.values())
+        _providers.clear()
+    for provider in providers:
+        provider.close()
+
+
+atexit.register(close_all)
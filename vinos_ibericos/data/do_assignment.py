@@ -0,0 +1,202 @@
+########################################
+# vinos_ibericos/data/do_assignment.py #
+#                                      #
+# Rattachement géographique des        #
+# bodegas aux DO (point-in-polygon) :  #
+# - Audit de toute la base             #
+# - Vérification d'un point (form.)    #
+########################################
+
+import argparse
+import json
+import time
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from vinos_ibericos.config.general import ConfigPath
+from vinos_ibericos.data.bodega_manager import DEFAULT_DB_PATH, BodegaManager
+from vinos_ibericos.data.vinedo_loader import load_vinedos
+from vinos_ibericos.data.polygon_store import (
+    POLYGON_STORE,
+    PolygonData,
+    PolygonStore,
+    do_slug,
+)
+from vinos_ibericos.exceptions import VinedoJsonError
+
+
+@dataclass(frozen=True)
+class AuditStatus:
+    OK: str = "ok"  # Dans le polygone de sa DO
+    OUTSIDE: str = "hors_do"  # Hors du polygone de sa DO
+    NO_POLYGON: str = "do_sans_polygone"  # DO inconnue ou sans .geojson : non vérifiable
+    NO_COORDS: str = "sans_coordonnees"
+
+
+class AuditRow(NamedTuple):
+    id: int
+    name: str
+    do_name: Optional[str]
+    status: str
+    containing: tuple[str, ...]  # DO dont le polygone contient la bodega
+
+
+def _geojson_name(geojson_file: Path) -> Optional[str]:
+    """Nom porté par le GeoJSON ('name' ou 'nom' du premier feature), s'il existe."""
+    try:
+        with geojson_file.open(encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or not data.get("features"):
+        return None
+    properties = data["features"][0].get("properties") or {}
+    return properties.get("name") or properties.get("nom")
+
+
+def display_names(
+    geojson_dir: Path, json_path: Path = ConfigPath.JSON_FILE_PATH
+) -> dict[str, str]:
+    """
+    slug -> nom affiché de chaque DO ayant un .geojson : nom du vignoble de
+    vinedos.json, à défaut celui des 'properties' du GeoJSON, à défaut le slug.
+    """
+    try:
+        vinedos, _ = load_vinedos(json_path)
+    except VinedoJsonError:
+        vinedos = []
+    known = {do_slug(vinedo.nom): vinedo.nom for vinedo in vinedos}
+    return {
+        path.stem: known.get(path.stem) or _geojson_name(path) or path.stem
+        for path in sorted(geojson_dir.glob("*.geojson"))
+    }
+
+
+class DoAssigner:
+    """
+    Calcule la ou les DO contenant des points (lat, lon), par lots NumPy :
+    préfiltre sur les bornes de chaque DO puis test de parité sur ses anneaux.
+    """
+
+    def __init__(
+        self,
+        do_names: Iterable[str] = (),
+        geojson_dir: Path = ConfigPath.GEOJSON_DIR,
+        store: PolygonStore = POLYGON_STORE,
+    ) -> None:
+        self.geojson_dir = geojson_dir
+        self.store = store
+        names: dict[str, str] = {}
+        for name in do_names:
+            names.setdefault(do_slug(name), name)
+        # Par défaut : toutes les DO ayant un .geojson, noms résolus au premier
+        # 'assign' (inutiles pour 'contains')
+        self._names: Optional[dict[str, str]] = names or None
+
+    @property
+    def names(self) -> dict[str, str]:
+        """slug -> nom affiché des DO testées par 'assign'."""
+        if self._names is None:
+            self._names = display_names(self.geojson_dir)
+        return self._names
+
+    def polygon(self, do_name: str) -> Optional[PolygonData]:
+        return self.store.get(self.geojson_dir / f"{do_slug(do_name)}.geojson")
+
+    def assign(self, lats: np.ndarray, lons: np.ndarray) -> list[list[str]]:
+        """Pour chaque point, la liste des DO dont le polygone le contient."""
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        result: list[list[str]] = [[] for _ in range(len(lats))]
+        for slug, name in self.names.items():
+            polygon_data = self.polygon(slug)
+            if polygon_data is None:
+                continue
+            for index in np.flatnonzero(polygon_data.contains(lats, lons)):
+                result[index].append(name)
+        return result
+
+    def contains(self, do_name: str, lat: float, lon: float) -> Optional[bool]:
+        """
+        Vérification d'un seul point (enregistrement d'un formulaire).
+        None si la DO n'a pas de polygone : la position ne peut pas être vérifiée.
+        """
+        polygon_data = self.polygon(do_name)
+        if polygon_data is None:
+            return None
+        return bool(polygon_data.contains(np.array([lat]), np.array([lon]))[0])
+
+    def audit(self, bodegas: list[dict]) -> list[AuditRow]:
+        """Compare le champ 'do_name' de chaque bodega aux DO qui la contiennent."""
+        located = [
+            b for b in bodegas if b.get("lat") is not None and b.get("lon") is not None
+        ]
+        coords = np.array([(b["lat"], b["lon"]) for b in located], dtype=np.float64)
+        containing = self.assign(coords[:, 0], coords[:, 1]) if located else []
+        by_id = {b["id"]: names for b, names in zip(located, containing)}
+        rows = []
+        for bodega in bodegas:
+            names = by_id.get(bodega["id"])
+            do_name = bodega.get("do_name")
+            if names is None:
+                status = AuditStatus.NO_COORDS
+            elif not do_name or self.polygon(do_name) is None:
+                status = AuditStatus.NO_POLYGON
+            elif any(do_slug(n) == do_slug(do_name) for n in names):
+                status = AuditStatus.OK
+            else:
+                status = AuditStatus.OUTSIDE
+            containing = tuple(names or ())
+            rows.append(AuditRow(bodega["id"], bodega["name"], do_name, status, containing))
+        return rows
+
+
+# Instance partagée (polygones servis par POLYGON_STORE), créée au premier usage :
+_shared_assigner: Optional[DoAssigner] = None
+
+
+def get_do_assigner() -> DoAssigner:
+    """DoAssigner unique de l'application, sur toutes les DO ayant un .geojson."""
+    global _shared_assigner
+    if _shared_assigner is None:
+        _shared_assigner = DoAssigner()
+    return _shared_assigner
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Audit du rattachement des bodegas à leur DO (point-in-polygon)."
+    )
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_PATH)
+    parser.add_argument("--geojson-dir", type=Path, default=ConfigPath.GEOJSON_DIR)
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Afficher aussi les bodegas correctement rattachées",
+    )
+    args = parser.parse_args()
+
+    with BodegaManager(args.db) as manager:
+        bodegas = manager.get_all_bodegas()
+    start = time.perf_counter()
+    rows = DoAssigner(geojson_dir=args.geojson_dir).audit(bodegas)
+    elapsed = time.perf_counter() - start
+    counts: dict[str, int] = {}
+    for row in rows:
+        counts[row.status] = counts.get(row.status, 0) + 1
+        if args.all or row.status != AuditStatus.OK:
+            found = ", ".join(row.containing) or "-"
+            print(
+                f"{row.id:>6}  {row.name:<30} {str(row.do_name):<20} "
+                f"{row.status:<18} {found}"
+            )
+    summary = ", ".join(f"{status} : {n}" for status, n in sorted(counts.items()))
+    print(f"{len(rows)} bodegas auditées en {elapsed * 1000:.1f} ms ({summary})")
+
+
+if __name__ == "__main__":
+    main()
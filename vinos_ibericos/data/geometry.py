@@ -0,0 +1,110 @@
+####################################
+# vinos_ibericos/data/geometry.py  #
+#                                  #
+# Calculs géométriques vectorisés  #
+# (NumPy) sur les polygones des DO #
+# (simplification, point-in-poly)  #
+####################################
+
+from typing import Sequence
+
+import numpy as np
+
+
+# Taille d'une tuile Leaflet/OSM en pixels :
+TILE_SIZE_PX: int = 256
+
+
+def tolerance_for_zoom(zoom: int, pixels: float = 1.0) -> float:
+    """
+    Tolérance de simplification (en degrés) correspondant à 'pixels' écran au zoom donné.
+    Au zoom z, le monde (360°) mesure 256 * 2^z pixels.
+    """
+    return 360.0 / (TILE_SIZE_PX * 2**zoom) * pixels
+
+
+def douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Simplification Douglas–Peucker d'une polyligne/anneau (tableau (N, 2)).
+    - Version itérative (pile) : les distances d'un segment sont calculées en un seul
+      calcul NumPy sur tous les points intermédiaires.
+    - Les extrémités sont toujours conservées (un anneau fermé le reste).
+    """
+    n = len(points)
+    if n < 3 or tolerance <= 0:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a, b = points[start], points[end]
+        inner = points[start + 1 : end]
+        dx, dy = b - a
+        norm = np.hypot(dx, dy)
+        if norm == 0.0:  # Segment dégénéré (anneau fermé) : distance au point
+            dist = np.hypot(inner[:, 0] - a[0], inner[:, 1] - a[1])
+        else:
+            dist = np.abs(dx * (inner[:, 1] - a[1]) - dy * (inner[:, 0] - a[0])) / norm
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return points[keep]
+
+
+def simplify_ring(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Simplifie un anneau fermé sans le réduire en dessous d'un triangle (4 points)."""
+    simplified = douglas_peucker(points, tolerance)
+    return simplified if len(simplified) >= 4 else points
+
+
+# Nombre maximal de tests point/arête calculés en une seule opération NumPy :
+_RAY_CAST_BLOCK: int = 1 << 22
+
+
+def points_in_ring(points: np.ndarray, ring: np.ndarray) -> np.ndarray:
+    """
+    Test de parité (lancer de rayon horizontal) de points (P, 2) dans un anneau (N, 2),
+    en coordonnées (lat, lon) : une matrice points x arêtes par bloc.
+    """
+    inside = np.zeros(len(points), dtype=bool)
+    if len(points) == 0 or len(ring) < 3:
+        return inside
+    lat_a, lon_a = ring[:, 0], ring[:, 1]
+    lat_b, lon_b = np.roll(lat_a, -1), np.roll(lon_a, -1)
+    block = max(1, _RAY_CAST_BLOCK // len(ring))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, len(points), block):
+            lat = points[start : start + block, 0:1]
+            lon = points[start : start + block, 1:2]
+            # Arêtes franchies par le rayon (la borne haute est exclue)
+            crosses = (lat_a > lat) != (lat_b > lat)
+            lon_cross = lon_a + (lat - lat_a) * (lon_b - lon_a) / (lat_b - lat_a)
+            hits = crosses & (lon < lon_cross)
+            inside[start : start + block] = np.count_nonzero(hits, axis=1) % 2 == 1
+    return inside
+
+
+def points_in_rings(
+    points: np.ndarray, vertices: np.ndarray, ring_offsets: Sequence[int]
+) -> np.ndarray:
+    """
+    Appartenance de points (P, 2) à un ensemble d'anneaux (règle pair-impair, comme le
+    remplissage Leaflet) : trous et zones disjointes sont gérés sans distinction.
+    Seuls les points compris dans la boîte englobante d'un anneau sont testés.
+    """
+    inside = np.zeros(len(points), dtype=bool)
+    for start, end in zip(ring_offsets, ring_offsets[1:]):
+        ring = vertices[start:end]
+        if len(ring) < 3:
+            continue
+        low, high = ring.min(axis=0), ring.max(axis=0)
+        candidates = np.flatnonzero(np.all((points >= low) & (points <= high), axis=1))
+        if candidates.size:
+            inside[candidates] ^= points_in_ring(points[candidates], ring)
+    return inside
@@ -0,0 +1,371 @@
+######################################
+# vinos_ibericos/data/migrations.py  #
+#                                    #
+# Schéma versionné de bodegas.db :   #
+# - Version dans PRAGMA user_version #
+# - Migrations ordonnées, appliquées #
+#   en une seule transaction         #
+# - Colonnes ajoutées depuis FIELDS  #
+######################################
+
+import argparse
+import re
+import sqlite3
+
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from vinos_ibericos.data import bodega_fields
+from vinos_ibericos.exceptions import MigrationError
+
+
+TABLE = bodega_fields.TABLE_NAME
+
+# Schéma de la table bodegas (requête SQLite):
+CREATE_BODEGAS_TABLE_SQL = bodega_fields.generate_create_table_sql()
+
+# Index spatial : table virtuelle R*Tree (une boîte réduite à un point par bodega),
+# tenue à jour par des triggers sur la table bodegas.
+RTREE_TABLE = f"{TABLE}_rtree"
+CREATE_BODEGAS_RTREE_SQL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {RTREE_TABLE}
+    USING rtree(id, min_lat, max_lat, min_lon, max_lon);
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_insert
+    AFTER INSERT ON {TABLE}
+    WHEN NEW.lat IS NOT NULL AND NEW.lon IS NOT NULL
+    BEGIN
+        INSERT INTO {RTREE_TABLE} VALUES (NEW.id, NEW.lat, NEW.lat, NEW.lon, NEW.lon);
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_update
+    AFTER UPDATE OF id, lat, lon ON {TABLE}
+    BEGIN
+        DELETE FROM {RTREE_TABLE} WHERE id = OLD.id;
+        INSERT INTO {RTREE_TABLE}
+        SELECT NEW.id, NEW.lat, NEW.lat, NEW.lon, NEW.lon
+        WHERE NEW.lat IS NOT NULL AND NEW.lon IS NOT NULL;
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_delete
+    AFTER DELETE ON {TABLE}
+    BEGIN
+        DELETE FROM {RTREE_TABLE} WHERE id = OLD.id;
+    END;
+    """,
+)
+
+# Index B-tree des filtres courants (et repli de l'index spatial sans R*Tree) :
+CREATE_LAT_LON_INDEX_SQL = (
+    f"CREATE INDEX IF NOT EXISTS {TABLE}_lat_lon_idx ON {TABLE} (lat, lon);"
+)
+CREATE_INDEXES_SQL = (
+    f"CREATE INDEX IF NOT EXISTS {TABLE}_do_name_idx ON {TABLE} (do_name);",
+    f"CREATE INDEX IF NOT EXISTS {TABLE}_town_idx ON {TABLE} (town);",
+    CREATE_LAT_LON_INDEX_SQL,
+)
+
+# Compteur de modifications de la table (une ligne, incrémentée par des triggers) :
+# repère persistant du contenu, inclus dans l'empreinte des cartes (bodegas affichées).
+CHANGES_TABLE = f"{TABLE}_changes"
+CREATE_CHANGE_COUNTER_SQL = (
+    f"""
+    CREATE TABLE IF NOT EXISTS {CHANGES_TABLE} (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        counter INTEGER NOT NULL
+    );
+    """,
+    f"INSERT OR IGNORE INTO {CHANGES_TABLE} (id, counter) VALUES (1, 0);",
+    *(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {CHANGES_TABLE}_{event.lower()}
+        AFTER {event} ON {TABLE}
+        BEGIN
+            UPDATE {CHANGES_TABLE} SET counter = counter + 1 WHERE id = 1;
+        END;
+        """
+        for event in ("INSERT", "UPDATE", "DELETE")
+    ),
+)
+
+
+def has_rtree(conn: sqlite3.Connection) -> bool:
+    """True si l'index spatial R*Tree existe sur cette connexion."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (RTREE_TABLE,)
+    ).fetchone()
+    return row is not None
+
+
+# ========================
+# Étapes (sans commit)
+# ========================
+
+
+def _create_table(conn: sqlite3.Connection) -> None:
+    conn.execute(CREATE_BODEGAS_TABLE_SQL)
+
+
+def _create_rtree(conn: sqlite3.Connection) -> None:
+    """
+    Index R*Tree et triggers, alimenté avec les bodegas déjà présentes.
+    Sans module R*Tree : index (lat, lon).
+    """
+    created = not has_rtree(conn)
+    try:
+        for statement in CREATE_BODEGAS_RTREE_SQL:
+            conn.execute(statement)
+    except sqlite3.OperationalError:  # "no such module: rtree"
+        conn.execute(CREATE_LAT_LON_INDEX_SQL)
+        return
+    if created:
+        conn.execute(
+            f"""
+            INSERT INTO {RTREE_TABLE}
+            SELECT id, lat, lat, lon, lon FROM {TABLE}
+            WHERE lat IS NOT NULL AND lon IS NOT NULL
+            """
+        )
+
+
+def _create_indexes(conn: sqlite3.Connection) -> None:
+    for statement in CREATE_INDEXES_SQL:
+        conn.execute(statement)
+
+
+def _create_change_counter(conn: sqlite3.Connection) -> None:
+    for statement in CREATE_CHANGE_COUNTER_SQL:
+        conn.execute(statement)
+
+
+def change_counter(conn: sqlite3.Connection) -> Optional[int]:
+    """Nombre de modifications de la table depuis la migration 5 (None si absent)."""
+    try:
+        row = conn.execute(f"SELECT counter FROM {CHANGES_TABLE} WHERE id = 1").fetchone()
+    except sqlite3.OperationalError:  # Base non migrée
+        return None
+    return row[0] if row else None
+
+
+def column_types(conn: sqlite3.Connection) -> dict[str, str]:
+    """Type déclaré de chaque colonne de la table."""
+    rows = conn.execute(f"PRAGMA table_info({TABLE})")
+    return {row[1]: row[2].upper() for row in rows}
+
+
+# Texte convertible sans perte par CAST (sinon SQLite donne 0 ou un préfixe) :
+NUMERIC_PATTERNS = {
+    "INTEGER": re.compile(r"[+-]?[0-9]+"),
+    "REAL": re.compile(r"[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?"),
+}
+
+
+class InvalidValue(NamedTuple):
+    id: int
+    column: str
+    value: str
+
+    def __str__(self) -> str:
+        return f"bodega {self.id} : '{self.column}' = {self.value!r}"
+
+
+def _invalid_values(
+    conn: sqlite3.Connection, columns: dict[str, str]
+) -> list[InvalidValue]:
+    """Textes non numériques (ou vides) des colonnes à convertir (clé -> type SQL)."""
+    invalid = []
+    for key, typ in columns.items():
+        rows = conn.execute(
+            f"SELECT id, {key} FROM {TABLE} WHERE typeof({key}) = 'text'"
+        )
+        for id_, value in rows:
+            text = value.strip()
+            if text:
+                valid = NUMERIC_PATTERNS[typ].fullmatch(text) is not None
+            else:  # Vide => NULL, refusé par NOT NULL
+                valid = key not in bodega_fields.REQUIRED_KEYS
+            if not valid:
+                invalid.append(InvalidValue(id_, key, value))
+    return invalid
+
+
+def _fix_column_types(conn: sqlite3.Connection) -> list[InvalidValue]:
+    """
+    Réécrit la table avec les types de FIELDS (INTEGER/REAL au lieu de TEXT) :
+    nouvelle table, copie avec conversion, remplacement, puis index, triggers et
+    R*Tree reconstruits. Rien à faire si les types sont déjà corrects.
+    - Valeurs non convertibles d'un champ facultatif : remplacées par NULL et
+      retournées (rapport de migration)
+    - Champ obligatoire non convertible ou vide : MigrationError, rien n'est modifié
+    """
+    current = column_types(conn)
+    expected = {
+        key: bodega_fields.sql_type(typ) for key, _, _, typ in bodega_fields.FIELDS
+    }
+    if all(current.get(key, typ) == typ for key, typ in expected.items()):
+        return []
+    numeric = {
+        key: typ for key, typ in expected.items() if key in current and typ != "TEXT"
+    }
+    invalid = _invalid_values(conn, numeric)
+    blocking = [v for v in invalid if v.column in bodega_fields.REQUIRED_KEYS]
+    if blocking:
+        raise MigrationError(
+            "Conversion des colonnes numériques impossible, valeurs à corriger : "
+            + ", ".join(map(str, blocking))
+        )
+    new_table = f"{TABLE}_typed"
+    conn.execute(f"DROP TABLE IF EXISTS {new_table}")
+    conn.execute(bodega_fields.generate_create_table_sql(new_table))
+    columns = ["id"] + [key for key in expected if key in current]
+    values = ["id"] + [
+        # Texte vide => NULL ; sinon conversion vers le type attendu
+        f"CAST(NULLIF(TRIM({key}), '') AS {expected[key]})"
+        if expected[key] != "TEXT"
+        else key
+        for key in columns[1:]
+    ]
+    conn.execute(
+        f"INSERT INTO {new_table} ({', '.join(columns)}) "
+        f"SELECT {', '.join(values)} FROM {TABLE}"
+    )
+    for value in invalid:  # CAST a donné 0 ou un préfixe : valeur inconnue
+        conn.execute(
+            f"UPDATE {new_table} SET {value.column} = NULL WHERE id = ?", (value.id,)
+        )
+    conn.execute(f"DROP TABLE {TABLE}")  # Supprime aussi ses index et triggers
+    conn.execute(f"ALTER TABLE {new_table} RENAME TO {TABLE}")
+    conn.execute(f"DROP TABLE IF EXISTS {RTREE_TABLE}")  # Réalimenté depuis la table
+    _create_rtree(conn)
+    _create_indexes(conn)
+    if change_counter(conn) is not None:  # Triggers supprimés avec l'ancienne table
+        _create_change_counter(conn)
+    return invalid
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    # Retourne éventuellement les valeurs écartées (reprises dans le rapport) :
+    apply: Callable[[sqlite3.Connection], Optional[list[InvalidValue]]]
+
+
+# Ordre d'application ; ne jamais modifier une migration publiée, en ajouter une.
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "Table bodegas", _create_table),
+    Migration(2, "Index spatial R*Tree", _create_rtree),
+    Migration(3, "Index sur do_name, town et (lat, lon)", _create_indexes),
+    Migration(4, "Types INTEGER/REAL des colonnes numériques", _fix_column_types),
+    Migration(5, "Compteur de modifications des bodegas", _create_change_counter),
+)
+LATEST_VERSION: int = MIGRATIONS[-1].version
+
+
+class MigrationReport(NamedTuple):
+    from_version: int
+    to_version: int
+    applied: list[str]
+    added_columns: list[str]
+    invalid_values: list[InvalidValue]  # Remplacées par NULL
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def missing_columns(conn: sqlite3.Connection) -> list[str]:
+    """Champs de FIELDS absents de la table (table absente => tous)."""
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({TABLE})")}
+    return [key for key, *_ in bodega_fields.FIELDS if key not in existing]
+
+
+def _add_missing_columns(conn: sqlite3.Connection) -> list[str]:
+    """
+    Ajoute les colonnes de FIELDS absentes de la table.
+    SQLite n'accepte pas NOT NULL sans valeur par défaut : colonnes ajoutées nullables.
+    """
+    missing = missing_columns(conn)
+    types = {key: typ for key, _, _, typ in bodega_fields.FIELDS}
+    for key in missing:
+        definition = bodega_fields.column_definition(key, types[key])
+        conn.execute(f"ALTER TABLE {TABLE} ADD COLUMN {definition}")
+    return missing
+
+
+def migrate(
+    conn: sqlite3.Connection, migrations: tuple[Migration, ...] = MIGRATIONS
+) -> MigrationReport:
+    """
+    Met la base à jour (idempotent) :
+    - base à jour => deux lectures (user_version, table_info), aucune écriture
+    - sinon une seule transaction (BEGIN IMMEDIATE) : migrations en attente, colonnes
+      manquantes, nouvelle user_version ; tout ou rien
+    - MigrationError si des données empêchent une migration (base inchangée)
+    """
+    version = schema_version(conn)
+    latest = migrations[-1].version if migrations else 0
+    if version >= latest and not missing_columns(conn):
+        return MigrationReport(version, version, [], [], [])
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")  # Verrou d'écriture : un seul processus migre
+    try:
+        version = schema_version(conn)  # Relue sous verrou
+        applied = []
+        invalid = []
+        for migration in migrations:
+            if migration.version > version:
+                invalid += migration.apply(conn) or []
+                applied.append(f"{migration.version}: {migration.description}")
+        added = _add_missing_columns(conn)
+        new_version = max(version, latest)
+        conn.execute(f"PRAGMA user_version = {new_version}")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return MigrationReport(version, new_version, applied, added, invalid)
+
+
+# Fonctions historiques (création hors migration, avec commit) :
+
+
+def create_bodegas_table(conn: sqlite3.Connection) -> None:
+    """Crée la table `bodegas` si n'existe pas."""
+    _create_table(conn)
+    conn.commit()
+
+
+def create_spatial_index(conn: sqlite3.Connection) -> None:
+    """
+    Crée l'index spatial R*Tree et ses triggers, puis l'alimente avec les bodegas
+    déjà présentes (base créée avant l'index). Sans module R*Tree : index (lat, lon).
+    """
+    _create_rtree(conn)
+    conn.commit()
+
+
+def main() -> None:
+    from vinos_ibericos.data.bodega_manager import DEFAULT_DB_PATH
+
+    parser = argparse.ArgumentParser(description="Migrations du schéma de bodegas.db.")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_PATH)
+    args = parser.parse_args()
+    conn = sqlite3.connect(args.db)
+    report = migrate(conn)
+    conn.close()
+    print(f"Version du schéma : {report.from_version} -> {report.to_version}")
+    for line in report.applied:
+        print(f"  migration {line}")
+    if report.added_columns:
+        print(f"  colonnes ajoutées : {', '.join(report.added_columns)}")
+    for value in report.invalid_values:
+        print(f"  valeur non numérique remplacée par NULL : {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+#########################################
+# vinos_ibericos/data/polygon_store.py  #
+#                                       #
+# Stockage des polygones des DO :       #
+# - Lecture unique des .geojson         #
+# - Coordonnées (lat, lon) compactes    #
+# - Cache binaire persistant sur disque #
+# - Niveaux simplifiés selon le zoom    #
+#########################################
+
+import os
+import struct
+import sys
+
+from array import array
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from json import dumps, load, JSONDecodeError
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from vinos_ibericos.config.general import ConfigPath
+from vinos_ibericos.data.geometry import (
+    points_in_rings,
+    simplify_ring,
+    tolerance_for_zoom,
+)
+
+
+# En-tête du cache binaire :
+# magic, version, mtime_ns, taille, nb de valeurs, nb d'anneaux, nb de polygones, bornes
+_HEADER = struct.Struct("<4sHqqIII4d")
+_MAGIC = b"VIPG"
+_VERSION = 2
+_KEY_LENGTH = 16  # Caractères hexadécimaux de la clé (chemin) dans le nom du cache
+
+
+@dataclass(frozen=True)
+class PolygonConfig:
+    CACHE_DIR: Path = ConfigPath.CACHE_DIR / "geojson"
+    SUFFIX: str = ".polycache"
+    # Zooms pour lesquels les versions simplifiées sont précalculées (cf. MapConfig) :
+    SIMPLIFY_ZOOMS: tuple[int, ...] = (7, 10)
+    # Écart maximal toléré entre le tracé simplifié et l'original, en pixels écran :
+    SIMPLIFY_TOLERANCE_PX: float = 1.0
+
+
+@dataclass(frozen=True)
+class PolygonData:
+    """
+    Géométrie complète d'une DO (Polygon/MultiPolygon, trous, plusieurs features).
+    - coords : tableau plat [lat0, lon0, lat1, lon1, ...] (doubles), tous anneaux confondus
+    - ring_offsets : indice (en points) du début de chaque anneau, + fin
+    - polygon_offsets : indice (en anneaux) du début de chaque polygone, + fin
+      (le premier anneau d'un polygone est l'extérieur, les suivants ses trous)
+    - bounds : (min_lat, min_lon, max_lat, max_lon) de l'ensemble
+    """
+
+    coords: array
+    bounds: tuple[float, float, float, float]
+    ring_offsets: array = field(default_factory=lambda: array("I", [0]))
+    polygon_offsets: array = field(default_factory=lambda: array("I", [0]))
+    # Versions simplifiées, par zoom (calculées une seule fois) :
+    _levels: dict[int, "PolygonData"] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+    def __len__(self) -> int:
+        return len(self.coords) // 2
+
+    @property
+    def ring_count(self) -> int:
+        return len(self.ring_offsets) - 1
+
+    @property
+    def polygon_count(self) -> int:
+        return len(self.polygon_offsets) - 1
+
+    def rings(self) -> list[list[list[float]]]:
+        """Liste des anneaux, chacun au format [[lat, lon], ...]."""
+        rings = []
+        for start, end in zip(self.ring_offsets, self.ring_offsets[1:]):
+            it = iter(self.coords[2 * start : 2 * end])
+            rings.append([[lat, lon] for lat, lon in zip(it, it)])
+        return rings
+
+    def locations(self) -> list:
+        """
+        Coordonnées pour un unique folium.Polygon :
+        - un seul anneau => [[lat, lon], ...]
+        - sinon => liste d'anneaux ; la règle de remplissage 'evenodd' de Leaflet
+          dessine alors les zones disjointes comme les enclaves en une seule couche.
+        """
+        rings = self.rings()
+        return rings[0] if len(rings) == 1 else rings
+
+    def simplified(self, zoom: int) -> "PolygonData":
+        """Version simplifiée adaptée au zoom (tolérance ~ PolygonConfig.SIMPLIFY_TOLERANCE_PX)."""
+        level = self._levels.get(zoom)
+        if level is None:
+            points = np.frombuffer(self.coords, dtype=np.float64).reshape(-1, 2)
+            tolerance = tolerance_for_zoom(zoom, PolygonConfig.SIMPLIFY_TOLERANCE_PX)
+            kept_rings = [
+                simplify_ring(points[start:end], tolerance)
+                for start, end in zip(self.ring_offsets, self.ring_offsets[1:])
+            ]
+            if sum(map(len, kept_rings)) == len(points):
+                level = self
+            else:
+                ring_offsets = array("I", [0])
+                for ring in kept_rings:
+                    ring_offsets.append(ring_offsets[-1] + len(ring))
+                level = PolygonData(
+                    array("d", np.concatenate(kept_rings).ravel().tolist()),
+                    self.bounds,
+                    ring_offsets,
+                    self.polygon_offsets,
+                )
+            self._levels[zoom] = level
+        return level
+
+    def contains(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Masque des points (lat, lon) situés dans la DO (préfiltre sur les bornes)."""
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        min_lat, min_lon, max_lat, max_lon = self.bounds
+        mask = (lats >= min_lat) & (lats <= max_lat) & (lons >= min_lon) & (lons <= max_lon)
+        candidates = np.flatnonzero(mask)
+        if candidates.size:
+            points = np.column_stack([lats[candidates], lons[candidates]])
+            vertices = np.frombuffer(self.coords, dtype=np.float64).reshape(-1, 2)
+            mask[candidates] = points_in_rings(points, vertices, self.ring_offsets)
+        return mask
+
+    def bounds_list(self) -> list[list[float]]:
+        """Bornes au format 'fit_bounds' : [[sud, ouest], [nord, est]]."""
+        min_lat, min_lon, max_lat, max_lon = self.bounds
+        return [[min_lat, min_lon], [max_lat, max_lon]]
+
+
+class _GeometryCollector:
+    """
+    'object_hook' de json.load : chaque géométrie (Polygon/MultiPolygon) est convertie
+    dès sa lecture dans les tableaux compacts, puis remplacée par un marqueur.
+    Un seul passage sur le fichier, quels que soient le nombre de features et d'anneaux,
+    et les listes Python intermédiaires de chaque géométrie sont aussitôt libérées.
+    """
+
+    def __init__(self) -> None:
+        self.coords: array = array("d")
+        self.ring_offsets: array = array("I", [0])
+        self.polygon_offsets: array = array("I", [0])
+
+    def __call__(self, obj: dict) -> Any:
+        geom_type, coordinates = obj.get("type"), obj.get("coordinates")
+        if not isinstance(coordinates, list):  # ex. 'properties' avec une clé "type"
+            return obj
+        if geom_type == "Polygon":
+            self._add_polygon(coordinates)
+        elif geom_type == "MultiPolygon":
+            for polygon in coordinates:
+                self._add_polygon(polygon)
+        else:
+            return obj
+        return geom_type  # Marqueur léger à la place de la géométrie
+
+    def _add_polygon(self, rings: list) -> None:
+        for ring in rings:
+            for position in ring:  # [lon, lat] ou [lon, lat, altitude]
+                self.coords.append(position[1])
+                self.coords.append(position[0])
+            self.ring_offsets.append(len(self.coords) // 2)
+        self.polygon_offsets.append(len(self.ring_offsets) - 1)
+
+    def result(self) -> Optional[PolygonData]:
+        if not self.coords:
+            return None
+        lats, lons = self.coords[0::2], self.coords[1::2]
+        return PolygonData(
+            self.coords,
+            (min(lats), min(lons), max(lats), max(lons)),
+            self.ring_offsets,
+            self.polygon_offsets,
+        )
+
+
+def do_slug(name: str) -> str:
+    """Nom de fichier d'une DO : 'Ribera del Duero' -> 'ribera_del_duero'."""
+    return name.lower().replace(" ", "_")
+
+
+class PolygonStore:
+    """
+    Fournit les polygones des DO à partir des fichiers .geojson.
+    - Mémoire : un polygone par fichier, revalidé par (mtime, taille)
+    - Disque : cache binaire par fichier (chemin + mtime + taille), sans JSON à relire ;
+      un seul cache par nom de DO (les anciens sont supprimés à l'écriture)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = PolygonConfig.CACHE_DIR,
+        zoom_levels: tuple[int, ...] = PolygonConfig.SIMPLIFY_ZOOMS,
+    ) -> None:
+        self.cache_dir: Optional[Path] = cache_dir  # None => pas de persistance
+        self.zoom_levels: tuple[int, ...] = zoom_levels
+        self._memory: dict[Path, tuple[tuple[int, int], Optional[PolygonData]]] = {}
+        # Compteurs :
+        self.memory_hits: int = 0
+        self.disk_hits: int = 0
+        self.parses: int = 0
+
+    def get(self, geojson_file: Path) -> Optional[PolygonData]:
+        """Retourne le polygone du fichier, ou None si absent/inexploitable."""
+        try:
+            stat = geojson_file.stat()
+        except OSError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._memory.get(geojson_file)
+        if cached is not None and cached[0] == signature:
+            self.memory_hits += 1
+            return cached[1]
+        polygon = self._read_sidecar(geojson_file, signature)
+        if polygon is not None:
+            self.disk_hits += 1
+        else:
+            polygon = self._parse_geojson(geojson_file)
+            self.parses += 1
+            if polygon is not None:
+                self._write_sidecar(geojson_file, signature, polygon)
+        if polygon is not None:
+            for zoom in self.zoom_levels:  # Précalcul des niveaux simplifiés
+                polygon.simplified(zoom)
+        self._memory[geojson_file] = (signature, polygon)
+        return polygon
+
+    def invalidate(self, geojson_file: Optional[Path] = None) -> None:
+        """Oublie une entrée (ou toutes) du cache mémoire ; le disque est revalidé par mtime."""
+        if geojson_file is None:
+            self._memory.clear()
+        else:
+            self._memory.pop(geojson_file, None)
+
+    def _sidecar_path(self, geojson_file: Path) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        key = blake2b(
+            str(geojson_file.resolve()).encode("utf-8"), digest_size=_KEY_LENGTH // 2
+        ).hexdigest()
+        return self.cache_dir / f"{geojson_file.stem}-{key}{PolygonConfig.SUFFIX}"
+
+    def _read_sidecar(
+        self, geojson_file: Path, signature: tuple[int, int]
+    ) -> Optional[PolygonData]:
+        """Lit le cache binaire s'il correspond encore au fichier source."""
+        sidecar = self._sidecar_path(geojson_file)
+        if sidecar is None:
+            return None
+        try:
+            raw = sidecar.read_bytes()
+            (magic, version, mtime_ns, size, n_values, n_rings, n_polygons, *bounds) = (
+                _HEADER.unpack_from(raw)
+            )
+        except (OSError, struct.error):
+            return None
+        if (magic, version, (mtime_ns, size)) != (_MAGIC, _VERSION, signature):
+            return None
+        offset = _HEADER.size
+        arrays = []
+        for typecode, count in (("d", n_values), ("I", n_rings + 1), ("I", n_polygons + 1)):
+            values = array(typecode)
+            values.frombytes(raw[offset : offset + count * values.itemsize])
+            if len(values) != count:
+                return None
+            if sys.byteorder == "big":
+                values.byteswap()
+            arrays.append(values)
+            offset += count * values.itemsize
+        coords, ring_offsets, polygon_offsets = arrays
+        return PolygonData(coords, tuple(bounds), ring_offsets, polygon_offsets)  # type: ignore
+
+    def _write_sidecar(
+        self, geojson_file: Path, signature: tuple[int, int], polygon: PolygonData
+    ) -> None:
+        """Écrit le cache binaire (écriture atomique, échec silencieux : simple cache)."""
+        sidecar = self._sidecar_path(geojson_file)
+        if sidecar is None:
+            return
+        payload = [_HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            *signature,
+            len(polygon.coords),
+            polygon.ring_count,
+            polygon.polygon_count,
+            *polygon.bounds,
+        )]
+        for values in (polygon.coords, polygon.ring_offsets, polygon.polygon_offsets):
+            values = array(values.typecode, values)
+            if sys.byteorder == "big":
+                values.byteswap()
+            payload.append(values.tobytes())
+        tmp = sidecar.with_suffix(".tmp")
+        try:
+            sidecar.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(b"".join(payload))
+            os.replace(tmp, sidecar)
+        except OSError:
+            return
+        self._prune_sidecars(geojson_file, sidecar)
+
+    def _prune_sidecars(self, geojson_file: Path, keep: Path) -> None:
+        """
+        Supprime les autres caches du même nom de DO (fichier déplacé, répertoire
+        temporaire...) : sans cela, le répertoire de cache ne ferait que grossir.
+        """
+        prefix = f"{geojson_file.stem}-"
+        for path in keep.parent.glob(f"{prefix}*{PolygonConfig.SUFFIX}"):
+            key = path.name[len(prefix) : -len(PolygonConfig.SUFFIX)]
+            if path == keep or len(key) != _KEY_LENGTH or "-" in key:
+                continue  # Autre DO dont le nom commence par le même préfixe
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _parse_geojson(geojson_file: Path) -> Optional[PolygonData]:
+        """Toutes les géométries du fichier, (lon, lat) -> (lat, lon), en un seul passage."""
+        collector = _GeometryCollector()
+        try:
+            with open(geojson_file, "r", encoding="utf-8") as f:
+                load(f, object_hook=collector)
+        except (OSError, JSONDecodeError, KeyError, IndexError, TypeError, ValueError):
+            return None
+        return collector.result()
+
+
+def simplification_report(
+    geojson_dir: Path, zooms: tuple[int, ...] = PolygonConfig.SIMPLIFY_ZOOMS
+) -> list[dict]:
+    """
+    Rapport par DO : nombre de sommets et octets (JSON envoyé à Leaflet) à chaque zoom.
+    """
+    store = PolygonStore(cache_dir=None, zoom_levels=())
+    report = []
+    for geojson_file in sorted(geojson_dir.glob("*.geojson")):
+        polygon = store.get(geojson_file)
+        if polygon is None:
+            continue
+        full_bytes = len(dumps(polygon.locations()))
+        row = {"do": geojson_file.stem, "vertices": len(polygon), "bytes": full_bytes}
+        for zoom in zooms:
+            level = polygon.simplified(zoom)
+            level_bytes = len(dumps(level.locations()))
+            row[f"z{zoom}_vertices"] = len(level)
+            row[f"z{zoom}_saved_bytes"] = full_bytes - level_bytes
+        report.append(row)
+    return report
+
+
+# Instance partagée par l'application :
+POLYGON_STORE = PolygonStore()
+
+
+if __name__ == "__main__":
+    from vinos_ibericos.config.general import ConfigPath
+
+    for row in simplification_report(ConfigPath.GEOJSON_DIR):
+        levels = ", ".join(
+            f"z{zoom}: {row[f'z{zoom}_vertices']} sommets (-{row[f'z{zoom}_saved_bytes']} o)"
+            for zoom in PolygonConfig.SIMPLIFY_ZOOMS
+        )
+        print(f"{row['do']:<20} {row['vertices']:>6} sommets, {row['bytes']:>7} o | {levels}")
@@ -0,0 +1,217 @@
+#########################################
+# vinos_ibericos/data/tile_store.py     #
+#                                       #
+# Cache local des tuiles de la carte :  #
+# - Stockage MBTiles (SQLite)           #
+# - Téléchargement / préchargement      #
+# - Statistiques hits/misses            #
+#########################################
+
+import argparse
+import math
+import sqlite3
+import threading
+import time
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Union
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+from vinos_ibericos.config.general import ConfigPath
+
+
+@dataclass(frozen=True)
+class TileConfig:
+    DB_PATH: Path = ConfigPath.CACHE_DIR / "tiles.mbtiles"
+    UPSTREAM_URL: str = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+    # Schéma d'URL servi par le cache local dans QWebEngineView (cf. ui/tile_scheme.py) :
+    SCHEME: str = "vinostiles"
+    LOCAL_URL: str = "vinostiles://tile/{z}/{x}/{y}.png"
+    USER_AGENT: str = "VinosIbericos/2 (offline tile cache)"
+    ATTRIBUTION: str = "&copy; OpenStreetMap contributors"
+    TIMEOUT_S: float = 10.0
+    # Boîte englobante de l'Espagne péninsulaire + Baléares : (sud, ouest, nord, est)
+    SPAIN_BOUNDS: tuple[float, float, float, float] = (35.9, -9.6, 43.9, 4.4)
+    # Demi-étendue (degrés) autour d'un vignoble sans .geojson (≈ écran au zoom de focus)
+    FOCUS_HALF_EXTENT: tuple[float, float] = (0.35, 0.6)
+
+
+def tile_xy(lat: float, lon: float, zoom: int) -> tuple[int, int]:
+    """Tuile (x, y) 'slippy map' contenant le point au zoom donné."""
+    n = 2**zoom
+    lat_rad = math.radians(max(min(lat, 85.0511), -85.0511))
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_for_bounds(
+    bounds: tuple[float, float, float, float], zoom: int
+) -> Iterator[tuple[int, int, int]]:
+    """Toutes les tuiles (z, x, y) couvrant la boîte (sud, ouest, nord, est)."""
+    south, west, north, east = bounds
+    x_min, y_min = tile_xy(north, west, zoom)
+    x_max, y_max = tile_xy(south, east, zoom)
+    for x in range(x_min, x_max + 1):
+        for y in range(y_min, y_max + 1):
+            yield zoom, x, y
+
+
+class TileStore:
+    """
+    Tuiles PNG stockées au format MBTiles (une base SQLite).
+    - Rangée MBTiles en convention TMS (y inversé) par rapport aux URL 'slippy map'
+    - Utilisable depuis plusieurs threads (verrou + connexion partagée)
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None) -> None:
+        self.db_path: Path = Path(db_path) if db_path else TileConfig.DB_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS tiles (
+                zoom_level INTEGER,
+                tile_column INTEGER,
+                tile_row INTEGER,
+                tile_data BLOB,
+                PRIMARY KEY (zoom_level, tile_column, tile_row)
+            );
+            INSERT OR IGNORE INTO metadata VALUES ('name', 'vinos_ibericos');
+            INSERT OR IGNORE INTO metadata VALUES ('format', 'png');
+            """
+        )
+        self.conn.commit()
+        # Compteurs :
+        self.hits: int = 0
+        self.misses: int = 0
+        self.downloads: int = 0
+
+    def get(self, z: int, x: int, y: int) -> Optional[bytes]:
+        """Tuile en cache, ou None (compte un hit ou un miss)."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT tile_data FROM tiles"
+                " WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                (z, x, (2**z - 1) - y),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def has(self, z: int, x: int, y: int) -> bool:
+        with self._lock:
+            return (
+                self.conn.execute(
+                    "SELECT 1 FROM tiles"
+                    " WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                    (z, x, (2**z - 1) - y),
+                ).fetchone()
+                is not None
+            )
+
+    def put(self, z: int, x: int, y: int, data: bytes) -> None:
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)",
+                (z, x, (2**z - 1) - y, data),
+            )
+            self.conn.commit()
+
+    def fetch(self, z: int, x: int, y: int) -> Optional[bytes]:
+        """Télécharge une tuile depuis le serveur amont et la met en cache (None si échec)."""
+        url = TileConfig.UPSTREAM_URL.format(z=z, x=x, y=y)
+        request = Request(url, headers={"User-Agent": TileConfig.USER_AGENT})
+        try:
+            with urlopen(request, timeout=TileConfig.TIMEOUT_S) as response:
+                data = response.read()
+        except (URLError, OSError):
+            return None
+        self.put(z, x, y, data)
+        self.downloads += 1
+        return data
+
+    def prefetch(
+        self, regions: list[tuple[tuple[float, float, float, float], int]]
+    ) -> tuple[int, int]:
+        """
+        Précharge les tuiles de chaque (boîte, zoom) absentes du cache.
+        Retourne (tuiles téléchargées, tuiles en échec).
+        """
+        fetched = failed = 0
+        for bounds, zoom in regions:
+            for z, x, y in tiles_for_bounds(bounds, zoom):
+                if self.has(z, x, y):
+                    continue
+                if self.fetch(z, x, y) is None:
+                    failed += 1
+                else:
+                    fetched += 1
+        return fetched, failed
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM tiles").fetchone()[0]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "tiles": self.count(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "downloads": self.downloads,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+def default_regions() -> list[tuple[tuple[float, float, float, float], int]]:
+    """Espagne au zoom initial + la boîte de chaque DO au zoom de focus."""
+    from vinos_ibericos.map_manager import MapConfig, MapManager
+    from vinos_ibericos.utils import CheckVinedoJson
+
+    loader = CheckVinedoJson()
+    loader.load()
+    manager = MapManager(loader.data, bundle_dir=None)
+    regions = [(TileConfig.SPAIN_BOUNDS, MapConfig.INIT_ZOOM)]
+    half_lat, half_lon = TileConfig.FOCUS_HALF_EXTENT
+    for vinedo in loader.data:
+        polygon_data = manager._polygon_data(vinedo.nom)
+        if polygon_data is not None:
+            bounds = polygon_data.bounds
+        else:
+            lat, lon = vinedo.coords
+            bounds = (lat - half_lat, lon - half_lon, lat + half_lat, lon + half_lon)
+        regions.append((bounds, MapConfig.FOCUS_ZOOM))
+    return regions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Cache local des tuiles OpenStreetMap (MBTiles)."
+    )
+    parser.add_argument("command", choices=("prefetch", "stats"))
+    parser.add_argument("--db", type=Path, default=TileConfig.DB_PATH)
+    args = parser.parse_args()
+    store = TileStore(args.db)
+    if args.command == "prefetch":
+        regions = default_regions()
+        total = sum(len(list(tiles_for_bounds(b, z))) for b, z in regions)
+        print(f"{total} tuiles à couvrir ({len(regions)} zones)...")
+        start = time.perf_counter()
+        fetched, failed = store.prefetch(regions)
+        elapsed = time.perf_counter() - start
+        print(f"{fetched} téléchargées, {failed} en échec en {elapsed:.1f} s")
+    print(store.stats())
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
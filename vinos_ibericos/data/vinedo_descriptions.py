@@ -0,0 +1,99 @@
+##############################################
+# vinos_ibericos/data/vinedo_descriptions.py #
+#                                            #
+# Descriptions HTML des vignobles lues à la  #
+# demande dans vinedos.json :                #
+# - Position de l'entrée gardée par Vinedo   #
+# - Petit cache LRU des dernières lues       #
+##############################################
+
+import codecs
+import json
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from vinos_ibericos.data.vinedo_loader import LoaderConfig
+from vinos_ibericos.datatypes import Vinedo
+
+
+@dataclass(frozen=True)
+class DescriptionConfig:
+    CACHE_SIZE: int = 16  # Descriptions gardées en mémoire
+    READ_SIZE: int = 16 * 1024  # Premier bloc lu à la position de l'entrée
+
+
+_DECODER = json.JSONDecoder()
+
+
+class DescriptionStore:
+    """
+    Fournit la description d'un Vinedo :
+    - résidente (offset < 0) => retournée telle quelle
+    - sinon lue à la position de l'entrée dans le fichier source, puis gardée dans un
+      cache LRU borné ; "" si le fichier a changé depuis le chargement (entrée
+      différente à cette position) ou n'est plus lisible
+    """
+
+    def __init__(
+        self, source: Path, maxsize: int = DescriptionConfig.CACHE_SIZE
+    ) -> None:
+        self.source: Path = source
+        self.maxsize: int = maxsize
+        self._entries: OrderedDict[tuple[int, str], str] = OrderedDict()
+        # Compteurs :
+        self.hits: int = 0
+        self.reads: int = 0
+
+    def get(self, vinedo: Vinedo) -> str:
+        if not vinedo.lazy:
+            return vinedo.description
+        key = (vinedo.offset, vinedo.nom)
+        description = self._entries.get(key)
+        if description is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return description
+        description = self._read(vinedo)
+        self.reads += 1
+        if self.maxsize > 0:
+            self._entries[key] = description
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return description
+
+    def invalidate(self) -> None:
+        """Oublie les descriptions en cache (fichier source rechargé)."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _read(self, vinedo: Vinedo) -> str:
+        """Décode la seule entrée située à 'vinedo.offset' (blocs de taille croissante)."""
+        decoder = codecs.getincrementaldecoder(LoaderConfig.ENCODING)()
+        text = ""
+        size = DescriptionConfig.READ_SIZE
+        try:
+            with self.source.open("rb") as f:
+                f.seek(vinedo.offset)
+                while True:
+                    chunk = f.read(size)
+                    text += decoder.decode(chunk, final=not chunk)
+                    try:
+                        item, _ = _DECODER.raw_decode(text)
+                        break
+                    except json.JSONDecodeError:
+                        if not chunk:
+                            return ""
+                        size *= 2
+        except (OSError, UnicodeDecodeError):
+            return ""
+        if (
+            isinstance(item, dict)
+            and item.get("nom") == vinedo.nom
+            and isinstance(item.get("description"), str)
+        ):
+            return item["description"]
+        return ""
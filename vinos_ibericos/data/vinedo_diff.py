@@ -0,0 +1,61 @@
+#######################################
+# vinos_ibericos/data/vinedo_diff.py  #
+#                                     #
+# Différences entre deux chargements  #
+# de vinedos.json (rechargement à     #
+# chaud) : vignobles ajoutés, retirés #
+# et modifiés, clé = nom              #
+#######################################
+
+from typing import Iterable, NamedTuple
+
+from vinos_ibericos.datatypes import Vinedo
+
+
+class VinedoDiff(NamedTuple):
+    added: list[Vinedo]
+    removed: list[str]  # Noms
+    changed: list[Vinedo]  # Coordonnées, image ou description modifiées
+    # Contenu identique mais entrée déplacée dans le fichier (description lue à la
+    # demande à une autre position) :
+    relocated: list[Vinedo]
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.changed or self.relocated)
+
+    @property
+    def affected(self) -> set[str]:
+        """Noms dont la vue carte n'est plus à jour (ajoutés, retirés, modifiés)."""
+        return {v.nom for v in (*self.added, *self.changed)} | set(self.removed)
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.added)} ajouté(s), {len(self.removed)} retiré(s), "
+            f"{len(self.changed)} modifié(s)"
+        )
+
+
+def _content(vinedo: Vinedo) -> tuple:
+    """Ce qui est affiché (description par son CRC32, résidente ou non)."""
+    return (vinedo.lat, vinedo.lon, vinedo.img, vinedo.description_digest())
+
+
+def diff_vinedos(old: Iterable[Vinedo], new: Iterable[Vinedo]) -> VinedoDiff:
+    """
+    Compare deux listes de vignobles par nom (un nom en double : le dernier compte).
+    Les listes résultantes suivent l'ordre de 'new' (retirés : ordre de 'old').
+    """
+    before = {v.nom: v for v in old}
+    after = {v.nom: v for v in new}
+    added, changed, relocated = [], [], []
+    for name, vinedo in after.items():
+        previous = before.get(name)
+        if previous is None:
+            added.append(vinedo)
+        elif _content(previous) != _content(vinedo):
+            changed.append(vinedo)
+        elif previous != vinedo:
+            relocated.append(vinedo)
+    removed = [name for name in before if name not in after]
+    return VinedoDiff(added, removed, changed, relocated)
@@ -0,0 +1,232 @@
+##########################################
+# vinos_ibericos/data/vinedo_loader.py   #
+#                                        #
+# Chargement de vinedos.json au fil de   #
+# l'eau :                                #
+# - Lecture par blocs, objet par objet   #
+# - Schéma compilé une seule fois        #
+# - Entrées rejetées (motif, ligne)      #
+# - Descriptions laissées sur disque     #
+# - Durée et pic mémoire du chargement   #
+##########################################
+
+import json
+import time
+import tracemalloc
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, NamedTuple, Optional, TextIO
+
+from vinos_ibericos.datatypes import Vinedo
+from vinos_ibericos.exceptions import VinedoJsonError
+
+
+@dataclass(frozen=True)
+class LoaderConfig:
+    CHUNK_SIZE: int = 64 * 1024  # Caractères lus à chaque bloc
+    ENCODING: str = "utf-8"
+
+
+# Schéma d'une entrée : (clé, type attendu). 'coords' est en plus vérifié à part.
+VINEDO_SCHEMA: tuple[tuple[str, type], ...] = (
+    ("nom", str),
+    ("coords", list),
+    ("description", str),
+    ("img", str),
+)
+
+# Retourne None si l'entrée est valide, sinon le motif du rejet :
+Validator = Callable[[Any], Optional[str]]
+
+
+def compile_schema(schema: tuple[tuple[str, type], ...] = VINEDO_SCHEMA) -> Validator:
+    """
+    Construit une seule fois le validateur d'une entrée (messages et types figés),
+    au lieu de reconstruire le schéma pour chaque entrée.
+    """
+    checks = tuple(
+        (key, typ, f"clé manquante : '{key}'", f"'{key}' : {typ.__name__} attendu")
+        for key, typ in schema
+    )
+
+    def validate(item: Any) -> Optional[str]:
+        if not isinstance(item, dict):
+            return f"objet attendu, trouvé : {type(item).__name__}"
+        for key, typ, missing, wrong_type in checks:
+            if key not in item:
+                return missing
+            if not isinstance(item[key], typ):
+                return wrong_type
+        coords = item["coords"]
+        if len(coords) != 2 or not all(isinstance(x, float) for x in coords):
+            return "'coords' : deux nombres à virgule attendus [lat, lon]"
+        return None
+
+    return validate
+
+
+VALIDATE_VINEDO: Validator = compile_schema()
+
+
+class Rejected(NamedTuple):
+    index: int  # Position de l'entrée dans le tableau
+    line: int  # Ligne (1-based) du début de l'entrée dans le fichier
+    offset: int  # Position (en octets) du début de l'entrée
+    reason: str
+
+    def __str__(self) -> str:
+        return f"Entrée {self.index} (ligne {self.line}) rejetée : {self.reason}"
+
+
+@dataclass
+class LoadReport:
+    loaded: int = 0
+    rejected: list[Rejected] = field(default_factory=list)
+    elapsed: float = 0.0
+    peak_bytes: int = 0  # 0 si la mémoire n'a pas été mesurée
+    from_snapshot: bool = False  # Chargé depuis l'instantané binaire (sans JSON)
+
+    def __str__(self) -> str:
+        peak = ""
+        if self.peak_bytes:
+            peak = f", pic {self.peak_bytes / 1024 / 1024:.1f} Mo"
+        return (
+            f"{self.loaded} vignobles chargés en {self.elapsed * 1000:.1f} ms"
+            f"{' (instantané)' if self.from_snapshot else ''} "
+            f"({len(self.rejected)} rejeté(s){peak})"
+        )
+
+
+class _Reader:
+    """Tampon de lecture : position courante, numéro de ligne et lecture par blocs."""
+
+    def __init__(self, f: TextIO, chunk_size: int) -> None:
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0  # Position dans 'buf'
+        self.line = 1  # Ligne de 'pos'
+        self.offset = 0  # Position de 'pos' dans le fichier (en octets)
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Lit un bloc de plus (la partie déjà consommée est libérée) ; False en fin."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def advance(self, end: int) -> None:
+        """Consomme buf[pos:end] (chaque caractère n'est encodé qu'une fois)."""
+        consumed = self.buf[self.pos : end]
+        self.line += consumed.count("\n")
+        self.offset += len(consumed.encode(LoaderConfig.ENCODING))
+        self.pos = end
+
+    def peek(self) -> str:
+        """Premier caractère non blanc ('' en fin de fichier), sans le consommer."""
+        while True:
+            end = self.pos
+            while end < len(self.buf) and self.buf[end] in " \t\r\n":
+                end += 1
+            self.advance(end)
+            if self.pos < len(self.buf) or not self.fill():
+                return self.buf[self.pos : self.pos + 1]
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            found = repr(char) if char else "fin de fichier"
+            raise VinedoJsonError(
+                f"Ligne {self.line} : {chars!r} attendu, trouvé {found}"
+            )
+        self.advance(self.pos + 1)
+        return char
+
+
+_DECODER = json.JSONDecoder()
+
+
+def iter_json_array(
+    f: TextIO, chunk_size: int = LoaderConfig.CHUNK_SIZE
+) -> Iterator[tuple[Any, int, int]]:
+    """
+    Parcourt un tableau JSON élément par élément : (valeur, ligne, position en octets).
+    Seul l'élément en cours de lecture est gardé en mémoire (plus un bloc).
+    Le fichier doit être ouvert avec newline="" (positions exactes en octets).
+    VinedoJsonError si le fichier n'est pas un tableau JSON bien formé.
+    """
+    reader = _Reader(f, chunk_size)
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.advance(reader.pos + 1)
+    else:
+        while True:
+            reader.peek()
+            line, offset = reader.line, reader.offset
+            while True:
+                try:
+                    value, end = _DECODER.raw_decode(reader.buf, reader.pos)
+                except json.JSONDecodeError as e:
+                    if reader.fill():  # Élément à cheval sur le bloc suivant
+                        continue
+                    raise VinedoJsonError(f"Ligne {line} : {e.msg}") from e
+                # Valeur en fin de tampon (nombre, littéral) : peut-être incomplète
+                if end == len(reader.buf) and reader.fill():
+                    continue
+                break
+            reader.advance(end)
+            yield value, line, offset
+            if reader.expect(",]") == "]":
+                break
+    if reader.peek():
+        raise VinedoJsonError(f"Ligne {reader.line} : contenu après le tableau")
+
+
+def load_vinedos(
+    path: Path,
+    validate: Validator = VALIDATE_VINEDO,
+    chunk_size: int = LoaderConfig.CHUNK_SIZE,
+    measure_memory: bool = False,
+    lazy_descriptions: bool = False,
+) -> tuple[list[Vinedo], LoadReport]:
+    """
+    Charge et valide vinedos.json entrée par entrée.
+    - Les entrées invalides sont écartées et listées dans le rapport (motif, ligne)
+    - lazy_descriptions=True => descriptions non conservées, seule la position de
+      l'entrée l'est (lecture à la demande par DescriptionStore)
+    - measure_memory=True => pic mémoire mesuré avec tracemalloc (plus lent)
+    - VinedoJsonError si le fichier est absent ou n'est pas un tableau JSON valide
+    """
+    report = LoadReport()
+    vinedos: list[Vinedo] = []
+    tracing = measure_memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        with path.open(encoding=LoaderConfig.ENCODING, newline="") as f:
+            items = iter_json_array(f, chunk_size)
+            for index, (item, line, offset) in enumerate(items):
+                reason = validate(item)
+                if reason is None:
+                    vinedos.append(
+                        Vinedo.from_dict(item, offset if lazy_descriptions else -1)
+                    )
+                else:
+                    report.rejected.append(Rejected(index, line, offset, reason))
+    except (OSError, UnicodeDecodeError) as e:
+        raise VinedoJsonError() from e
+    finally:
+        report.elapsed = time.perf_counter() - start
+        if tracing:
+            report.peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    report.loaded = len(vinedos)
+    return vinedos, report
@@ -0,0 +1,164 @@
+############################################
+# vinos_ibericos/data/vinedo_snapshot.py   #
+#                                          #
+# Instantané binaire des vignobles validés #
+# (démarrage sans relire vinedos.json) :   #
+# - Clé : mtime + taille + empreinte       #
+# - Relecture du JSON si la source change  #
+############################################
+
+import marshal
+import os
+import struct
+import sys
+import time
+
+from dataclasses import dataclass
+from functools import partial
+from hashlib import blake2b
+from pathlib import Path
+from typing import Optional
+
+from vinos_ibericos.config.general import ConfigPath
+from vinos_ibericos.data.vinedo_loader import LoadReport, Rejected, load_vinedos
+from vinos_ibericos.datatypes import Vinedo
+
+
+# En-tête : magic, version, version de Python (format marshal), mtime_ns, taille,
+# empreinte blake2b du contenu
+_HEADER = struct.Struct("<4sHBBqq16s")
+_MAGIC = b"VIVD"
+_VERSION = 2
+_DIGEST_SIZE = 16
+
+
+@dataclass(frozen=True)
+class SnapshotConfig:
+    CACHE_DIR: Path = ConfigPath.CACHE_DIR / "vinedos"
+    SUFFIX: str = ".snapshot"
+    READ_SIZE: int = 1024 * 1024  # Lecture par blocs pour l'empreinte
+
+
+def snapshot_path(source: Path, cache_dir: Path = SnapshotConfig.CACHE_DIR) -> Path:
+    key = blake2b(str(source.resolve()).encode("utf-8"), digest_size=8).hexdigest()
+    return cache_dir / f"{source.stem}-{key}{SnapshotConfig.SUFFIX}"
+
+
+def file_digest(path: Path) -> bytes:
+    digest = blake2b(digest_size=_DIGEST_SIZE)
+    with path.open("rb") as f:
+        while chunk := f.read(SnapshotConfig.READ_SIZE):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _header(signature: tuple[int, int], digest: bytes) -> bytes:
+    return _HEADER.pack(_MAGIC, _VERSION, *sys.version_info[:2], *signature, digest)
+
+
+def read_snapshot(
+    source: Path,
+    cache_dir: Path = SnapshotConfig.CACHE_DIR,
+    lazy_descriptions: bool = False,
+) -> Optional[tuple[list[Vinedo], list[Rejected]]]:
+    """
+    Vignobles de l'instantané s'il correspond encore à la source (et a été écrit avec
+    le même choix de descriptions résidentes ou non), sinon None.
+    - (mtime, taille) identiques => lu sans ouvrir le JSON
+    - sinon, même taille : empreinte du contenu comparée (fichier seulement touché,
+      copié...) et en-tête mis à jour
+    """
+    snapshot = snapshot_path(source, cache_dir)
+    try:
+        stat = source.stat()
+        raw = snapshot.read_bytes()
+        magic, version, major, minor, mtime_ns, size, digest = _HEADER.unpack_from(raw)
+    except (OSError, struct.error):
+        return None
+    if (magic, version, (major, minor)) != (_MAGIC, _VERSION, sys.version_info[:2]):
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    if signature != (mtime_ns, size):
+        try:
+            if stat.st_size != size or file_digest(source) != digest:
+                return None
+            _replace(snapshot, _header(signature, digest) + raw[_HEADER.size :])
+        except OSError:
+            return None
+    try:
+        lazy, records, rejected = marshal.loads(memoryview(raw)[_HEADER.size :])
+        del raw
+        if lazy != lazy_descriptions:
+            return None
+        vinedos = [Vinedo(*record) for record in records]
+        return vinedos, [Rejected(*item) for item in rejected]
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def write_snapshot(
+    source: Path,
+    signature: tuple[int, int],
+    digest: bytes,
+    vinedos: list[Vinedo],
+    rejected: list[Rejected],
+    cache_dir: Path = SnapshotConfig.CACHE_DIR,
+    lazy_descriptions: bool = False,
+) -> None:
+    """Écrit l'instantané (écriture atomique, échec silencieux : simple cache)."""
+    records = [
+        (v.nom, v.lat, v.lon, v.description, v.img, v.offset, v.description_crc)
+        for v in vinedos
+    ]
+    payload = marshal.dumps((lazy_descriptions, records, [tuple(r) for r in rejected]))
+    try:
+        _replace(snapshot_path(source, cache_dir), _header(signature, digest) + payload)
+    except (OSError, ValueError):
+        pass
+
+
+def _replace(snapshot: Path, data: bytes) -> None:
+    snapshot.parent.mkdir(parents=True, exist_ok=True)
+    tmp = snapshot.with_suffix(".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, snapshot)
+
+
+def load_with_snapshot(
+    source: Path,
+    cache_dir: Optional[Path] = SnapshotConfig.CACHE_DIR,
+    measure_memory: bool = False,
+    lazy_descriptions: bool = False,
+) -> tuple[list[Vinedo], LoadReport]:
+    """
+    Vignobles depuis l'instantané s'il est à jour (ni analyse JSON ni validation),
+    sinon depuis le JSON, puis instantané réécrit. cache_dir=None => JSON seul.
+    """
+    load = partial(
+        load_vinedos,
+        source,
+        measure_memory=measure_memory,
+        lazy_descriptions=lazy_descriptions,
+    )
+    if cache_dir is None:
+        return load()
+    start = time.perf_counter()
+    snapshot = read_snapshot(source, cache_dir, lazy_descriptions)
+    if snapshot is not None:
+        vinedos, rejected = snapshot
+        elapsed = time.perf_counter() - start
+        return vinedos, LoadReport(len(vinedos), rejected, elapsed, from_snapshot=True)
+    # Clé calculée avant l'analyse : une modification pendant le chargement
+    # invalidera l'instantané au prochain démarrage.
+    try:
+        stat = source.stat()
+        digest = file_digest(source)
+    except OSError:
+        return load()  # VinedoJsonError
+    vinedos, report = load()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    rejected = report.rejected
+    write_snapshot(
+        source, signature, digest, vinedos, rejected, cache_dir, lazy_descriptions
+    )
+    return vinedos, report
@@ -4,11 +4,108 @@
 # Classes des types de données #
 # ##############################
 
-from typing import TypedDict
+import zlib
 
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, Optional, TypedDict, Union
+
+
+class VinedoDict(TypedDict):
+    """Forme d'un vignoble dans vinedos.json."""
 
-class Vinedo(TypedDict):
     nom: str
     coords: list[float]
     description: str
     img: str
+
+
+@dataclass(frozen=True, slots=True)
+class Vinedo:
+    """
+    Vignoble en mémoire : attributs à emplacements fixes (__slots__), sans dict ni
+    liste imbriquée par enregistrement (voir tests/bench_records.py).
+    - offset >= 0 : description non chargée, lue à la demande dans vinedos.json à
+      cette position (cf. DescriptionStore)
+    """
+
+    nom: str
+    lat: float
+    lon: float
+    description: str = ""
+    img: str = ""
+    offset: int = -1  # Position (octets) de l'entrée dans vinedos.json
+    description_crc: int = 0  # CRC32 de la description non résidente (empreinte)
+
+    @property
+    def coords(self) -> tuple[float, float]:
+        return (self.lat, self.lon)
+
+    @property
+    def lazy(self) -> bool:
+        """Description à lire dans le fichier source (non résidente)."""
+        return self.offset >= 0
+
+    def description_digest(self) -> int:
+        """CRC32 de la description, résidente ou non (empreinte des données)."""
+        if self.lazy:
+            return self.description_crc
+        return zlib.crc32(self.description.encode("utf-8"))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], offset: int = -1) -> "Vinedo":
+        """offset >= 0 => la description n'est pas conservée (lue à la demande)."""
+        lat, lon = data["coords"]
+        description = data.get("description", "")
+        name, img = data["nom"], data.get("img", "")
+        if offset < 0:
+            return cls(name, float(lat), float(lon), description, img)
+        crc = zlib.crc32(description.encode("utf-8"))
+        return cls(name, float(lat), float(lon), "", img, offset, crc)
+
+    def to_dict(self) -> VinedoDict:
+        """Forme de vinedos.json (empreinte des données, appelants historiques)."""
+        return {
+            "nom": self.nom,
+            "coords": [self.lat, self.lon],
+            "description": self.description,
+            "img": self.img,
+        }
+
+
+VinedoLike = Union[Vinedo, Mapping[str, Any]]
+
+
+def as_vinedo(vinedo: VinedoLike) -> Vinedo:
+    """Vinedo tel quel, ou construit depuis un dict au format de vinedos.json."""
+    return vinedo if isinstance(vinedo, Vinedo) else Vinedo.from_dict(vinedo)
+
+
+def as_vinedos(vinedos: Iterable[VinedoLike]) -> list[Vinedo]:
+    return [as_vinedo(vinedo) for vinedo in vinedos]
+
+
+@dataclass(frozen=True, slots=True)
+class Bodega:
+    """
+    Bodega lue en base : mêmes champs que la table (id puis FIELDS de bodega_fields),
+    construite depuis un sqlite3.Row ou un dict.
+    """
+
+    id: int
+    name: str
+    cp: Optional[int]
+    town: str
+    street: Optional[str]
+    number: Optional[int]
+    comp: Optional[str]
+    lat: float
+    lon: float
+    website: Optional[str]
+    do_name: str
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "Bodega":
+        return cls(*(row[name] for name in cls.__slots__))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
@@ -15,3 +15,7 @@ class VinedoJsonError(Exception):
 
     def __init__(self, message: str | None = None):
         super().__init__(message or self.default_message)
+
+
+class MigrationError(Exception):
+    """Exception levée quand les données de bodegas.db empêchent une migration."""
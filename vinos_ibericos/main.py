@@ -1,18 +1,33 @@
+import logging
+
+from bisect import bisect_left
 from dataclasses import dataclass
-from operator import itemgetter
+from functools import partial
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Optional
 
-from PySide6 import QtCore, QtGui, QtWidgets
+from PySide6 import QtCore, QtWidgets
+from PySide6.QtWebEngineCore import QWebEngineProfile
 from PySide6.QtWebEngineWidgets import QWebEngineView
 
 from vinos_ibericos.ui.styles.global_style import GlobalStyle
-from vinos_ibericos.map_manager import MapManager
+from vinos_ibericos.data.bodega_manager import DEFAULT_DB_PATH
+from vinos_ibericos.data.connection import close_all
+from vinos_ibericos.data.vinedo_descriptions import DescriptionStore
+from vinos_ibericos.map_manager import MapConfig, MapManager
+from vinos_ibericos.map_warmup import MapWarmup
 from vinos_ibericos.ui.components.vinedo_detail import VinedoDetailDialog
 from vinos_ibericos.utils import CheckVinedoJson, VinedoJsonError, suspend_signals
 from vinos_ibericos.datatypes import Vinedo
 from vinos_ibericos.config.strings import ErrorMsg
 from vinos_ibericos.ui.components.message_box import MainBox
+from vinos_ibericos.ui.hot_reload import DataWatcher, GeojsonChange, ReloadResult
+from vinos_ibericos.ui.image_service import ImageService
+from vinos_ibericos.ui.map_renderer import MapRenderer
+from vinos_ibericos.ui.tile_scheme import install_tile_handler, register_tile_scheme
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -28,25 +43,47 @@ class Config:
     IMG_LABEL_SIZE: tuple[int, int] = (400, 300)
     FIXED_H_RESET_BTN: int = 40
     NBRE_COL_BTN: int = 5
+    # Mise à jour de la carte : "delta" (page chargée une fois, pilotée en JavaScript)
+    # ou "full" (rendu folium complet + setHtml à chaque sélection)
+    MAP_UPDATE_MODE: str = "delta"
+    MAP_PLACEHOLDER: str = "Chargement de la carte..."
+    MAP_ERROR: str = "Impossible d'afficher la carte ({message})"
+    # Préchauffage du cache des cartes au démarrage : "off", "background" ou "blocking"
+    # (pages HTML en mode "full", page de base + scripts de focus en mode "delta")
+    MAP_WARMUP: str = "off"
+    # Rechargement à chaud de vinedos.json et des .geojson modifiés pendant l'exécution
+    HOT_RELOAD: bool = True
+    STATUS_TIMEOUT_MS: int = 10_000  # Durée d'affichage des messages de la barre d'état
+    LOG_LEVEL: str = "WARNING"
     IMG_DIR_PATH: Path = BASE_DIR / "assets" / "img"
     DEFAULT_IMG: Path = BASE_DIR / "assets"
     # Strings :
     RESET_BUTTON: str = "Recentrer la carte sur l'Espagne"
     NOT_IMG: str = "Image introuvable"
+    REJECTED_STATUS: str = "{count} entrée(s) de vinedos.json écartée(s), voir le journal"
 
 
 class MainWindow(QtWidgets.QMainWindow):
     """Construction de l'interface."""
 
-    def __init__(self, vinedos: List[Vinedo]) -> None:
+    def __init__(
+        self,
+        vinedos: List[Vinedo],
+        map_manager: Optional[MapManager] = None,
+        descriptions: Optional[DescriptionStore] = None,
+    ) -> None:
         super().__init__()
         self.setWindowTitle("Vinos Ibericos")
         self.vinedos: list[Vinedo] = vinedos
-        self.marker_coords: dict[str, list[float]] = {
-            v["nom"]: v["coords"] for v in vinedos
+        # Descriptions lues à la demande (fenêtre de détail) :
+        self.descriptions: Optional[DescriptionStore] = descriptions
+        self.marker_coords: dict[str, tuple[float, float]] = {
+            v.nom: v.coords for v in vinedos
         }
-        self.map_manager: MapManager = MapManager(vinedos)
+        self.map_manager: MapManager = map_manager or MapManager(vinedos)
         self.detail_window: Optional[VinedoDetailDialog] = None
+        # Images mises à l'échelle, en cache (mémoire et miniatures sur disque) :
+        self.images: ImageService = ImageService(Config.IMG_DIR_PATH)
         #  Widget central :
         central_widget = QtWidgets.QWidget()
         self.setCentralWidget(central_widget)
@@ -63,11 +100,26 @@ class MainWindow(QtWidgets.QMainWindow):
     def _setup_map_view(self) -> QtWidgets.QFrame:
         """Construit et initialise la vue de la carte"""
         frame = QtWidgets.QFrame()
-        layout = QtWidgets.QVBoxLayout(frame)
-        layout.setContentsMargins(0, 0, 0, 0)  # Pas de marges internes
+        # Pile : texte d'attente affiché immédiatement, puis la carte une fois chargée
+        self.map_stack = QtWidgets.QStackedLayout(frame)
+        self.map_stack.setContentsMargins(0, 0, 0, 0)  # Pas de marges internes
+        self.map_placeholder = QtWidgets.QLabel(Config.MAP_PLACEHOLDER)
+        self.map_placeholder.setAlignment(QtCore.Qt.AlignCenter)  # type: ignore
+        self.map_placeholder.setWordWrap(True)
+        self.map_placeholder.setStyleSheet("font-size: 18pt;")
+        self.map_stack.addWidget(self.map_placeholder)
         self.map_view = QWebEngineView()
+        # Rendus hors du thread graphique : page de base / vues successives
+        self._page_renderer = MapRenderer(self)
+        self._view_renderer = MapRenderer(self)
+        self._delta_updates: bool = Config.MAP_UPDATE_MODE == "delta"
+        self._base_page_requested: bool = False
+        self._loading_base_page: bool = False
+        self._map_page_ready: bool = False  # Page de base chargée (mode "delta")
+        self._pending_map_filter: Optional[str] = None
+        self.map_view.loadFinished.connect(self._on_map_loaded)
         self.update_map()
-        layout.addWidget(self.map_view)
+        self.map_stack.addWidget(self.map_view)
         frame.setStyleSheet(GlobalStyle.widget_border())
         return frame
 
@@ -89,14 +141,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.image_label = QtWidgets.QLabel()
         self.image_label.setAlignment(QtCore.Qt.AlignCenter)  # type: ignore
         default_image_path = Config.DEFAULT_IMG / "copa_vino.jpg"
-        pixmap = QtGui.QPixmap(str(default_image_path))
-        self.image_label.setPixmap(
-            pixmap.scaled(
-                400,
-                300,  # taille fixe pour l'affichage initial
-                QtCore.Qt.KeepAspectRatio,  # type: ignore
-                QtCore.Qt.SmoothTransformation,  # type: ignore
-            )
+        self.image_label.setPixmap(  # taille fixe pour l'affichage initial
+            self.images.pixmap_for_file(default_image_path, Config.IMG_LABEL_SIZE)
         )
         grid.addWidget(self.image_label, 5, 1, 4, 2)
         # Bouton pour réinitialiser la carte :
@@ -112,9 +158,9 @@ class MainWindow(QtWidgets.QMainWindow):
         list_widget.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)  # type: ignore
         list_widget.setStyleSheet(GlobalStyle.get_list_widget_style())
         # Tri alphabétique et ajout des items
-        vinedos_sorted = sorted(vinedos, key=itemgetter("nom"))
+        vinedos_sorted = sorted(vinedos, key=attrgetter("nom"))
         for vinedo in vinedos_sorted:
-            item = QtWidgets.QListWidgetItem(vinedo["nom"])
+            item = QtWidgets.QListWidgetItem(vinedo.nom)
             item.setData(QtCore.Qt.UserRole, vinedo)  # type: ignore
             list_widget.addItem(item)
         # Limiter la taille visible à 10 lignes
@@ -134,18 +180,75 @@ class MainWindow(QtWidgets.QMainWindow):
             self._close_detail_window()
             self.update_map()
             return
-        # Récupère le dictionnaire associé au vignoble :
+        # Récupère le Vinedo associé au vignoble :
         selected_vinedo = current.data(QtCore.Qt.UserRole)  # type: ignore
         self._close_detail_window()
         self._display_detail_window(selected_vinedo)
         # Mettre à jour la carte en filtrant sur le vignoble sélectionné
-        self.update_map(vinedo_filter=selected_vinedo["nom"])
+        self.update_map(vinedo_filter=selected_vinedo.nom)
 
     def update_map(self, vinedo_filter: Optional[str] = None) -> None:
-        """Regénère la carte avec tous les marqueurs, centrée sur 'center'"""
-        html_data = self.map_manager.generate_map_html(vinedo_filter=vinedo_filter)
+        """
+        Met à jour la carte pour la vue demandée (None = vue globale).
+        Le rendu se fait dans un thread de travail ; seule la dernière demande est appliquée.
+        - mode "delta" : simple appel JavaScript sur la page déjà chargée
+        - mode "full" (ou repli) : rendu complet de la page
+        """
+        if not self._delta_updates:
+            self._view_renderer.submit(
+                partial(self.map_manager.generate_map_html, vinedo_filter),
+                self.map_view.setHtml,
+                self._show_map_error,
+            )
+            return
+        if self._map_page_ready:
+            self._view_renderer.submit(
+                partial(self.map_manager.focus_script, vinedo_filter),
+                self.map_view.page().runJavaScript,
+                self._show_map_error,
+            )
+            return
+        # Page de base pas encore prête : on ne garde que la dernière demande
+        self._pending_map_filter = vinedo_filter
+        if not self._base_page_requested:
+            self._base_page_requested = True
+            self._page_renderer.submit(
+                self.map_manager.generate_map_html,
+                self._load_base_page,
+                self._on_base_page_failed,
+            )
+
+    def _load_base_page(self, html_data: str) -> None:
+        """Charge la page de base (vue globale pilotable en JavaScript)."""
+        self._loading_base_page = True
         self.map_view.setHtml(html_data)
 
+    def _on_base_page_failed(self, message: str) -> None:
+        """Rendu de la page de base en échec : erreur affichée, nouvel essai au prochain clic."""
+        self._base_page_requested = False
+        self._show_map_error(message)
+
+    def _show_map_error(self, message: str) -> None:
+        """Rendu en échec : message à la place de la carte (si pas encore affichée)."""
+        logger.error("Rendu de la carte : %s", message)
+        text = Config.MAP_ERROR.format(message=message)
+        self.statusBar().showMessage(text, Config.STATUS_TIMEOUT_MS)
+        if self.map_stack.currentWidget() is self.map_placeholder:
+            self.map_placeholder.setText(text)
+
+    def _on_map_loaded(self, ok: bool) -> None:
+        """Fin de chargement : affiche la carte et applique la vue en attente (mode "delta")."""
+        if ok:
+            self.map_stack.setCurrentWidget(self.map_view)
+        if not self._loading_base_page:  # Rendu complet
+            return
+        self._loading_base_page = False
+        if not ok:  # Repli sur le rendu complet
+            self._delta_updates = False
+        else:
+            self._map_page_ready = True
+        self.update_map(self._pending_map_filter)
+
     def reset_interface(self) -> None:
         """
         Réinitialise la carte et la sélection dans la QListWidget,
@@ -159,7 +262,7 @@ class MainWindow(QtWidgets.QMainWindow):
             self.list_widget.clearFocus()  # Retirer le focus clavier
         self.update_map()  # Réinitialiser la carte
 
-    def _display_detail_window(self, vinedo: dict) -> None:
+    def _display_detail_window(self, vinedo: Vinedo) -> None:
         """
         Positionnent et affichage de la fenêtre de détail d'un vignoble.
         - Positionnement : centrée sur la partie gauche de la carte.
@@ -167,7 +270,14 @@ class MainWindow(QtWidgets.QMainWindow):
         - La déplacer aux coordonnées voulues et l'afficher.
         """
         # Positionnement et affichage de la fenêtre de détail :
-        self.detail_window = VinedoDetailDialog(self, vinedo, Config.IMG_DIR_PATH)
+        self.detail_window = VinedoDetailDialog(
+            self,
+            vinedo,
+            Config.IMG_DIR_PATH,
+            self.descriptions,
+            self.images,
+            on_bodega_added=self._on_bodega_added,
+        )
         # Récupérer la position globale du widget de la carte :
         map_top_left = self.map_view.mapToGlobal(self.map_view.rect().topLeft())
         mw, mh = self.map_view.width(), self.map_view.height()
@@ -180,6 +290,77 @@ class MainWindow(QtWidgets.QMainWindow):
         self.detail_window.move(max(0, x), max(0, y))
         self.detail_window.show()
 
+    def apply_reload(self, result: ReloadResult) -> None:
+        """
+        Rechargement à chaud de vinedos.json (MapManager déjà à jour) : seuls les
+        éléments de la liste concernés par la différence sont modifiés, la sélection
+        et la fenêtre de détail suivent.
+        """
+        diff = result.diff
+        selected = self._selected_vinedo()
+        self.vinedos = result.vinedos
+        # Images ajoutées ou remplacées avec les données : index et pixmaps à refaire
+        self.images.invalidate()
+        self.marker_coords = {v.nom: v.coords for v in result.vinedos}
+        items = {
+            self.list_widget.item(row).text(): self.list_widget.item(row)
+            for row in range(self.list_widget.count())
+        }
+        with suspend_signals(self.list_widget):
+            for name in diff.removed:
+                self.list_widget.takeItem(self.list_widget.row(items.pop(name)))
+            for vinedo in (*diff.changed, *diff.relocated):
+                items[vinedo.nom].setData(QtCore.Qt.UserRole, vinedo)  # type: ignore
+            names = sorted(items)
+            for vinedo in sorted(diff.added, key=attrgetter("nom")):
+                row = bisect_left(names, vinedo.nom)
+                names.insert(row, vinedo.nom)
+                item = QtWidgets.QListWidgetItem(vinedo.nom)
+                item.setData(QtCore.Qt.UserRole, vinedo)  # type: ignore
+                self.list_widget.insertItem(row, item)
+        if diff.affected:  # Vue globale (page de base) à rendre de nouveau
+            self._reload_base_page()
+        if selected is not None and selected.nom in diff.removed:
+            self.reset_interface()
+            return
+        current = self._selected_vinedo()  # Enregistrement à jour
+        if current is None:
+            self.update_map()
+            return
+        if self.detail_window is not None and current != selected:
+            self._close_detail_window()
+            self._display_detail_window(current)
+        self.update_map(vinedo_filter=current.nom)
+
+    def show_reload_error(self, message: str) -> None:
+        """Rechargement à chaud en échec : message dans la barre d'état (données gardées)."""
+        logger.warning(message)
+        self.statusBar().showMessage(message, Config.STATUS_TIMEOUT_MS)
+
+    def apply_geojson_change(self, change: GeojsonChange) -> None:
+        """.geojson modifiés (vues déjà invalidées) : vue courante redessinée si besoin."""
+        selected = self._selected_vinedo()
+        if selected is not None and selected.nom in change.names:
+            self.update_map(vinedo_filter=selected.nom)
+
+    def _on_bodega_added(self, _data: dict) -> None:
+        """Bodega enregistrée : vues focus invalidées, vue courante redessinée."""
+        if self.map_manager.invalidate_bodegas():
+            selected = self._selected_vinedo()
+            self.update_map(vinedo_filter=selected.nom if selected else None)
+
+    def _selected_vinedo(self) -> Optional[Vinedo]:
+        current = self.list_widget.currentItem()
+        if current is None or not current.isSelected():
+            return None
+        return current.data(QtCore.Qt.UserRole)  # type: ignore
+
+    def _reload_base_page(self) -> None:
+        """Mode "delta" : la page de base sera de nouveau rendue à la prochaine vue."""
+        if self._delta_updates and self._base_page_requested:
+            self._base_page_requested = False
+            self._map_page_ready = False
+
     def _close_detail_window(self) -> None:
         """Ferme la fenêtre de détail si elle est ouverte."""
         if self.detail_window:
@@ -188,10 +369,17 @@ class MainWindow(QtWidgets.QMainWindow):
 
 
 def main() -> None:
+    logging.basicConfig(level=Config.LOG_LEVEL)
+    if MapConfig.LOCAL_TILES:
+        register_tile_scheme()  # Obligatoirement avant la création de QApplication
     app = QtWidgets.QApplication([])
     app.setStyleSheet(
         GlobalStyle.get_base_style()
     )  # Application du style global à toute l'UI
+    app.aboutToQuit.connect(close_all)  # Connexions SQLite partagées
+    if MapConfig.LOCAL_TILES:  # Serveur de tuiles local (cache MBTiles)
+        tile_handler = install_tile_handler(QWebEngineProfile.defaultProfile())
+        app.aboutToQuit.connect(tile_handler.shutdown)
     loader_json_file: CheckVinedoJson = CheckVinedoJson()
     try:
         loader_json_file.load()  # Charge et valide les données
@@ -203,10 +391,34 @@ def main() -> None:
         )
         msg_box.exec()
         return  # Arrêt du lancement de l'application
+    for rejected in loader_json_file.rejected:  # Entrées écartées de vinedos.json
+        logger.warning(rejected)
+    # Gestionnaire de carte partagé avec le préchauffage du cache des vues :
+    map_manager = MapManager(loader_json_file.data, bodegas_db=DEFAULT_DB_PATH)
+    warmup = MapWarmup(  # Bilan dans le journal
+        map_manager, on_finished=logger.info, update_mode=Config.MAP_UPDATE_MODE
+    )
+    if Config.MAP_WARMUP == "blocking":
+        warmup.start("blocking")
     main_win: MainWindow = MainWindow(
-        loader_json_file.data
+        loader_json_file.data, map_manager, loader_json_file.descriptions
     )  # Accès direct aux données via 'data'
     main_win.showMaximized()  # Plein écran avec barre de titre
+    if loader_json_file.rejected:
+        main_win.statusBar().showMessage(
+            Config.REJECTED_STATUS.format(count=len(loader_json_file.rejected)),
+            Config.STATUS_TIMEOUT_MS,
+        )
+    if Config.HOT_RELOAD:
+        watcher = DataWatcher(loader_json_file, map_manager, parent=main_win)
+        watcher.vinedos_reloaded.connect(main_win.apply_reload)
+        watcher.geojson_changed.connect(main_win.apply_geojson_change)
+        watcher.reload_failed.connect(main_win.show_reload_error)
+        app.aboutToQuit.connect(watcher.stop)
+    if Config.MAP_WARMUP == "background":
+        # Lancé après l'affichage : ne retarde pas le premier rendu de la fenêtre
+        QtCore.QTimer.singleShot(0, lambda: warmup.start("background"))
+        app.aboutToQuit.connect(warmup.stop)
     app.exec()
 
 
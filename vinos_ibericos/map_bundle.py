@@ -0,0 +1,103 @@
+##################################
+# vinos_ibericos/map_bundle.py   #
+#                                #
+# Lecture du lot de cartes       #
+# précompilées (build_maps.py) : #
+# pages HTML + polygones         #
+##################################
+
+import json
+
+from dataclasses import dataclass
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any, Optional
+
+import folium
+
+from vinos_ibericos.config.general import ConfigPath
+from vinos_ibericos.data.polygon_store import do_slug
+
+
+@dataclass(frozen=True)
+class BundleConfig:
+    DIR: Path = ConfigPath.BASE_DIR_PROJECT / "build" / "map_bundle"
+    MANIFEST: str = "manifest.json"
+    FORMAT_VERSION: int = 1
+    GLOBAL_VIEW: str = "_global"  # Nom de fichier de la vue globale
+
+
+def input_hash(
+    fingerprint: str,
+    options: dict[str, Any],
+    geojson_dir: Path,
+    icon_path: Path,
+) -> str:
+    """
+    Empreinte des entrées d'un lot : données et style (empreinte du MapManager),
+    options de rendu, contenu des .geojson et de l'icône, versions du format et de folium.
+    """
+    digest = blake2b(digest_size=16)
+    digest.update(f"{BundleConfig.FORMAT_VERSION}|{folium.__version__}".encode())
+    digest.update(fingerprint.encode())
+    digest.update(json.dumps(options, sort_keys=True).encode())
+    for path in sorted(geojson_dir.glob("*.geojson")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    digest.update(icon_path.read_bytes())
+    return digest.hexdigest()
+
+
+def view_filename(view: Optional[str]) -> str:
+    return BundleConfig.GLOBAL_VIEW if view is None else do_slug(view)
+
+
+class MapBundle:
+    """
+    Lot de cartes précompilées sur disque.
+    - manifest.json : version, empreinte des entrées, liste des pages et polygones
+    - pages/*.html : rendu de chaque vue
+    - polygons/*.json : bornes et versions simplifiées par zoom
+    """
+
+    def __init__(self, directory: Path, manifest: dict[str, Any]) -> None:
+        self.directory = directory
+        self.manifest = manifest
+
+    @classmethod
+    def open(cls, directory: Optional[Path], expected_hash: str) -> Optional["MapBundle"]:
+        """Ouvre le lot s'il existe et correspond exactement aux entrées, sinon None."""
+        if directory is None:
+            return None
+        try:
+            manifest = json.loads(
+                (directory / BundleConfig.MANIFEST).read_text(encoding="utf-8")
+            )
+        except (OSError, json.JSONDecodeError):
+            return None
+        if (
+            manifest.get("format_version") != BundleConfig.FORMAT_VERSION
+            or manifest.get("input_hash") != expected_hash
+        ):
+            return None
+        return cls(directory, manifest)
+
+    def page(self, view: Optional[str]) -> Optional[str]:
+        """HTML précompilé de la vue (None si absent)."""
+        relative = self.manifest.get("pages", {}).get(view_filename(view))
+        if relative is None:
+            return None
+        try:
+            return (self.directory / relative).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def polygon(self, name: str) -> Optional[dict[str, Any]]:
+        """{'bounds': ..., 'levels': {zoom: locations}} de la DO (None si absent)."""
+        relative = self.manifest.get("polygons", {}).get(do_slug(name))
+        if relative is None:
+            return None
+        try:
+            return json.loads((self.directory / relative).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
@@ -1,12 +1,29 @@
+import threading
+
+from base64 import b64encode
+from collections import OrderedDict
 from dataclasses import dataclass
-from json import load, JSONDecodeError
+from hashlib import blake2b
+from html import escape
+from json import dumps
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Tuple
 
 import folium
+import numpy as np
+
+from branca.element import MacroElement
+from jinja2 import Template
 
+from vinos_ibericos.config.general import ConfigPath
 from vinos_ibericos.ui.config_ui import Colors
-from vinos_ibericos.datatypes import Vinedo
+from vinos_ibericos.datatypes import Bodega, Vinedo, VinedoLike, as_vinedo, as_vinedos
+from vinos_ibericos.data.bodega_manager import BodegaManager
+from vinos_ibericos.data.clustering import ClusterConfig, ClusterIndex, viewport_bounds
+from vinos_ibericos.data.polygon_store import POLYGON_STORE, PolygonData, do_slug
+from vinos_ibericos.data.tile_store import TileConfig
+from vinos_ibericos.data.vinedo_diff import VinedoDiff, diff_vinedos
+from vinos_ibericos.map_bundle import BundleConfig, MapBundle, input_hash
 
 
 @dataclass(frozen=True)
@@ -15,40 +32,731 @@ class MapConfig:
     INIT_ZOOM: int = 7
     FOCUS_ZOOM: int = 10
     WIDTH_POPUP: int = 400
+    LOCAL_TILES: bool = False  # Tuiles servies par le cache MBTiles local (data/tile_store.py)
+    # Affichage des points en vue globale :
+    # "markers" (un marqueur par point), "cluster" (regroupements précalculés par zoom)
+    # ou "viewport" (uniquement les points de l'emprise visible, recalculés par la page)
+    MARKER_MODE: str = "markers"
+    MARKER_MODES: tuple[str, ...] = ("markers", "cluster", "viewport")
+    VIEWPORT_PX: tuple[int, int] = (1400, 1000)  # Emprise supposée de la vue carte
+    VIEWPORT_PAD: float = 0.2  # Marge autour de l'emprise visible (mode "viewport")
 
 
 @dataclass(frozen=True)
 class IconConfig:
     INIT_SIZE: tuple[int, int] = (40, 40)
     FOCUS_SIZE: tuple[int, int] = (60, 60)
+    SHARED_ICON: bool = True  # Icône émise une seule fois dans la page
 
 
 @dataclass(frozen=True)
 class PathConfig:
     WINE_ICON: Path = Path(__file__).parent.parent / "assets" / "tinto.png"
-    GEOJSON_DIR: Path = Path(__file__).parent.parent / "assets" / "geojson"
+    GEOJSON_DIR: Path = ConfigPath.GEOJSON_DIR
+
+
+@dataclass(frozen=True)
+class BodegaLayerConfig:
+    RADIUS: int = 7  # Rayon (px) des marqueurs de bodegas en vue focus
+    STYLE: tuple[tuple[str, Any], ...] = (
+        ("color", Colors.BACKGROUND_DARK),
+        ("weight", 2),
+        ("fill", True),
+        ("fillColor", Colors.PRIMARY_ACCENT),
+        ("fillOpacity", 0.9),
+    )
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    RENDER_CACHE_SIZE: int = 64  # Vue globale + une vue par vignoble (45 à ce jour)
+
+
+class CacheInfo(NamedTuple):
+    """Statistiques du cache de rendu (même forme que functools.lru_cache)."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class RenderCache:
+    """
+    Cache LRU borné des pages HTML générées.
+    - Clé : (vue, empreinte des données et du style)
+    - Éviction du moins récemment utilisé au-delà de 'maxsize'
+    """
+
+    def __init__(self, maxsize: int = CacheConfig.RENDER_CACHE_SIZE) -> None:
+        self.maxsize: int = maxsize
+        self._entries: OrderedDict[tuple[Optional[str], str], str] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, key: tuple[Optional[str], str]) -> Optional[str]:
+        """Retourne le HTML en cache (et le marque comme récent), sinon None."""
+        html = self._entries.get(key)
+        if html is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return html
+
+    def put(self, key: tuple[Optional[str], str], html: str) -> None:
+        """Stocke un rendu et évince les plus anciens si nécessaire."""
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = html
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def contains(self, key: tuple[Optional[str], str]) -> bool:
+        return key in self._entries
+
+    def invalidate(self, view: Optional[str] = None, *, all_views: bool = True) -> None:
+        """
+        Invalide le cache.
+        - all_views=True (défaut) => vide entièrement le cache
+        - all_views=False => retire uniquement la vue 'view' (None = vue globale)
+        """
+        if all_views:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[0] == view]:
+            del self._entries[key]
+
+    def rekey(self, fingerprint: str, keep: Callable[[Optional[str]], bool]) -> None:
+        """
+        Nouvelle empreinte des données : les vues pour lesquelles keep(vue) est vrai
+        restent en cache sous cette empreinte (ordre LRU conservé), les autres sont
+        retirées.
+        """
+        self._entries = OrderedDict(
+            ((view, fingerprint), html)
+            for (view, _), html in self._entries.items()
+            if keep(view)
+        )
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+class IconRegistry:
+    """
+    Registre des icônes de marqueurs.
+    - Chaque image n'est lue et encodée en base64 qu'une seule fois par processus
+    - Les options Leaflet sont mémorisées par couple (image, taille)
+    """
+
+    def __init__(self) -> None:
+        self._data_urls: dict[Path, str] = {}
+        self._options: dict[tuple[Path, tuple[int, int]], dict[str, Any]] = {}
+        self.loads: int = 0  # Nombre de lectures disque effectives
+
+    def data_url(self, path: Path) -> str:
+        """Retourne l'URL 'data:' de l'image (lecture + encodage au premier appel)."""
+        url = self._data_urls.get(path)
+        if url is None:
+            img_format = path.suffix[1:] or "png"
+            url = f"data:image/{img_format};base64,{b64encode(path.read_bytes()).decode('ascii')}"
+            self._data_urls[path] = url
+            self.loads += 1
+        return url
+
+    def icon(
+        self, path: Path = PathConfig.WINE_ICON, size: tuple[int, int] = IconConfig.INIT_SIZE
+    ) -> folium.CustomIcon:
+        """
+        Nouvel élément folium.CustomIcon (un élément ne peut appartenir qu'à une carte),
+        construit à partir de l'URL déjà encodée : aucun accès disque.
+        """
+        key = (path, size)
+        if key not in self._options:
+            self._options[key] = {"icon_image": self.data_url(path), "icon_size": size}
+        return folium.CustomIcon(**self._options[key])
+
+    def clear(self) -> None:
+        self._data_urls.clear()
+        self._options.clear()
+
+
+ICON_REGISTRY = IconRegistry()
+
+
+def _js_literal(value: Any) -> str:
+    """Sérialise une valeur Python en littéral JavaScript sûr dans une balise <script>."""
+    return dumps(value, ensure_ascii=False).replace("</", "<\\/")
+
+
+def _collapsed_point(bounds: list[list[float]]) -> Optional[list[float]]:
+    """
+    [lat, lon] si les bornes se réduisent à un point (fitBounds zoomerait alors au
+    maximum : vue centrée sur ce point à FOCUS_ZOOM), sinon None.
+    """
+    (south, west), (north, east) = bounds
+    return [south, west] if (south, west) == (north, east) else None
+
+
+class MapBridge(MacroElement):
+    """
+    API JavaScript 'vinosMap' injectée dans la vue globale.
+    Permet de passer d'une vue à l'autre sans recharger la page (tuiles, Leaflet, scripts) :
+    - vinosMap.focus({name, center, zoom, polygon, bounds, bodegas})
+    - vinosMap.reset()
+    """
+
+    JS_OBJECT: str = "vinosMap"
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+        (function () {
+            var map = {{ this._parent.get_name() }};
+            var markers = { {%- for name, marker in this.markers.items() %}
+                {{ this.js(name) }}: {{ marker.get_name() }},
+            {%- endfor %} };
+            var baseIcons = {};
+            Object.keys(markers).forEach(function (name) {
+                baseIcons[name] = markers[name].options.icon;
+            });
+            var polygon = null;
+            var bodegas = L.layerGroup().addTo(map);
+            // Couche de points des modes "cluster" / "viewport" (PointLayer), si présente :
+            var points = window.{{ this.points_object }} || null;
+            window.{{ this.JS_OBJECT }} = {
+                focused: null,
+                focus: function (view) {
+                    this.reset(false);
+                    Object.keys(markers).forEach(function (name) {
+                        if (name !== view.name) { map.removeLayer(markers[name]); }
+                    });
+                    var marker = markers[view.name];
+                    if (marker) {
+                        marker.setIcon(L.icon(Object.assign(
+                            {}, baseIcons[view.name].options,
+                            {iconSize: {{ this.js(this.focus_size) }}}
+                        )));
+                    }
+                    if (points) { points.focus(view.name); }
+                    map.setView(view.center, view.zoom);
+                    if (view.polygon) {
+                        polygon = L.polygon(view.polygon, {{ this.js(this.polygon_style) }}).addTo(map);
+                    }
+                    if (view.bounds) { map.fitBounds(view.bounds); }
+                    (view.bodegas || []).forEach(function (b) {
+                        L.circleMarker([b.lat, b.lon], {{ this.js(this.bodega_style) }})
+                            .bindTooltip(b.tooltip).addTo(bodegas);
+                    });
+                    this.focused = view.name;
+                },
+                reset: function (recenter) {
+                    if (polygon) { map.removeLayer(polygon); polygon = null; }
+                    bodegas.clearLayers();
+                    Object.keys(markers).forEach(function (name) {
+                        markers[name].setIcon(baseIcons[name]);
+                        if (!map.hasLayer(markers[name])) { markers[name].addTo(map); }
+                    });
+                    if (points) { points.reset(); }
+                    this.focused = null;
+                    if (recenter !== false) {
+                        map.setView({{ this.js(this.center) }}, {{ this.init_zoom }});
+                    }
+                }
+            };
+        })();
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, markers: dict[str, folium.Marker]) -> None:
+        super().__init__()
+        self._name = "MapBridge"
+        self.markers = markers
+        self.points_object = PointLayer.JS_OBJECT
+        self.center = list(MapConfig.CENTRE_OF_SPAIN)
+        self.init_zoom = MapConfig.INIT_ZOOM
+        self.focus_size = list(IconConfig.FOCUS_SIZE)
+        self.polygon_style = {  # Même style que MapManager._polygon_layer
+            "color": Colors.PRIMARY_MAIN,
+            "fill": True,
+            "fillColor": Colors.PRIMARY_MAIN,
+            "fillOpacity": 0.4,
+            "weight": 3,
+        }
+        self.bodega_style = {
+            "radius": BodegaLayerConfig.RADIUS,
+            **dict(BodegaLayerConfig.STYLE),
+        }
+        self.js = _js_literal
+
+
+# Partie commune des couches de points (mode "cluster" et "viewport") : index des noms,
+# marqueurs individuels et API 'vinosPoints' utilisée par MapBridge en vue focus.
+_POINT_LAYER_JS = """
+            var names = {{ this.js(this.names) }};
+            var coords = {{ this.js(this.coords) }};
+            var tooltip = {{ this.js(this.tooltip) }};
+            var icon = {{ this.icon.get_name() }};
+            var focusIcon = L.icon(Object.assign(
+                {}, icon.options, {iconSize: {{ this.js(this.focus_size) }}}
+            ));
+            var layer = L.layerGroup().addTo(map);
+            var index = {};
+            names.forEach(function (name, i) { index[name] = i; });
+            var focused = null;
+            function point(i, pointIcon) {
+                L.marker(coords[i], {icon: pointIcon})
+                    .bindTooltip(tooltip.replace("__NAME__", names[i]))
+                    .addTo(layer);
+            }
+            function drawFocused() {
+                layer.clearLayers();
+                if (index[focused] !== undefined) { point(index[focused], focusIcon); }
+            }
+            window.{{ this.JS_OBJECT }} = {
+                focus: function (name) { focused = name; draw(); },
+                reset: function () { focused = null; draw(); }
+            };
+"""
+
+
+class PointLayer(MacroElement):
+    """
+    Base des couches de points dessinées par la page elle-même (mode "cluster" et
+    "viewport") : les points sont envoyés une seule fois sous forme compacte et
+    l'API 'vinosPoints' permet à MapBridge de n'afficher que le vignoble focus.
+    """
+
+    JS_OBJECT: str = "vinosPoints"
+
+    def __init__(
+        self, points: list[Vinedo], icon: folium.CustomIcon, tooltip_template: str
+    ) -> None:
+        super().__init__()
+        coords = np.array([p.coords for p in points], dtype=np.float64).reshape(-1, 2)
+        self._coords = coords
+        self.coords = np.round(coords, ClusterConfig.DECIMALS).tolist()
+        self.names = [p.nom for p in points]
+        self.icon = icon
+        self.tooltip = tooltip_template
+        self.focus_size = list(IconConfig.FOCUS_SIZE)
+        self.js = _js_literal
+
+
+class ClusterLayer(PointLayer):
+    """
+    Couche de points regroupés : les regroupements de chaque zoom sont calculés en
+    Python (ClusterIndex) et envoyés une seule fois ; la page ne fait que redessiner
+    le niveau correspondant au zoom courant.
+    """
+
+    _template = Template(
+        """
+        {% macro header(this, kwargs) %}
+        <style>
+            .vinos-cluster {
+                width: 40px; height: 40px; line-height: 36px;
+                border-radius: 20px; text-align: center;
+                font-weight: bold; font-size: 14px;
+                color: {{ this.text_color }};
+                background-color: {{ this.color }};
+                border: 2px solid {{ this.border_color }};
+            }
+        </style>
+        {% endmacro %}
+        {% macro script(this, kwargs) %}
+        (function () {
+            var map = {{ this._parent.get_name() }};
+            var data = {{ this.js(this.payload) }};"""
+        + _POINT_LAYER_JS
+        + """
+            function draw() {
+                if (focused !== null) { drawFocused(); return; }
+                var zoom = Math.min(Math.max(map.getZoom(), data.minZoom), data.maxZoom);
+                var level = data.levels[zoom];
+                layer.clearLayers();
+                for (var i = 0; i < level.length; i++) {
+                    var p = level[i];
+                    if (p[2] === 1) {
+                        point(p[3], icon);
+                    } else {
+                        L.marker([p[0], p[1]], {icon: L.divIcon({
+                            html: '<div class="vinos-cluster">' + p[2] + '</div>',
+                            className: "", iconSize: [40, 40]
+                        })}).on("click", function (e) {
+                            map.setView(e.latlng, map.getZoom() + 2);
+                        }).addTo(layer);
+                    }
+                }
+            }
+            map.on("zoomend", draw);
+            draw();
+        })();
+        {% endmacro %}
+        """
+    )
+
+    def __init__(
+        self, points: list[Vinedo], icon: folium.CustomIcon, tooltip_template: str
+    ) -> None:
+        super().__init__(points, icon, tooltip_template)
+        self._name = "ClusterLayer"
+        self.payload = ClusterIndex(self._coords[:, 0], self._coords[:, 1]).to_payload()
+        self.color = Colors.PRIMARY_MAIN
+        self.text_color = Colors.BACKGROUND_LIGHT
+        self.border_color = Colors.BORDER_COLOR
+
+
+class ViewportLayer(PointLayer):
+    """
+    Couche de points limitée à l'emprise visible : tous les points sont envoyés sous
+    forme compacte, mais seuls ceux de la vue courante (élargie de VIEWPORT_PAD) sont
+    créés comme marqueurs, recalculés à chaque déplacement ou zoom de la carte.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+        (function () {
+            var map = {{ this._parent.get_name() }};"""
+        + _POINT_LAYER_JS
+        + """
+            function draw() {
+                if (focused !== null) { drawFocused(); return; }
+                var bounds = map.getBounds().pad({{ this.pad }});
+                layer.clearLayers();
+                for (var i = 0; i < coords.length; i++) {
+                    if (bounds.contains(coords[i])) { point(i, icon); }
+                }
+            }
+            map.on("moveend", draw);
+            draw();
+        })();
+        {% endmacro %}
+        """
+    )
+
+    def __init__(
+        self, points: list[Vinedo], icon: folium.CustomIcon, tooltip_template: str
+    ) -> None:
+        super().__init__(points, icon, tooltip_template)
+        self._name = "ViewportLayer"
+        self.pad = MapConfig.VIEWPORT_PAD
 
 
 class MapManager:
-    def __init__(self, vinedos: list[Vinedo]) -> None:
-        self.vinedos: list[Vinedo] = vinedos
+    def __init__(
+        self,
+        vinedos: list[VinedoLike],
+        cache_size: int = CacheConfig.RENDER_CACHE_SIZE,
+        shared_icon: bool = IconConfig.SHARED_ICON,
+        local_tiles: bool = MapConfig.LOCAL_TILES,
+        geojson_dir: Path = PathConfig.GEOJSON_DIR,
+        bundle_dir: Optional[Path] = BundleConfig.DIR,
+        marker_mode: str = MapConfig.MARKER_MODE,
+        bodegas_db: Optional[Path] = None,
+    ) -> None:
+        if marker_mode not in MapConfig.MARKER_MODES:
+            raise ValueError(
+                f"marker_mode inconnu : {marker_mode!r} "
+                f"(attendu : {', '.join(MapConfig.MARKER_MODES)})"
+            )
+        self.shared_icon: bool = shared_icon
+        self.local_tiles: bool = local_tiles
+        self.marker_mode: str = marker_mode
+        # Base des bodegas affichées en vue focus (None => pas de bodegas) :
+        self.bodegas_db: Optional[Path] = bodegas_db
+        self.geojson_dir: Path = geojson_dir
+        # Lot précompilé (build_maps.py), vérifié à la première utilisation :
+        self.bundle_dir: Optional[Path] = bundle_dir
+        self._bundle: Optional[MapBundle] = None
+        self._bundle_checked: bool = False
+        # Les rendus peuvent être demandés depuis des threads de travail :
+        self._lock = threading.RLock()
+        self._render_cache: RenderCache = RenderCache(cache_size)
+        # Scripts de focus du mode "delta" (polygone + bodegas), mêmes clés et mêmes
+        # invalidations que les pages HTML :
+        self._focus_cache: RenderCache = RenderCache(cache_size)
+        # Repère du contenu de la base des bodegas (empreinte des vues focus) :
+        self._bodegas_version: Optional[int] = self._read_bodegas_version()
+        self.vinedos = vinedos
         self._current_vinedos: list[Vinedo] = []
 
+    @property
+    def vinedos(self) -> list[Vinedo]:
+        return self._vinedos
+
+    @vinedos.setter
+    def vinedos(self, vinedos: list[VinedoLike]) -> None:
+        """
+        Remplace le jeu de données : l'empreinte change, les anciens rendus ne servent plus.
+        Accepte des Vinedo ou des dict au format de vinedos.json (convertis).
+        """
+        with self._lock:
+            self._vinedos: list[Vinedo] = as_vinedos(vinedos)
+            self._fingerprint: str = self._compute_fingerprint(
+                self._vinedos, self._bodegas_version
+            )
+            for cache in self._caches:
+                cache.invalidate()
+            self._bundle_checked = False  # Le lot doit correspondre aux nouvelles données
+
+    def update_vinedos(self, vinedos: list[VinedoLike]) -> VinedoDiff:
+        """
+        Remplace le jeu de données (rechargement à chaud) en gardant en cache les vues
+        focus des vignobles inchangés : une vue focus ne dépend que de son vignoble
+        (plus son polygone et ses bodegas). La vue globale n'est invalidée que si un
+        vignoble a été ajouté, retiré ou modifié.
+        """
+        with self._lock:
+            new_vinedos = as_vinedos(vinedos)
+            diff = diff_vinedos(self._vinedos, new_vinedos)
+            affected = diff.affected
+            self._vinedos = new_vinedos
+            self._fingerprint = self._compute_fingerprint(
+                new_vinedos, self._bodegas_version
+            )
+            # Vue globale gardée seulement si aucun vignoble n'est concerné :
+            for cache in self._caches:
+                cache.rekey(
+                    self._fingerprint,
+                    lambda view: view not in affected
+                    and (view is not None or not affected),
+                )
+            self._bundle_checked = False
+            return diff
+
+    def invalidate_bodegas(self) -> bool:
+        """
+        Base des bodegas modifiée (ajout depuis le formulaire, import...) : nouvelle
+        empreinte, vues focus retirées du cache (la vue globale n'affiche pas de
+        bodegas) et lot précompilé revérifié. False si la base n'a pas changé.
+        """
+        version = self._read_bodegas_version()
+        with self._lock:
+            if version == self._bodegas_version:
+                return False
+            self._bodegas_version = version
+            self._fingerprint = self._compute_fingerprint(self._vinedos, version)
+            for cache in self._caches:
+                cache.rekey(self._fingerprint, lambda view: view is None)
+            self._bundle_checked = False
+            return True
+
+    def _read_bodegas_version(self) -> Optional[int]:
+        if self.bodegas_db is None:
+            return None
+        with BodegaManager(self.bodegas_db) as manager:
+            return manager.change_counter()
+
+    def invalidate_polygons(self, geojson_files: Iterable[Path]) -> list[str]:
+        """
+        .geojson modifiés, ajoutés ou supprimés : entrées oubliées par POLYGON_STORE
+        et vues focus des DO correspondantes invalidées (la vue globale n'a pas de
+        polygone). Retourne les noms des vignobles concernés.
+        """
+        slugs = {path.stem for path in geojson_files}
+        with self._lock:
+            for slug in slugs:
+                POLYGON_STORE.invalidate(self.geojson_dir / f"{slug}.geojson")
+            names = [v.nom for v in self.vinedos if do_slug(v.nom) in slugs]
+            for name in names:
+                for cache in self._caches:
+                    cache.invalidate(name, all_views=False)
+            if slugs:
+                self._bundle_checked = False  # Empreinte des .geojson du lot
+            return names
+
     def generate_map_html(self, vinedo_filter: Optional[str] = None) -> str:
         """
-        Génère le HTML de la carte.
+        Génère le HTML de la carte (ou le sert depuis le cache de rendu).
         - vinedo_filter=None => vue globale avec tous les marqueurs
         - vinedo_filter="Nom du vignoble" => vue détaillée avec uniquement ce vignoble
         """
-        if vinedo_filter:
-            self._current_vinedos = [
-                v for v in self.vinedos if v["nom"] == vinedo_filter
-            ] or self.vinedos  # fallback global si nom non trouvé
+        with self._lock:
+            view = self._view_key(vinedo_filter)
+            key = (view, self._fingerprint)
+            html = self._render_cache.get(key)
+            if html is None:
+                bundle = self.bundle
+                html = bundle.page(view) if bundle else None
+                if html is None:  # Pas de lot valide : rendu folium
+                    html = self._render_map_html(vinedo_filter)
+                self._render_cache.put(key, html)
+            return html
+
+    @property
+    def bundle(self) -> Optional[MapBundle]:
+        """Lot précompilé, uniquement s'il correspond aux entrées actuelles."""
+        with self._lock:
+            if not self._bundle_checked:
+                self._bundle_checked = True
+                self._bundle = (
+                    MapBundle.open(self.bundle_dir, self.input_hash())
+                    if self.bundle_dir is not None
+                    else None
+                )
+            return self._bundle
+
+    def input_hash(self) -> str:
+        """Empreinte des entrées du rendu (données, style, options, .geojson, icône)."""
+        return input_hash(
+            self._fingerprint,
+            {
+                "shared_icon": self.shared_icon,
+                "local_tiles": self.local_tiles,
+                "marker_mode": self.marker_mode,
+                "bodegas": self.bodegas_db is not None,
+                "bodegas_version": self._bodegas_version,
+            },
+            self.geojson_dir,
+            PathConfig.WINE_ICON,
+        )
+
+    def invalidate_cache(self, vinedo_filter: Optional[str] = None) -> None:
+        """
+        Invalidation explicite du cache de rendu (pages HTML et scripts de focus).
+        - sans argument => toutes les vues
+        - vinedo_filter="Nom du vignoble" => uniquement cette vue
+        """
+        with self._lock:
+            for cache in self._caches:
+                if vinedo_filter is None:
+                    cache.invalidate()
+                else:
+                    cache.invalidate(vinedo_filter, all_views=False)
+
+    def cache_info(self) -> CacheInfo:
+        """Compteurs hits/misses et taille du cache de rendu."""
+        return self._render_cache.info()
+
+    @property
+    def _caches(self) -> tuple[RenderCache, RenderCache]:
+        return self._render_cache, self._focus_cache
+
+    @property
+    def fingerprint(self) -> str:
+        """Empreinte courante des données et du style (cf. cache de rendu)."""
+        return self._fingerprint
+
+    def views(self) -> list[Optional[str]]:
+        """Toutes les vues possibles : globale (None) puis une par vignoble."""
+        return [None, *(v.nom for v in self.vinedos)]
+
+    def is_cached(self, vinedo_filter: Optional[str] = None) -> bool:
+        """Indique si la vue est déjà dans le cache de rendu (sans toucher aux compteurs)."""
+        with self._lock:
+            return self._render_cache.contains(
+                (self._view_key(vinedo_filter), self._fingerprint)
+            )
+
+    def store_rendered(
+        self, vinedo_filter: Optional[str], html: str, fingerprint: str
+    ) -> bool:
+        """
+        Range dans le cache un rendu produit ailleurs (préchauffage, autre processus).
+        Ignoré si les données ont changé depuis (empreinte différente).
+        """
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                return False
+            self._render_cache.put((self._view_key(vinedo_filter), fingerprint), html)
+            return True
+
+    def _view_key(self, vinedo_filter: Optional[str]) -> Optional[str]:
+        """Nom de la vue réellement rendue (un nom inconnu retombe sur la vue globale)."""
+        if vinedo_filter and any(v.nom == vinedo_filter for v in self.vinedos):
+            return vinedo_filter
+        return None
+
+    @staticmethod
+    def _compute_fingerprint(
+        vinedos: list[Vinedo], bodegas_version: Optional[int] = None
+    ) -> str:
+        """
+        Empreinte des données (vignobles, repère de la base des bodegas) et de la
+        configuration de style influant sur le rendu.
+        """
+        digest = blake2b(digest_size=16)
+        digest.update(f"bodegas:{bodegas_version}".encode("utf-8"))
+        # Descriptions par leur CRC32 : identique qu'elles soient résidentes ou non
+        records = [
+            (v.nom, v.lat, v.lon, v.img, v.description_digest()) for v in vinedos
+        ]
+        digest.update(dumps(records, sort_keys=True, default=str).encode("utf-8"))
+        for config in (MapConfig(), IconConfig(), PathConfig()):
+            digest.update(repr(config).encode("utf-8"))
+        # 'Colors' n'a pas de champs annotés : on lit directement ses constantes
+        palette = sorted((k, v) for k, v in vars(Colors).items() if k.isupper())
+        digest.update(repr(palette).encode("utf-8"))
+        return digest.hexdigest()
+
+    def focus_script(self, vinedo_filter: Optional[str] = None) -> str:
+        """
+        Script JavaScript de mise à jour incrémentale de la page de base (vue globale déjà
+        chargée) : focus sur un vignoble, ou retour à la vue globale si None/nom inconnu.
+        """
+        with self._lock:
+            view = self._view_key(vinedo_filter)
+            if view is None:
+                return self.reset_script()
+            key = (view, self._fingerprint)
+            script = self._focus_cache.get(key)
+            if script is None:
+                script = self._focus_script(view)
+                self._focus_cache.put(key, script)
+            return script
+
+    def is_focus_cached(self, vinedo_filter: Optional[str]) -> bool:
+        """Indique si le script de focus de la vue est déjà en cache (mode "delta")."""
+        with self._lock:
+            return self._focus_cache.contains(
+                (self._view_key(vinedo_filter), self._fingerprint)
+            )
+
+    def _focus_script(self, vinedo_filter: Optional[str]) -> str:
+        view = self._view_key(vinedo_filter)
+        if view is None:
+            return self.reset_script()
+        vinedo = next(v for v in self.vinedos if v.nom == view)
+        payload: dict[str, Any] = {
+            "name": view,
+            "center": list(vinedo.coords),
+            "zoom": MapConfig.FOCUS_ZOOM,
+            "polygon": None,
+            "bounds": None,
+        }
+        bundled = self.bundle.polygon(view) if self.bundle else None
+        if bundled:
+            payload["polygon"] = bundled["levels"].get(str(MapConfig.FOCUS_ZOOM))
+            payload["bounds"] = bundled["bounds"]
+        elif polygon_data := self._polygon_data(view):
+            payload["polygon"] = polygon_data.simplified(MapConfig.FOCUS_ZOOM).locations()
+            payload["bounds"] = polygon_data.bounds_list()
+        if payload["bounds"] and (point := _collapsed_point(payload["bounds"])):
+            payload["center"], payload["bounds"] = point, None  # setView à FOCUS_ZOOM
+        payload["bodegas"] = [
+            {"lat": b.lat, "lon": b.lon, "tooltip": self._format_bodega_tooltip(b)}
+            for b in self._bodegas_near(vinedo)
+        ]
+        return f"{MapBridge.JS_OBJECT}.focus({_js_literal(payload)});"
+
+    @staticmethod
+    def reset_script() -> str:
+        """Script JavaScript de retour à la vue globale (page de base)."""
+        return f"{MapBridge.JS_OBJECT}.reset();"
+
+    def _render_map_html(self, vinedo_filter: Optional[str] = None) -> str:
+        """Rendu folium complet (chemin sans cache)."""
+        view = self._view_key(vinedo_filter)  # fallback global si nom non trouvé
+        if view is not None:
+            self._current_vinedos = [v for v in self.vinedos if v.nom == view]
         else:
             self._current_vinedos = self.vinedos
-
-        focus = vinedo_filter is not None
-        return self._generate_map(focus=focus)
+        return self._generate_map(focus=view is not None)
 
     def _generate_map(self, focus: bool = False) -> str:
         """
@@ -56,37 +764,127 @@ class MapManager:
         - focus=True => zoom + popup
         """
         if self._current_vinedos and focus:
-            center = self._current_vinedos[0]["coords"]
+            center = list(self._current_vinedos[0].coords)
             zoom = MapConfig.FOCUS_ZOOM
         else:
             center = MapConfig.CENTRE_OF_SPAIN
             zoom = MapConfig.INIT_ZOOM
 
-        fmap = folium.Map(location=center, zoom_start=zoom)
-        for vinedo in self._current_vinedos:
-            self._add_marker(fmap, vinedo, focus)
+        if self.local_tiles:
+            fmap = folium.Map(location=center, zoom_start=zoom, tiles=None)
+            folium.TileLayer(
+                tiles=TileConfig.LOCAL_URL, attr=TileConfig.ATTRIBUTION, name="OSM"
+            ).add_to(fmap)
+        else:
+            fmap = folium.Map(location=center, zoom_start=zoom)
+        shared_icon = None
+        if self.shared_icon:
+            # Une seule déclaration 'L.icon' dans la page, référencée par tous les marqueurs :
+            shared_icon = ICON_REGISTRY.icon(size=self._icon_size(focus))
+            fmap.add_child(shared_icon)
+        points = self._current_vinedos
+        markers = {}
+        if not focus and self.marker_mode in ("cluster", "viewport") and points:
+            if shared_icon is None:
+                shared_icon = ICON_REGISTRY.icon(size=self._icon_size(focus))
+                fmap.add_child(shared_icon)
+            layer = ClusterLayer if self.marker_mode == "cluster" else ViewportLayer
+            fmap.add_child(layer(points, shared_icon, self._format_tooltip("__NAME__")))
+        else:
+            markers = {
+                vinedo.nom: self._add_marker(
+                    fmap, vinedo, focus, shared_icon=shared_icon
+                )
+                for vinedo in points
+            }
+        if not focus:
+            # La vue globale sert de page de base aux mises à jour incrémentales :
+            fmap.add_child(MapBridge(markers))
         return fmap.get_root().render()
 
-    def _add_marker(self, fmap: folium.Map, vinedo: Vinedo, focus: bool) -> None:
+    def _add_marker(
+        self,
+        fmap: folium.Map,
+        vinedo: VinedoLike,
+        focus: bool,
+        shared_icon: Optional[folium.CustomIcon] = None,
+    ) -> folium.Marker:
         """
-        Ajoute un marqueur pour un vignoble donné.
+        Ajoute (et retourne) un marqueur pour un vignoble donné.
         - focus=True => plus gros icône + popup
+        - shared_icon => icône déjà déclarée sur la carte, simplement référencée
         - Ajout d'un polygone représentant la région si coordonnées présentes dans le .json
         """
-        # Définitions des paramètres du marqueur selon le focus :
-        icon_size = IconConfig.FOCUS_SIZE if focus else IconConfig.INIT_SIZE
-        folium.Marker(
-            location=vinedo["coords"],
-            tooltip=self._format_tooltip(vinedo["nom"]),
-            icon=folium.CustomIcon(str(PathConfig.WINE_ICON), icon_size=icon_size),
-        ).add_to(fmap)
+        vinedo = as_vinedo(vinedo)
+        if shared_icon is None:
+            marker = folium.Marker(
+                location=list(vinedo.coords),
+                tooltip=self._format_tooltip(vinedo.nom),
+                icon=ICON_REGISTRY.icon(size=self._icon_size(focus)),
+            )
+        else:
+            marker = folium.Marker(
+                location=list(vinedo.coords), tooltip=self._format_tooltip(vinedo.nom)
+            )
+            marker.add_child(folium.Marker.SetIcon(marker=marker, icon=shared_icon))
+        marker.add_to(fmap)
 
         # Pour le polygone
         if focus:
-            polygone, coords_polygone = self._f_polygone(vinedo["nom"])
-            if polygone:
-                polygone.add_to(fmap)
-                fmap.fit_bounds(coords_polygone)
+            polygon_data = self._polygon_data(vinedo.nom)
+            if polygon_data:
+                self._polygon_layer(polygon_data.simplified(MapConfig.FOCUS_ZOOM)).add_to(
+                    fmap
+                )
+                bounds = polygon_data.bounds_list()
+                if point := _collapsed_point(bounds):
+                    fmap.location = point  # Déjà à FOCUS_ZOOM (zoom_start)
+                else:
+                    fmap.fit_bounds(bounds)  # Bornes de toute la DO
+            self._add_bodegas(fmap, vinedo)
+        return marker
+
+    def _add_bodegas(self, fmap: folium.Map, vinedo: Vinedo) -> None:
+        """Ajoute les bodegas situées dans l'emprise de la DO (vue focus)."""
+        bodegas = self._bodegas_near(vinedo)
+        if not bodegas:
+            return
+        group = folium.FeatureGroup(name="Bodegas")
+        for bodega in bodegas:
+            folium.CircleMarker(
+                location=[bodega.lat, bodega.lon],
+                radius=BodegaLayerConfig.RADIUS,
+                tooltip=self._format_bodega_tooltip(bodega),
+                **dict(BodegaLayerConfig.STYLE),
+            ).add_to(group)
+        group.add_to(fmap)
+
+    def _bodegas_near(self, vinedo: Vinedo) -> list[Bodega]:
+        """
+        Bodegas dans les bornes du polygone de la DO (ou, sans polygone, dans l'emprise
+        de la vue focus) : simple lecture de l'index R*Tree de la base.
+        """
+        if self.bodegas_db is None:
+            return []
+        polygon_data = self._polygon_data(vinedo.nom)
+        if polygon_data:
+            bounds = polygon_data.bounds
+        else:
+            bounds = viewport_bounds(
+                vinedo.coords, MapConfig.FOCUS_ZOOM, MapConfig.VIEWPORT_PX
+            )
+        # Connexion empruntée au pool partagé le temps de la requête (thread courant) :
+        with BodegaManager(self.bodegas_db) as manager:
+            return [Bodega.from_row(row) for row in manager.stream_bodegas(bbox=bounds)]
+
+    @staticmethod
+    def _format_bodega_tooltip(bodega: Bodega) -> str:
+        return f"<b>{escape(str(bodega.name))}</b><br>{escape(str(bodega.town))}"
+
+    @staticmethod
+    def _icon_size(focus: bool) -> tuple[int, int]:
+        """Taille de l'icône selon le focus."""
+        return IconConfig.FOCUS_SIZE if focus else IconConfig.INIT_SIZE
 
     def _format_tooltip(self, name: str) -> str:
         return f"""
@@ -101,7 +899,8 @@ class MapManager:
             '>{name}</div>
         """
 
-    def _format_popup(self, vinedo: Dict[str, Any]) -> str:
+    def _format_popup(self, vinedo: VinedoLike) -> str:
+        vinedo = as_vinedo(vinedo)
         return f"""
             <div style='
                 font-size:16px;
@@ -112,40 +911,46 @@ class MapManager:
                 border-radius:6px;
                 width:400px;
             '>
-                <strong style="font-size:20px;color:red;">{vinedo["nom"]}</strong><br>
-                {vinedo["description"]}
+                <strong style="font-size:20px;color:red;">{vinedo.nom}</strong><br>
+                {vinedo.description}
             </div>
         """
 
     def _f_polygone(
-        self, name: str, geojson_dir: Path = PathConfig.GEOJSON_DIR
-    ) -> Tuple[Optional[folium.Polygon], List[List[float]]]:
+        self,
+        name: str,
+        geojson_dir: Optional[Path] = None,
+        zoom: Optional[int] = None,
+    ) -> Tuple[Optional[folium.Polygon], List[Any]]:
         """
         Création du polygone permettant de tracer la région viticole sélectionnée.
-        - Extraction des données depuis un fichier .geojson. Retourne un objet folium.Polygon.
-        """
-        geojson_file: Path = geojson_dir / f"{name.lower().replace(' ', '_')}.geojson"
-        # Charger le fichier GeoJSON s'il existe :
-        try:
-            with open(geojson_file, "r", encoding="utf-8") as f:
-                geojson_data = load(f)
-        except FileNotFoundError:
-            return None, []
-        except JSONDecodeError:
-            return None, []
-        # Extraire les coordonnées du polygone (si fichier .geojson bien formaté)
-        try:
-            # GeoJSON : geojson_data['features'][0]['geometry']['coordinates'][0]
-            raw_coords = geojson_data["features"][0]["geometry"]["coordinates"][0]
-        except (KeyError, IndexError):
+        - Données issues d'un fichier .geojson (via POLYGON_STORE). Retourne un objet folium.Polygon
+          unique par DO, même en présence de plusieurs zones ou d'enclaves.
+        - zoom => version simplifiée adaptée à ce zoom (None = tous les sommets)
+        """
+        polygon_data = self._polygon_data(name, geojson_dir)
+        if polygon_data is None:
             return None, []
-        # Inverser chaque coordonnée (lon, lat) -> (lat, lon)
-        polygon_coords = [[lat, lon] for lon, lat in raw_coords]
+        if zoom is not None:
+            polygon_data = polygon_data.simplified(zoom)
+        polygone = self._polygon_layer(polygon_data)
+        return polygone, polygone.locations
+
+    def _polygon_data(
+        self, name: str, geojson_dir: Optional[Path] = None
+    ) -> Optional[PolygonData]:
+        """Géométrie de la DO, parsée une seule fois puis servie depuis le cache."""
+        geojson_file: Path = (geojson_dir or self.geojson_dir) / f"{do_slug(name)}.geojson"
+        return POLYGON_STORE.get(geojson_file)
+
+    @staticmethod
+    def _polygon_layer(polygon_data: PolygonData) -> folium.Polygon:
+        """Une seule couche folium pour toute la DO (zones disjointes et enclaves comprises)."""
         return folium.Polygon(
-            locations=polygon_coords,
+            locations=polygon_data.locations(),
             color=Colors.PRIMARY_MAIN,
             fill=True,
             fill_color=Colors.PRIMARY_MAIN,
             fill_opacity=0.4,
             weight=3,
-        ), polygon_coords
+        )
@@ -0,0 +1,169 @@
+####################################
+# vinos_ibericos/map_warmup.py     #
+#                                  #
+# Préchauffage du cache de rendu   #
+# des cartes : toutes les vues     #
+# rendues en parallèle (processus) #
+# ou scripts de focus ("delta")    #
+####################################
+
+import multiprocessing
+import threading
+import time
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from vinos_ibericos.data.polygon_store import POLYGON_STORE
+from vinos_ibericos.datatypes import Vinedo
+from vinos_ibericos.map_manager import MapManager
+
+
+@dataclass(frozen=True)
+class WarmupConfig:
+    MODES: tuple[str, ...] = ("off", "background", "blocking")
+    # Ce qui est préchauffé, selon le mode de mise à jour de la carte (cf. main.Config) :
+    # "full" => pages HTML de toutes les vues ; "delta" => page de base + scripts de focus
+    UPDATE_MODES: tuple[str, ...] = ("full", "delta")
+    MAX_WORKERS: Optional[int] = None  # None => nombre de CPU
+    # 'spawn' : pas de fork d'un processus où tournent déjà des threads Qt
+    START_METHOD: str = "spawn"
+
+
+# Gestionnaire propre à chaque processus de travail (créé une seule fois par processus) :
+_worker_manager: Optional[MapManager] = None
+
+
+def _init_worker(
+    vinedos: list[Vinedo], options: dict[str, Any], polygon_cache_dir: Optional[Path]
+) -> None:
+    global _worker_manager
+    POLYGON_STORE.cache_dir = polygon_cache_dir  # Même cache que le processus parent
+    _worker_manager = MapManager(vinedos, cache_size=0, bundle_dir=None, **options)
+
+
+def _render_view(view: Optional[str]) -> tuple[Optional[str], str]:
+    assert _worker_manager is not None
+    return view, _worker_manager.generate_map_html(view)
+
+
+@dataclass
+class WarmupReport:
+    views: int = 0
+    rendered: int = 0
+    elapsed: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"Préchauffage des cartes : {self.rendered}/{self.views} vues "
+            f"en {self.elapsed:.2f} s"
+        )
+
+
+class MapWarmup:
+    """
+    Préchauffe ce que la carte lira réellement, selon 'update_mode' :
+    - "full" : toutes les vues (globale + une par vignoble) rendues dans un pool de
+      processus (rendu folium en pur Python, limité par le GIL) et rangées dans le
+      cache de rendu du MapManager
+    - "delta" : la page de base (vue globale) puis le script de focus de chaque
+      vignoble (polygone simplifié + bodegas), dans le thread du préchauffage
+    Modes de lancement :
+    - "off" : rien
+    - "background" : thread de fond, n'attend pas (premier affichage non retardé)
+    - "blocking" : attend la fin avant de rendre la main
+    """
+
+    def __init__(
+        self,
+        manager: MapManager,
+        max_workers: Optional[int] = WarmupConfig.MAX_WORKERS,
+        on_finished: Optional[Callable[[WarmupReport], None]] = None,
+        update_mode: str = "full",
+    ) -> None:
+        if update_mode not in WarmupConfig.UPDATE_MODES:
+            raise ValueError(f"Mode de mise à jour inconnu : '{update_mode}'")
+        self.manager = manager
+        self.update_mode = update_mode
+        self.max_workers = max_workers
+        self.on_finished = on_finished
+        self.report = WarmupReport()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self, mode: str) -> None:
+        if mode not in WarmupConfig.MODES:
+            raise ValueError(f"Mode de préchauffage inconnu : '{mode}'")
+        if mode == "off":
+            return
+        if mode == "blocking":
+            self.run()
+            return
+        self._thread = threading.Thread(
+            target=self.run, name="map-warmup", daemon=True
+        )
+        self._thread.start()
+
+    def run(self) -> WarmupReport:
+        """Rend toutes les vues absentes du cache (bloquant)."""
+        start = time.perf_counter()
+        if self.update_mode == "delta":
+            self._run_delta()
+        else:
+            self._run_full()
+        self.report.elapsed = time.perf_counter() - start
+        if self.on_finished:
+            self.on_finished(self.report)
+        return self.report
+
+    def _run_delta(self) -> None:
+        """Page de base et scripts de focus : peu de rendu folium, pas de processus."""
+        manager = self.manager
+        focus_views = [v for v in manager.views()[1:] if not manager.is_focus_cached(v)]
+        base_missing = not manager.is_cached(None)
+        self.report = WarmupReport(views=len(focus_views) + base_missing)
+        if base_missing:
+            manager.generate_map_html(None)
+            self.report.rendered += 1
+        for view in focus_views:
+            if self._stop.is_set():
+                break
+            manager.focus_script(view)
+            self.report.rendered += 1
+
+    def _run_full(self) -> None:
+        fingerprint = self.manager.fingerprint
+        views = [v for v in self.manager.views() if not self.manager.is_cached(v)]
+        self.report = WarmupReport(views=len(views))
+        if views:
+            context = multiprocessing.get_context(WarmupConfig.START_METHOD)
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(
+                    self.manager.vinedos,
+                    {
+                        "shared_icon": self.manager.shared_icon,
+                        "local_tiles": self.manager.local_tiles,
+                        "geojson_dir": self.manager.geojson_dir,
+                        "marker_mode": self.manager.marker_mode,
+                        "bodegas_db": self.manager.bodegas_db,
+                    },
+                    POLYGON_STORE.cache_dir,
+                ),
+            ) as executor:
+                futures = [executor.submit(_render_view, view) for view in views]
+                for future in as_completed(futures):
+                    if self._stop.is_set():
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        break
+                    view, html = future.result()
+                    if self.manager.store_rendered(view, html, fingerprint):
+                        self.report.rendered += 1
+
+    def stop(self) -> None:
+        """Interrompt un préchauffage en arrière-plan (fermeture de l'application)."""
+        self._stop.set()
@@ -1,3 +1,5 @@
+from typing import Callable
+
 from PySide6.QtWidgets import (
     QApplication,
     QDialog,
@@ -12,15 +14,23 @@ from PySide6.QtWidgets import (
 )
 
 from vinos_ibericos.data.bodega_fields import FIELDS
-from vinos_ibericos.data.bodega_manager import BodegaManager
+from vinos_ibericos.data.bodega_manager import get_bodega_manager
+from vinos_ibericos.data.do_assignment import get_do_assigner
 
 
 FONT_SIZE = 16
 
 
 class BodegaForm(QDialog):
-    def __init__(self, parent=None, do_name: str | None = None):
+    def __init__(
+        self,
+        parent=None,
+        do_name: str | None = None,
+        on_added: Callable[[dict], None] | None = None,
+    ):
         super().__init__(parent)
+        # Appelé après l'enregistrement (cartes à mettre à jour) :
+        self.on_added = on_added
         self.setWindowTitle("Ajouter une Bodega")
         self.setFixedSize(500, 550)
 
@@ -116,13 +126,18 @@ class BodegaForm(QDialog):
         if self._validate_inputs():
             # Envoi des données formatées à la db :
             data = self._format_dict_data()
-            manager = BodegaManager()
+            if not self._confirm_do_location(data):
+                return
+            manager = get_bodega_manager()  # Connexion partagée, pas de reconnexion
             try:
                 manager.add_bodega(data)
             except Exception as e:
                 QMessageBox.critical(
                     self, "Erreur", f"Impossible d'ajouter la bodega :\n{e}"
                 )
+                return
+            if self.on_added is not None:
+                self.on_added(data)
 
             QMessageBox.information(
                 self,
@@ -131,6 +146,24 @@ class BodegaForm(QDialog):
             )
             self.accept()  # seulement si OK
 
+    def _confirm_do_location(self, data: dict) -> bool:
+        """
+        Vérifie que les coordonnées sont dans le polygone de la DO (si disponible).
+        Hors de la DO : l'utilisateur confirme ou corrige avant l'enregistrement.
+        """
+        inside = get_do_assigner().contains(
+            data["do_name"], float(data["lat"]), float(data["lon"])
+        )
+        if inside is not False:  # Dans la DO, ou DO sans polygone (non vérifiable)
+            return True
+        answer = QMessageBox.question(
+            self,
+            "Vérification de la DO",
+            f"Les coordonnées ({data['lat']}, {data['lon']}) sont en dehors de la "
+            f"DO « {data['do_name']} ».\nEnregistrer quand même ?",
+        )
+        return answer == QMessageBox.Yes  # type: ignore
+
     def _format_dict_data(self) -> dict:
         """Construction et formatage du dictionnaire avec les valeurs à envoyer à la db."""
         data: dict = {
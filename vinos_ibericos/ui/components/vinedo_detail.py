@@ -1,25 +1,38 @@
-from glob import glob
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Callable, Optional
 
-from PySide6 import QtWidgets, QtGui
+from PySide6 import QtWidgets
 from PySide6.QtCore import Qt
 
+from vinos_ibericos.data.vinedo_descriptions import DescriptionStore
+from vinos_ibericos.datatypes import VinedoLike, as_vinedo
 from vinos_ibericos.ui.config_ui import Colors, ConfigUI
+from vinos_ibericos.ui.image_service import ImageService
 from vinos_ibericos.ui.styles.global_style import GlobalStyle
 from vinos_ibericos.ui.components.bodega_form import BodegaForm
 
 
 class VinedoDetailDialog(QtWidgets.QDialog):
     def __init__(
-        self, parent: Optional[QtWidgets.QWidget], vinedo: Dict[str, Any], img_dir: Path
+        self,
+        parent: Optional[QtWidgets.QWidget],
+        vinedo: VinedoLike,
+        img_dir: Path,
+        descriptions: Optional[DescriptionStore] = None,
+        images: Optional[ImageService] = None,
+        on_bodega_added: Optional[Callable[[dict], None]] = None,
     ) -> None:
         super().__init__(parent)
-        self.vinedo = vinedo
+        self.vinedo = as_vinedo(vinedo)  # Accepte aussi un dict (format de vinedos.json)
+        # Source des descriptions non résidentes (lues à l'ouverture de la fenêtre) :
+        self.descriptions = descriptions
         self.img_dir = img_dir
+        # Images déjà mises à l'échelle (partagées entre les fenêtres successives) :
+        self.images = images or ImageService(img_dir, cache_dir=None)
+        self.on_bodega_added = on_bodega_added  # Transmis au formulaire de bodega
 
         # Config fenêtre
-        self.setWindowTitle(vinedo.get("name", ConfigUI.DEFAULT_TITLE))
+        self.setWindowTitle(self.vinedo.nom or ConfigUI.DEFAULT_TITLE)
         self.setWindowFlags(Qt.Window | Qt.WindowStaysOnTopHint)  # type: ignore
         self.setFixedSize(*ConfigUI.DETAIL_WIN_SIZE)
 
@@ -33,7 +46,7 @@ class VinedoDetailDialog(QtWidgets.QDialog):
 
         # Titre
         title_details = QtWidgets.QLabel(
-            f"<h1 style='color:{Colors.PRIMARY_ACCENT}; font-weight:bold;'>{vinedo.get('nom', '')}</h1>"
+            f"<h1 style='color:{Colors.PRIMARY_ACCENT}; font-weight:bold;'>{self.vinedo.nom}</h1>"
         )
         title_details.setTextFormat(Qt.RichText)  # type: ignore
 
@@ -71,7 +84,10 @@ class VinedoDetailDialog(QtWidgets.QDialog):
             GlobalStyle.get_text_browser_html_css()
         )
         # Charger le HTML :
-        raw_html = self.vinedo.get("description", "")
+        if self.descriptions is not None:
+            raw_html = self.descriptions.get(self.vinedo)
+        else:
+            raw_html = self.vinedo.description
         # Encapsulation du body :
         wrapped = f"<html><head></head><body>{raw_html}</body></html>"
         self.desc_label.setHtml(wrapped)
@@ -79,29 +95,16 @@ class VinedoDetailDialog(QtWidgets.QDialog):
         self.desc_label.setOpenExternalLinks(True)
 
     def _load_image(self) -> None:
-        img_name = self.vinedo.get("img", "")
-        candidate = Path(img_name)
-        if not candidate.is_absolute():
-            candidate = self.img_dir / img_name
-        # Recherche du fichier indépendamment de son extension :
-        matche_img = glob(str(candidate) + ".*")
-        pixmap = QtGui.QPixmap(
-            matche_img[0] if matche_img else self.img_dir / "default_img.jpg"
-        )
+        # Fichier trouvé indépendamment de son extension, image de repli sinon :
+        pixmap = self.images.pixmap(self.vinedo.img, ConfigUI.DETAIL_IMG_SIZE)
         if not pixmap.isNull():
-            scaled = pixmap.scaled(
-                ConfigUI.DETAIL_IMG_SIZE[0],
-                ConfigUI.DETAIL_IMG_SIZE[1],
-                Qt.KeepAspectRatio,  # type: ignore
-                Qt.SmoothTransformation,  # type: ignore
-            )
-            self.img_label.setPixmap(scaled)
+            self.img_label.setPixmap(pixmap)
         else:
             self.img_label.setText("Image introuvable")
 
     def open_bodega_form(self):
         dialog = BodegaForm(
-            self, do_name=self.vinedo.get("nom")
+            self, do_name=self.vinedo.nom, on_added=self.on_bodega_added
         )  # passe la valeur au constructeur
         dialog.setModal(True)  # bloque uniquement VinedoDetailDialog
         dialog.show()
@@ -0,0 +1,188 @@
+#######################################
+# vinos_ibericos/ui/hot_reload.py     #
+#                                     #
+# Rechargement à chaud des données :  #
+# - vinedos.json et .geojson suivis   #
+#   par QFileSystemWatcher            #
+# - Rafales d'écritures regroupées    #
+# - Lecture et comparaison hors du    #
+#   thread graphique                  #
+#######################################
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+from vinos_ibericos.data.vinedo_diff import VinedoDiff, diff_vinedos
+from vinos_ibericos.data.vinedo_loader import LoadReport
+from vinos_ibericos.datatypes import Vinedo
+from vinos_ibericos.exceptions import VinedoJsonError
+from vinos_ibericos.map_manager import MapManager
+from vinos_ibericos.ui.map_renderer import MapRenderer
+from vinos_ibericos.utils import CheckVinedoJson
+
+
+@dataclass(frozen=True)
+class HotReloadConfig:
+    DEBOUNCE_MS: int = 300  # Attente après la dernière écriture avant de relire
+    GEOJSON_PATTERN: str = "*.geojson"
+
+
+class ReloadResult(NamedTuple):
+    vinedos: list[Vinedo]
+    report: LoadReport
+    diff: VinedoDiff  # Par rapport aux données affichées au moment de la demande
+
+
+class GeojsonChange(NamedTuple):
+    files: list[Path]  # Modifiés, ajoutés ou supprimés
+    names: list[str]  # Vignobles dont la vue focus a été invalidée
+
+
+def scan_files(
+    directory: Path, pattern: str = HotReloadConfig.GEOJSON_PATTERN
+) -> dict[Path, tuple[int, int]]:
+    """Signature (mtime_ns, taille) de chaque fichier du dossier."""
+    signatures = {}
+    for path in directory.glob(pattern):
+        try:
+            stat = path.stat()
+        except OSError:  # Supprimé entre-temps
+            continue
+        signatures[path] = (stat.st_mtime_ns, stat.st_size)
+    return signatures
+
+
+def changed_files(
+    before: dict[Path, tuple[int, int]], after: dict[Path, tuple[int, int]]
+) -> list[Path]:
+    """Fichiers ajoutés, supprimés ou dont la signature a changé (triés)."""
+    return sorted(
+        path for path in before.keys() | after.keys() if before.get(path) != after.get(path)
+    )
+
+
+class DataWatcher(QObject):
+    """
+    Surveille vinedos.json et le dossier des .geojson.
+    - Chaque rafale d'écritures est regroupée (minuterie relancée à chaque
+      notification) puis traitée une seule fois
+    - Lecture, validation et comparaison dans un thread de travail (MapRenderer :
+      seule la dernière demande compte) ; le MapManager y est aussi mis à jour
+    - Résultats émis dans le thread graphique : 'vinedos_reloaded' (ReloadResult,
+      seulement s'il y a des différences), 'geojson_changed' (GeojsonChange),
+      'reload_failed' (message ; les données affichées sont conservées)
+    Un fichier remplacé (écriture atomique des éditeurs) n'est plus suivi par
+    QFileSystemWatcher : les chemins sont de nouveau ajoutés à chaque traitement.
+    """
+
+    vinedos_reloaded = Signal(object)
+    geojson_changed = Signal(object)
+    reload_failed = Signal(str)
+
+    def __init__(
+        self,
+        loader: CheckVinedoJson,
+        map_manager: MapManager,
+        debounce_ms: int = HotReloadConfig.DEBOUNCE_MS,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.loader: CheckVinedoJson = loader
+        self.map_manager: MapManager = map_manager
+        self.geojson_dir: Path = map_manager.geojson_dir
+        # Signatures des .geojson, lues et mises à jour dans le thread de travail :
+        self._geojson_signatures = scan_files(self.geojson_dir)
+        self._json_worker = MapRenderer(self)
+        self._geojson_worker = MapRenderer(self)
+        self._json_timer = self._debounce_timer(debounce_ms, self._reload_vinedos)
+        self._geojson_timer = self._debounce_timer(debounce_ms, self._rescan_geojson)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._geojson_timer.start)
+        self._watch()
+
+    def _debounce_timer(self, msecs: int, slot) -> QTimer:
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(msecs)
+        timer.timeout.connect(slot)
+        return timer
+
+    def _watch(self) -> None:
+        """(Re)place la surveillance sur les chemins existants non encore suivis."""
+        paths = [self.loader.file_path, self.geojson_dir]
+        paths += sorted(self.geojson_dir.glob(HotReloadConfig.GEOJSON_PATTERN))
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        missing = [str(p) for p in paths if str(p) not in watched and p.exists()]
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def _on_file_changed(self, path: str) -> None:
+        if Path(path) == self.loader.file_path:
+            self._json_timer.start()
+        else:
+            self._geojson_timer.start()
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Attend la fin des traitements en cours (tests)."""
+        done = self._json_worker.wait(msecs)
+        return self._geojson_worker.wait(msecs) and done
+
+    def stop(self) -> None:
+        """Fin de la surveillance : minuteries arrêtées, traitements en cours terminés."""
+        self._json_timer.stop()
+        self._geojson_timer.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+        self.wait()
+
+    # ========================
+    # vinedos.json
+    # ========================
+
+    def _reload_vinedos(self) -> None:
+        self._watch()
+        displayed = list(self.loader.data)
+        self._json_worker.submit(
+            lambda: self._read_vinedos(displayed), self._on_vinedos_read
+        )
+
+    def _read_vinedos(self, displayed: list[Vinedo]) -> ReloadResult | VinedoJsonError:
+        """Thread de travail : lecture, comparaison et mise à jour du MapManager."""
+        try:
+            vinedos, report = self.loader.read()
+        except VinedoJsonError as e:  # Fichier en cours d'écriture, JSON invalide...
+            return e
+        self.map_manager.update_vinedos(vinedos)
+        return ReloadResult(vinedos, report, diff_vinedos(displayed, vinedos))
+
+    def _on_vinedos_read(self, result: ReloadResult | VinedoJsonError) -> None:
+        if isinstance(result, VinedoJsonError):
+            self.reload_failed.emit(f"{self.loader.file_path.name} : {result}")
+            return
+        self.loader.apply(result.vinedos, result.report)
+        if not result.diff.empty:
+            self.vinedos_reloaded.emit(result)
+
+    # ========================
+    # .geojson
+    # ========================
+
+    def _rescan_geojson(self) -> None:
+        self._watch()
+        self._geojson_worker.submit(self._scan_geojson, self._on_geojson_scanned)
+
+    def _scan_geojson(self) -> GeojsonChange:
+        """Thread de travail : fichiers changés et invalidation des polygones."""
+        signatures = scan_files(self.geojson_dir)
+        files = changed_files(self._geojson_signatures, signatures)
+        self._geojson_signatures = signatures
+        return GeojsonChange(files, self.map_manager.invalidate_polygons(files))
+
+    def _on_geojson_scanned(self, change: GeojsonChange) -> None:
+        if change.files:
+            self.geojson_changed.emit(change)
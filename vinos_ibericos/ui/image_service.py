@@ -0,0 +1,201 @@
+######################################
+# vinos_ibericos/ui/image_service.py #
+#                                    #
+# Images des vignobles et du panneau #
+# droit, déjà à la taille affichée : #
+# - Index des fichiers construit une #
+#   seule fois (sans glob)           #
+# - Cache LRU des pixmaps en mémoire #
+# - Miniatures en cache sur disque,  #
+#   élaguées au rechargement         #
+######################################
+
+import os
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import blake2b
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QPixmap
+
+from vinos_ibericos.config.general import ConfigPath
+
+
+@dataclass(frozen=True)
+class ImageConfig:
+    CACHE_DIR: Path = ConfigPath.CACHE_DIR / "thumbnails"
+    # Miniatures JPEG (photos sans transparence) : les plus rapides à relire et écrire
+    # (cf. tests/bench_images.py)
+    FORMAT: str = "JPG"
+    QUALITY: int = 90
+    MEMORY_CACHE_SIZE: int = 32  # Pixmaps gardés en mémoire (clé : image, taille)
+    DEFAULT_IMG: str = "default_img"  # Image de repli dans le dossier des images
+
+
+Size = tuple[int, int]
+
+
+class ImageService:
+    """
+    Fournit des QPixmap déjà mis à l'échelle (KeepAspectRatio, SmoothTransformation) :
+    - nom d'image (sans extension, cf. 'img' de vinedos.json) résolu par un index du
+      dossier construit au premier appel, ou chemin de fichier
+    - mémoire : cache LRU borné, clé (fichier, taille) => réouverture sans décodage
+    - disque : miniature par (fichier, mtime, taille du fichier, taille affichée),
+      relue au lieu de décoder et réduire l'image d'origine
+    Les pixmaps doivent être créés dans le thread graphique.
+    """
+
+    def __init__(
+        self,
+        img_dir: Path,
+        cache_dir: Optional[Path] = ImageConfig.CACHE_DIR,
+        maxsize: int = ImageConfig.MEMORY_CACHE_SIZE,
+    ) -> None:
+        self.img_dir: Path = img_dir
+        self.cache_dir: Optional[Path] = cache_dir  # None => pas de miniatures sur disque
+        self.maxsize: int = maxsize
+        self._index: Optional[dict[str, Path]] = None
+        self._memory: OrderedDict[tuple[Path, Size], QPixmap] = OrderedDict()
+        self._sources: set[Path] = set()  # Fichiers hors index dont on a une miniature
+        # Compteurs :
+        self.memory_hits: int = 0
+        self.disk_hits: int = 0
+        self.decodes: int = 0
+
+    def resolve(self, img_name: str) -> Optional[Path]:
+        """
+        Fichier d'une image, quelle que soit son extension ; chemin accepté.
+        Image inconnue => image de repli (None si elle manque aussi).
+        """
+        if self._index is None:
+            self._index = self._build_index()
+        candidate = Path(img_name)
+        if candidate.name != img_name:  # Chemin (absolu, sous-dossier) : sans index
+            target = self.img_dir / candidate
+            matches = sorted(target.parent.glob(target.name + ".*"))
+            if matches:
+                return matches[0]
+        elif img_name in self._index:
+            return self._index[img_name]
+        return self._index.get(ImageConfig.DEFAULT_IMG)
+
+    def pixmap(self, img_name: str, size: Size) -> QPixmap:
+        """Image d'un vignoble à la taille demandée (QPixmap nul si introuvable)."""
+        path = self.resolve(img_name)
+        return self.pixmap_for_file(path, size) if path is not None else QPixmap()
+
+    def pixmap_for_file(self, path: Path, size: Size) -> QPixmap:
+        key = (path, size)
+        pixmap = self._memory.get(key)
+        if pixmap is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return pixmap
+        pixmap = QPixmap.fromImage(self.thumbnail(path, size))
+        if self.maxsize > 0 and not pixmap.isNull():
+            self._memory[key] = pixmap
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+        return pixmap
+
+    def thumbnail(self, path: Path, size: Size) -> QImage:
+        """
+        Image mise à l'échelle (QImage : utilisable hors du thread graphique),
+        depuis la miniature sur disque si elle est à jour, sinon décodée puis écrite.
+        """
+        thumbnail = self._thumbnail_path(path, size)
+        if thumbnail is not None:
+            self._sources.add(path)
+            image = QImage(str(thumbnail))
+            if not image.isNull():
+                self.disk_hits += 1
+                return image
+        image = QImage(str(path))
+        self.decodes += 1
+        if image.isNull():
+            return image
+        image = image.scaled(
+            *size,
+            Qt.KeepAspectRatio,  # type: ignore
+            Qt.SmoothTransformation,  # type: ignore
+        )
+        if thumbnail is not None:
+            self._write_thumbnail(thumbnail, image)
+        return image
+
+    def invalidate(self) -> None:
+        """
+        Oublie l'index et les pixmaps en mémoire (images ajoutées ou modifiées) ;
+        appelé à chaque rechargement à chaud de vinedos.json.
+        Avec un cache disque : index reconstruit et miniatures des images absentes
+        de cet index (supprimées, modifiées) effacées.
+        """
+        self._index = None
+        self._memory.clear()
+        if self.cache_dir is not None:
+            self._index = self._build_index()
+            sources = set(self._index.values()) | self._sources
+            self._prune_thumbnails(self.cache_dir, sources)
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _build_index(self) -> dict[str, Path]:
+        """Nom sans extension -> fichier (premier dans l'ordre alphabétique)."""
+        index: dict[str, Path] = {}
+        try:
+            files = sorted(p for p in self.img_dir.iterdir() if p.is_file())
+        except OSError:
+            return index
+        for path in files:
+            index.setdefault(path.stem, path)
+        return index
+
+    def _thumbnail_path(self, path: Path, size: Size) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        key = self._source_key(path)
+        if key is None:
+            return None
+        suffix = ImageConfig.FORMAT.lower()
+        return self.cache_dir / f"{path.stem}-{size[0]}x{size[1]}-{key}.{suffix}"
+
+    @staticmethod
+    def _source_key(path: Path) -> Optional[str]:
+        """Clé : chemin, mtime et taille de la source => périmée dès qu'elle change."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        source = f"{path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}"
+        return blake2b(source.encode("utf-8"), digest_size=8).hexdigest()
+
+    @classmethod
+    def _prune_thumbnails(cls, cache_dir: Path, sources: set[Path]) -> None:
+        """Efface les miniatures (et .tmp orphelins) d'aucune des sources, à jour."""
+        keys = {cls._source_key(path) for path in sources}
+        try:
+            entries = list(cache_dir.iterdir())
+        except OSError:  # Pas encore de cache
+            return
+        for entry in entries:
+            if entry.stem.rsplit("-", 1)[-1] not in keys or entry.suffix == ".tmp":
+                try:
+                    entry.unlink()
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _write_thumbnail(thumbnail: Path, image: QImage) -> None:
+        """Écriture atomique, échec silencieux (simple cache)."""
+        tmp = thumbnail.with_suffix(".tmp")
+        try:
+            thumbnail.parent.mkdir(parents=True, exist_ok=True)
+            if image.save(str(tmp), ImageConfig.FORMAT, ImageConfig.QUALITY):
+                os.replace(tmp, thumbnail)
+        except OSError:
+            pass
@@ -0,0 +1,116 @@
+#####################################
+# vinos_ibericos/ui/map_renderer.py #
+#                                   #
+# Génération de la carte hors du    #
+# thread graphique (QThreadPool),   #
+# seule la dernière demande compte  #
+# (résultat ou erreur)              #
+#####################################
+
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+Callback = Callable[[Any], None]
+ErrorCallback = Callable[[str], None]
+
+
+class _RenderSignals(QObject):
+    finished = Signal(int, object)  # (numéro de demande, résultat)
+    failed = Signal(int, str)  # (numéro de demande, message d'erreur)
+
+
+class _RenderTask(QRunnable):
+    """Exécute la fonction de rendu dans un thread du pool."""
+
+    def __init__(self, request_id: int, fn: Callable[[], Any]) -> None:
+        super().__init__()
+        self.setAutoDelete(False)  # Conservé pour pouvoir être retiré de la file
+        self.request_id = request_id
+        self.fn = fn
+        self.signals = _RenderSignals()
+
+    def run(self) -> None:
+        try:
+            result = self.fn()
+        except Exception as e:  # Erreur SQLite, sidecar corrompu... : signalée à l'UI
+            self.signals.failed.emit(self.request_id, f"{type(e).__name__} : {e}")
+            return
+        self.signals.finished.emit(self.request_id, result)
+
+
+class MapRenderer(QObject):
+    """
+    File de rendu « dernière demande gagnante ».
+    - Un seul thread de travail : les demandes encore en file sont retirées dès
+      qu'une plus récente arrive (clics rapides dans la liste)
+    - Un rendu déjà lancé se termine, mais son résultat périmé est ignoré
+    - Les callbacks sont appelés dans le thread graphique (signal Qt) : 'on_done'
+      avec le résultat, ou 'on_error' avec le message si le rendu a levé une exception
+    """
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._latest_id: int = 0
+        self._queued: Optional[_RenderTask] = None
+        self._callbacks: dict[int, tuple[Callback, Optional[ErrorCallback]]] = {}
+        self._tasks: dict[int, _RenderTask] = {}  # Références tant que la tâche vit
+        self.cancelled: int = 0  # Demandes annulées ou dont le résultat a été ignoré
+
+    def submit(
+        self,
+        fn: Callable[[], Any],
+        on_done: Callback,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> int:
+        """
+        Planifie 'fn' ; 'on_done(résultat)' (ou 'on_error(message)' en cas d'exception)
+        ne sera appelé que si elle est encore la dernière.
+        """
+        if self._queued is not None and self._pool.tryTake(self._queued):
+            self._forget(self._queued.request_id)
+            self.cancelled += 1
+        self._latest_id += 1
+        task = _RenderTask(self._latest_id, fn)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        self._callbacks[task.request_id] = (on_done, on_error)
+        self._tasks[task.request_id] = task
+        self._queued = task
+        self._pool.start(task)
+        return task.request_id
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Attend la fin des rendus en cours (arrêt de l'application, tests)."""
+        return self._pool.waitForDone(msecs)
+
+    def _on_finished(self, request_id: int, result: Any) -> None:
+        callbacks = self._done(request_id)
+        if callbacks is not None:
+            callbacks[0](result)
+
+    def _on_failed(self, request_id: int, message: str) -> None:
+        callbacks = self._done(request_id)
+        if callbacks is not None and callbacks[1] is not None:
+            callbacks[1](message)
+
+    def _done(
+        self, request_id: int
+    ) -> Optional[tuple[Callback, Optional[ErrorCallback]]]:
+        """Fin d'une tâche : ses callbacks si elle est encore la dernière demande."""
+        callbacks = self._forget(request_id)
+        if self._queued is not None and self._queued.request_id == request_id:
+            self._queued = None
+        if request_id != self._latest_id:
+            self.cancelled += 1
+            return None
+        return callbacks
+
+    def _forget(
+        self, request_id: int
+    ) -> Optional[tuple[Callback, Optional[ErrorCallback]]]:
+        self._tasks.pop(request_id, None)
+        return self._callbacks.pop(request_id, None)
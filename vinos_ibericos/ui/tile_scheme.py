@@ -0,0 +1,133 @@
+######################################
+# vinos_ibericos/ui/tile_scheme.py   #
+#                                    #
+# Serveur de tuiles local pour       #
+# QWebEngineView (schéma d'URL dédié #
+# adossé au TileStore MBTiles)       #
+######################################
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import shiboken6
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QObject, QUrl, Signal
+from PySide6.QtWebEngineCore import (
+    QWebEngineProfile,
+    QWebEngineUrlRequestJob,
+    QWebEngineUrlScheme,
+    QWebEngineUrlSchemeHandler,
+)
+
+from vinos_ibericos.data.tile_store import TileConfig, TileStore
+
+
+SCHEME_NAME: bytes = TileConfig.SCHEME.encode()
+
+
+def register_tile_scheme() -> None:
+    """Déclare le schéma d'URL ; doit être appelé AVANT la création de QApplication."""
+    scheme = QWebEngineUrlScheme(SCHEME_NAME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(
+        QWebEngineUrlScheme.Flag.SecureScheme
+        | QWebEngineUrlScheme.Flag.LocalAccessAllowed
+        | QWebEngineUrlScheme.Flag.CorsEnabled
+    )
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+class TileSchemeHandler(QWebEngineUrlSchemeHandler):
+    """
+    Sert les tuiles 'vinostiles://tile/z/x/y.png' depuis le cache MBTiles.
+    - Hit : réponse immédiate depuis SQLite (aucun accès réseau)
+    - Miss : téléchargement unique en arrière-plan (si 'online'), mis en cache puis
+      servi à toutes les demandes de la même tuile en attente
+    Les demandes en attente ne sont manipulées que dans le thread graphique : le
+    résultat d'un téléchargement y revient par le signal 'tile_fetched'.
+    """
+
+    tile_fetched = Signal(object, object)  # (tuile, données PNG ou None)
+
+    def __init__(
+        self,
+        store: TileStore,
+        online: bool = True,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.store = store
+        self.online = online
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        # Tuiles en cours de téléchargement -> demandes qui les attendent :
+        self._pending: dict[tuple[int, int, int], list[QWebEngineUrlRequestJob]] = {}
+        self.tile_fetched.connect(self._on_tile_fetched)
+
+    def requestStarted(self, job: QWebEngineUrlRequestJob) -> None:
+        tile = self._parse(job.requestUrl())
+        if tile is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlInvalid)
+            return
+        data = self.store.get(*tile)
+        if data is not None:
+            self._reply(job, data)
+            return
+        if not self.online:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        waiting = self._pending.setdefault(tile, [])
+        waiting.append(job)
+        if len(waiting) == 1:  # Premier demandeur : un seul téléchargement par tuile
+            self._executor.submit(self._fetch_tile, tile)
+
+    def _fetch_tile(self, tile: tuple[int, int, int]) -> None:
+        """Thread de l'exécuteur : téléchargement et mise en cache."""
+        self.tile_fetched.emit(tile, self.store.fetch(*tile))
+
+    def _on_tile_fetched(
+        self, tile: tuple[int, int, int], data: Optional[bytes]
+    ) -> None:
+        for job in self._pending.pop(tile, []):
+            if not shiboken6.isValid(job):  # Demande abandonnée entre-temps
+                continue
+            if data is None:
+                job.fail(QWebEngineUrlRequestJob.Error.RequestFailed)
+            else:
+                self._reply(job, data)
+
+    @staticmethod
+    def _reply(job: QWebEngineUrlRequestJob, data: bytes) -> None:
+        buffer = QBuffer(parent=job)
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(b"image/png", buffer)
+
+    def shutdown(self) -> None:
+        """
+        Arrêt des téléchargements (file annulée, téléchargements en cours attendus :
+        aucune écriture après la fermeture) puis fermeture du cache.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._pending.clear()
+        self.store.close()
+
+    @staticmethod
+    def _parse(url: QUrl) -> Optional[tuple[int, int, int]]:
+        """'vinostiles://tile/z/x/y.png' -> (z, x, y)"""
+        parts = url.path().strip("/").removesuffix(".png").split("/")
+        if url.host() != "tile" or len(parts) != 3:
+            return None
+        try:
+            z, x, y = (int(p) for p in parts)
+        except ValueError:
+            return None
+        return z, x, y
+
+
+def install_tile_handler(
+    profile: QWebEngineProfile, store: Optional[TileStore] = None, online: bool = True
+) -> TileSchemeHandler:
+    """Installe le serveur de tuiles local sur le profil (celui des QWebEngineView)."""
+    handler = TileSchemeHandler(store or TileStore(), online=online, parent=profile)
+    profile.installUrlSchemeHandler(SCHEME_NAME, handler)
+    return handler
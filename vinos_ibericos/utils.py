@@ -5,8 +5,6 @@
 # utilitaires.            #
 ###########################
 
-import json
-
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
@@ -15,49 +13,78 @@ from PySide6.QtCore import QObject
 
 from vinos_ibericos.datatypes import Vinedo
 from vinos_ibericos.config.general import ConfigPath
-from vinos_ibericos.exceptions import VinedoJsonError
+from vinos_ibericos.data.vinedo_descriptions import DescriptionStore
+from vinos_ibericos.data.vinedo_loader import VALIDATE_VINEDO, LoadReport, Rejected
+from vinos_ibericos.data.vinedo_snapshot import SnapshotConfig, load_with_snapshot
+from vinos_ibericos.exceptions import VinedoJsonError  # noqa: F401 (importé par main)
 
 
 class CheckVinedoJson:
-    def __init__(self, file_path: Path | None = None) -> None:
+    def __init__(
+        self,
+        file_path: Path | None = None,
+        measure_memory: bool = False,
+        snapshot_dir: Path | None = SnapshotConfig.CACHE_DIR,
+        lazy_descriptions: bool = True,
+    ) -> None:
         # Possibilité de passer un autre chemin si besoin (tests, etc.)
         self.file_path: Path = file_path or ConfigPath.JSON_FILE_PATH
+        self.measure_memory: bool = measure_memory  # Pic mémoire dans 'report'
+        # Instantané binaire des données validées (None => toujours relire le JSON) :
+        self.snapshot_dir: Path | None = snapshot_dir
+        # Descriptions HTML laissées dans le JSON, lues à la demande (cf. 'descriptions') :
+        self.lazy_descriptions: bool = lazy_descriptions
         self._data: list[Vinedo] = []
+        self._report: LoadReport = LoadReport()
+        self._descriptions: DescriptionStore = DescriptionStore(self.file_path)
 
     def load(self) -> None:
-        """Charge et valide les données depuis le JSON et les stocke en mémoire."""
-        try:
-            with open(self.file_path, encoding="utf-8") as f:
-                data = json.load(f)
-            if not isinstance(data, list):
-                raise ValueError
-        except (FileNotFoundError, json.JSONDecodeError, ValueError):
-            raise VinedoJsonError()
-        # filtre les entrées invalides
-        self._data = [item for item in data if self._is_vinedo(item)]
+        """
+        Charge les données validées et les stocke en mémoire :
+        - depuis l'instantané binaire si le JSON n'a pas changé depuis
+        - sinon depuis le JSON (entrée par entrée), puis l'instantané est réécrit
+        Les entrées invalides sont écartées et listées dans 'rejected'.
+        """
+        self.apply(*self.read())
+
+    def read(self) -> tuple[list[Vinedo], LoadReport]:
+        """Lecture seule, sans modifier les données en mémoire (thread de travail)."""
+        return load_with_snapshot(
+            self.file_path,
+            self.snapshot_dir,
+            measure_memory=self.measure_memory,
+            lazy_descriptions=self.lazy_descriptions,
+        )
+
+    def apply(self, data: list[Vinedo], report: LoadReport) -> None:
+        """Remplace les données en mémoire (résultat de 'read')."""
+        self._data, self._report = data, report
+        self._descriptions.invalidate()
 
     @property
     def data(self) -> list[Vinedo]:
         """Retourne les données validées."""
         return self._data
 
+    @property
+    def descriptions(self) -> DescriptionStore:
+        """Descriptions des vignobles chargés (lues à la demande, cache LRU)."""
+        return self._descriptions
+
+    @property
+    def rejected(self) -> list[Rejected]:
+        """Entrées écartées au dernier chargement (motif, ligne)."""
+        return self._report.rejected
+
+    @property
+    def report(self) -> LoadReport:
+        """Bilan du dernier chargement (durée, pic mémoire, rejets)."""
+        return self._report
+
     @staticmethod
     def _is_vinedo(item: dict[str, Any]) -> bool:
         """Vérifie la validité d'un Vinedo"""
-        required_keys: dict[str, type] = {
-            "nom": str,
-            "coords": list,
-            "description": str,
-            "img": str,
-        }
-        # Vérifie la présence et le type de chaque clé :
-        for key, expected_type in required_keys.items():
-            if key not in item or not isinstance(item[key], expected_type):
-                return False
-        # Vérification spécifique : coords doit être une liste de float
-        if not all(isinstance(x, float) for x in item["coords"]):
-            return False
-        return True
+        return VALIDATE_VINEDO(item) is None
 
 
 @contextmanager